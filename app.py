@@ -1,8 +1,12 @@
 import os
 import logging
+import sqlite3
+import threading
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_cors import CORS
@@ -30,6 +34,17 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_pre_ping": True,
 }
 
+@event.listens_for(Engine, "connect")
+def configure_sqlite(dbapi_connection, connection_record):
+    """WAL so readers never block the writer, fsync per checkpoint rather than per commit, and wait on locks"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')}")
+    cursor.execute(f"PRAGMA synchronous={os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')}")
+    cursor.execute(f"PRAGMA busy_timeout={int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}")
+    cursor.close()
+
 # initialize the app with the extension
 db.init_app(app)
 
@@ -37,6 +52,45 @@ with app.app_context():
     # Import models and routes
     import models
     import routes
-    
-    # Create all tables
-    db.create_all()
+
+_db_ready = False
+_db_lock = threading.Lock()
+
+def add_missing_columns(table):
+    """ALTER TABLE ADD COLUMN for nullable columns added to a model after its table was created"""
+    existing = {column['name'] for column in inspect(db.engine).get_columns(table.name)}
+    preparer = db.engine.dialect.identifier_preparer
+    with db.engine.begin() as connection:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+            ))
+
+def init_db():
+    """Create missing tables and indexes; launchers call this once before serving"""
+    global _db_ready
+    with _db_lock:
+        if _db_ready:
+            return
+        with app.app_context():
+            # Create all tables
+            db.create_all()
+            
+            # create_all skips tables that already exist, so add any missing columns and indexes explicitly
+            add_missing_columns(models.TradingSignal.__table__)
+            for index in models.TradingSignal.__table__.indexes:
+                index.create(db.engine, checkfirst=True)
+            
+            # Seed the counter row now so reading /api/performance never has to write it
+            models.PerformanceMetrics.get_current_metrics()
+            db.session.commit()
+        _db_ready = True
+
+@app.before_request
+def ensure_db():
+    # Servers that import app:app directly never ran the launcher's init_db()
+    if not _db_ready:
+        init_db()
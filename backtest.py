@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Vectorized backtester for the Quotex signal rules
+
+Replays QuotexSignalGenerator's decision over every bar of a stored OHLC
+history at once: indicators are computed a single time for the whole series,
+the SMC structure rule and the technical fallback are evaluated as array
+operations, and every expiry's outcome comes from a shifted close array.
+
+Historical sentiment is not available, so the sentiment contribution to the
+SMC score is left out. The structure (7 for a BOS) and the CHoCH, liquidity
+sweep, order block and fair value gap confluence scores are replayed exactly;
+sentiment (at most 5) can only tip close calls and add sentiment-led signals.
+
+Usage: python backtest.py data/EURUSD.csv data/BTCUSD.parquet [--expiries 1 5 15]
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from smc_analyzer import CONFLUENCE_WEIGHTS, SMCAnalyzer, confirmed_swings
+from market_data_providers import load_bars
+
+DEFAULT_EXPIRIES = (1, 2, 3, 5, 10, 15, 30)
+
+# Bars QuotexSignalGenerator requires before it will emit a signal
+MIN_HISTORY = 100
+
+
+def structure_trend(df, swing_length=5, swing_highs=None, swing_lows=None, analyzer=None):
+    """Per-bar market structure: +1 bullish (HH/HL), -1 bearish (LH/LL), 0 neutral"""
+    if analyzer is None:
+        analyzer = SMCAnalyzer()
+        analyzer.swing_length = swing_length
+
+    n_bars = len(df)
+    if swing_highs is None:
+        swing_highs = analyzer.find_swing_highs(df)
+    if swing_lows is None:
+        swing_lows = analyzer.find_swing_lows(df)
+    high, previous_high = confirmed_swings(swing_highs, n_bars, swing_length)
+    low, previous_low = confirmed_swings(swing_lows, n_bars, swing_length)
+
+    with np.errstate(invalid='ignore'):
+        bullish = (high > previous_high) & (low > previous_low)
+        bearish = (high < previous_high) & (low < previous_low)
+
+    return bullish.astype(np.int8) - bearish.astype(np.int8)
+
+
+def smc_direction(df, swing_length=5):
+    """Per-bar direction of SMCAnalyzer.get_smc_signal without sentiment: +1 BUY, -1 SELL, 0 no signal"""
+    analyzer = SMCAnalyzer()
+    analyzer.swing_length = swing_length
+    swing_highs = analyzer.find_swing_highs(df)
+    swing_lows = analyzer.find_swing_lows(df)
+
+    # Trend 3 plus BOS 4: a structure trend is always a break of structure
+    trend = structure_trend(df, swing_length, swing_highs, swing_lows, analyzer)
+    buy_score = np.where(trend > 0, 7, 0)
+    sell_score = np.where(trend < 0, 7, 0)
+
+    patterns = analyzer.detect_patterns(df, swing_highs, swing_lows)
+    for name, weight in CONFLUENCE_WEIGHTS.items():
+        buy_score += weight * (patterns[name] > 0)
+        sell_score += weight * (patterns[name] < 0)
+
+    buy = (buy_score > sell_score) & (buy_score >= 3)
+    sell = (sell_score > buy_score) & (sell_score >= 3)
+    return buy.astype(np.int8) - sell.astype(np.int8)
+
+
+def fallback_direction(close, rsi, ema, bb_lower, bb_upper, rsi_low=25, rsi_high=75):
+    """The technical fallback vote of generate_quotex_signal for every bar"""
+    with np.errstate(invalid='ignore'):
+        above_ema = close > ema
+        buy_votes = (rsi < rsi_low).astype(np.int8) + above_ema + (close <= bb_lower)
+        sell_votes = (rsi > rsi_high).astype(np.int8) + ~above_ema + (close >= bb_upper)
+
+    return np.sign(buy_votes.astype(np.int8) - sell_votes.astype(np.int8)).astype(np.int8)
+
+
+def signal_directions(df, indicators=None, swing_length=5, rsi_low=25, rsi_high=75, ema_period=21,
+                      smc=None):
+    """
+    Direction the signal generator would emit at every bar: +1 BUY, -1 SELL, 0 none
+
+    `indicators` is the output of calculate_advanced_indicators for `df` and
+    `smc` that of smc_direction for `swing_length`; each is computed when not
+    given.
+    """
+    if indicators is None:
+        from quotex_signal_generator import QuotexSignalGenerator
+        indicators = QuotexSignalGenerator().calculate_advanced_indicators(df.copy())
+
+    close = indicators['Close'].to_numpy(dtype=np.float64)
+    if ema_period == 21:
+        ema = indicators['EMA_21'].to_numpy(dtype=np.float64)
+    else:
+        ema = indicators['Close'].ewm(span=ema_period).mean().to_numpy(dtype=np.float64)
+
+    fallback = fallback_direction(
+        close,
+        indicators['RSI_14'].to_numpy(dtype=np.float64),
+        ema,
+        indicators['BB_lower'].to_numpy(dtype=np.float64),
+        indicators['BB_upper'].to_numpy(dtype=np.float64),
+        rsi_low=rsi_low,
+        rsi_high=rsi_high
+    )
+
+    if smc is None:
+        smc = smc_direction(df, swing_length)
+    directions = np.where(smc != 0, smc, fallback).astype(np.int8)
+    directions[:MIN_HISTORY - 1] = 0
+    return directions
+
+
+def evaluate_expiries(close, directions, expiries=DEFAULT_EXPIRIES, stake=10.0, payout=0.85):
+    """
+    Win/loss statistics for each expiry
+
+    A signal at bar t enters at close[t] and settles at close[t + expiry]; an
+    unchanged price counts as a loss, as in SettlementEngine.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    rows = []
+
+    for expiry in expiries:
+        if expiry >= len(close):
+            continue
+
+        entry = close[:-expiry]
+        exit_ = close[expiry:]
+        direction = directions[:-expiry]
+
+        traded = direction != 0
+        wins = ((direction == 1) & (exit_ > entry)) | ((direction == -1) & (exit_ < entry))
+        trades = int(traded.sum())
+        win_count = int((wins & traded).sum())
+        losses = trades - win_count
+
+        rows.append({
+            'expiry': expiry,
+            'trades': trades,
+            'buys': int((direction == 1).sum()),
+            'sells': int((direction == -1).sum()),
+            'wins': win_count,
+            'losses': losses,
+            'win_rate': round(win_count / trades * 100, 2) if trades else 0.0,
+            'profit_loss': round(win_count * stake * payout - losses * stake, 2)
+        })
+
+    return rows
+
+
+def run_backtest(df, asset='ASSET', expiries=DEFAULT_EXPIRIES, stake=10.0, payout=0.85, **params):
+    """Backtest one asset's history and return one row per expiry"""
+    directions = signal_directions(df, **params)
+    rows = evaluate_expiries(df['Close'].to_numpy(dtype=np.float64), directions, expiries, stake, payout)
+    for row in rows:
+        row['asset'] = asset
+    return pd.DataFrame(rows, columns=['asset', 'expiry', 'trades', 'buys', 'sells',
+                                       'wins', 'losses', 'win_rate', 'profit_loss'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Backtest the Quotex signal rules on stored OHLC files')
+    parser.add_argument('files', nargs='+', help='CSV or Parquet files, one asset per file')
+    parser.add_argument('--expiries', nargs='+', type=int, default=list(DEFAULT_EXPIRIES))
+    parser.add_argument('--stake', type=float, default=10.0)
+    parser.add_argument('--payout', type=float, default=0.85)
+    args = parser.parse_args(argv)
+
+    results = []
+    for path in args.files:
+        try:
+            df = load_bars(path)
+            results.append(run_backtest(df, Path(path).stem, args.expiries, args.stake, args.payout))
+        except Exception as e:
+            logging.error(f"Error backtesting {path}: {e}")
+
+    if not results:
+        return 1
+
+    print(pd.concat(results, ignore_index=True).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
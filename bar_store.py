@@ -0,0 +1,187 @@
+import os
+import re
+import logging
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from shared_cache import file_lock
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+TIMESTAMP_FILE = 'timestamp.i8'
+APPEND_LOCK = '.append.lock'
+
+PERIOD_DAYS = {'d': 1, 'wk': 7, 'mo': 30, 'y': 365}
+
+
+def period_to_timedelta(period):
+    """Convert a yfinance period such as '2d', '1mo' or '1y' to a timedelta; None for 'max'"""
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period or '')
+    if not match:
+        return None
+    count, unit = int(match.group(1)), match.group(2)
+    return timedelta(days=count * PERIOD_DAYS[unit])
+
+
+def safe_symbol_name(symbol):
+    """File system safe form of a ticker, e.g. EURUSD=X -> EURUSD_X"""
+    return re.sub(r'[^A-Za-z0-9.-]', '_', symbol)
+
+
+def to_utc_nanoseconds(index):
+    """Int64 UTC nanosecond timestamps for a DatetimeIndex; naive indexes are taken as UTC"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    return index.tz_convert('UTC').as_unit('ns').asi8
+
+
+class BarStore:
+    """
+    Append-only local OHLCV store with one raw NumPy column file per field
+
+    Bars live under <root>/<symbol>/<interval>/ as little-endian int64
+    nanosecond timestamps plus float64 Open/High/Low/Close/Volume files.
+    Reads memory-map the files and return a frame over the requested tail
+    without copying; appends only write bars newer than the last stored one,
+    replacing the last bar when it is delivered again (it may have been
+    downloaded while still in progress).
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _directory(self, symbol, interval):
+        return self.root / safe_symbol_name(symbol) / interval
+
+    def _files(self, directory):
+        files = {'timestamp': directory / TIMESTAMP_FILE}
+        files.update({column: directory / f'{column}.f8' for column in PRICE_COLUMNS})
+        return files
+
+    def count(self, symbol, interval):
+        """Number of complete rows stored; a torn append is ignored"""
+        files = self._files(self._directory(symbol, interval))
+        if not files['timestamp'].exists():
+            return 0
+        return min(path.stat().st_size // 8 if path.exists() else 0 for path in files.values())
+
+    def last_timestamp(self, symbol, interval):
+        """UTC timestamp of the newest stored bar, or None"""
+        rows = self.count(symbol, interval)
+        if rows == 0:
+            return None
+        path = self._files(self._directory(symbol, interval))['timestamp']
+        last = np.memmap(path, dtype='<i8', mode='r', offset=(rows - 1) * 8, shape=(1,))
+        return pd.Timestamp(int(last[0]), unit='ns', tz='UTC')
+
+    def append(self, symbol, interval, data):
+        """Persist bars newer than (or equal to) the last stored one; returns rows written"""
+        if data is None or len(data) == 0:
+            return 0
+
+        timestamps = to_utc_nanoseconds(data.index)
+        directory = self._directory(symbol, interval)
+
+        directory.mkdir(parents=True, exist_ok=True)
+        # The worker processes of `run.py serve` append to the same files
+        with self._lock, file_lock(directory / APPEND_LOCK):
+            files = self._files(directory)
+            rows = self.count(symbol, interval)
+
+            last = None
+            if rows:
+                last = int(np.memmap(files['timestamp'], dtype='<i8', mode='r',
+                                     offset=(rows - 1) * 8, shape=(1,))[0])
+
+            keep = np.ones(len(timestamps), dtype=bool) if last is None else timestamps >= last
+            keep &= ~np.isnan(np.asarray(data['Close'], dtype=np.float64).ravel())
+            if not keep.any():
+                return 0
+
+            # Drop any torn tail left by an interrupted append; readers never map past `rows`
+            for path in files.values():
+                if path.exists() and path.stat().st_size > rows * 8:
+                    os.truncate(path, rows * 8)
+
+            # A re-delivered last bar is overwritten in place rather than truncated away
+            # under readers that may still have it mapped
+            first_row = rows - 1 if last is not None and timestamps[keep][0] == last else rows
+
+            for column in PRICE_COLUMNS:
+                if column in data.columns:
+                    values = np.asarray(data[column], dtype='<f8').ravel()[keep]
+                else:
+                    values = np.full(int(keep.sum()), np.nan, dtype='<f8')
+                self._write_at(files[column], first_row, values)
+
+            # Timestamps last: a row only counts once every column has it
+            self._write_at(files['timestamp'], first_row, timestamps[keep].astype('<i8'))
+
+            return int(keep.sum())
+
+    @staticmethod
+    def _write_at(path, row, values):
+        """Write `values` starting at `row`, extending the file as needed"""
+        with open(path, 'r+b' if path.exists() else 'wb') as handle:
+            handle.seek(row * 8)
+            handle.write(values.tobytes())
+
+    def read(self, symbol, interval, start=None, tail=None):
+        """
+        Memory-mapped frame of the stored bars from `start` (UTC) or the last `tail` rows
+
+        The columns are read-only views over the files, not copies.
+        """
+        rows = self.count(symbol, interval)
+        if rows == 0:
+            return None
+
+        files = self._files(self._directory(symbol, interval))
+        timestamps = np.memmap(files['timestamp'], dtype='<i8', mode='r', shape=(rows,))
+
+        first = 0
+        if start is not None:
+            first = int(np.searchsorted(timestamps, to_utc_nanoseconds([start])[0], side='left'))
+        if tail is not None:
+            first = max(first, rows - tail)
+
+        index = pd.DatetimeIndex(timestamps[first:].view('M8[ns]')).tz_localize('UTC')
+        columns = {
+            column: np.memmap(files[column], dtype='<f8', mode='r', shape=(rows,))[first:]
+            for column in PRICE_COLUMNS
+        }
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def read_period(self, symbol, interval, period):
+        """Bars covering `period` back from the newest stored bar"""
+        span = period_to_timedelta(period)
+        last = self.last_timestamp(symbol, interval)
+        if last is None:
+            return None
+        return self.read(symbol, interval, start=last - span if span is not None else None)
+
+    def covers(self, symbol, interval, period, now=None):
+        """Whether the stored bars are recent enough to top up instead of re-downloading `period`"""
+        last = self.last_timestamp(symbol, interval)
+        span = period_to_timedelta(period)
+        if last is None or span is None:
+            return False
+        now = now or pd.Timestamp.now(tz='UTC')
+        return now - last < span
+
+
+def default_bar_store():
+    """Bar store configured by BAR_STORE_DIR, or None when persistence is disabled"""
+    root = os.environ.get('BAR_STORE_DIR')
+    if not root:
+        return None
+    try:
+        return BarStore(root)
+    except Exception as e:
+        logging.error(f"Error opening bar store at {root}: {e}")
+        return None
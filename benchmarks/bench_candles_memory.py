@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-signal memory of the Candles path vs. the full indicator frame
+
+The previous scoring path copied the cached frame and added every column of
+calculate_advanced_indicators before reading the last row of a few of them.
+The Candles path views the cached columns as float64 arrays and evaluates
+only the indicators the fallback rule reads, only for the last bar. Both are measured
+with tracemalloc (peak and retained allocations) and timed, and their latest
+indicator values are compared.
+
+Usage: python benchmarks/bench_candles_memory.py [bars]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from candles import Candles  # noqa: E402
+from indicator_graph import IndicatorGraph  # noqa: E402
+from market_data_providers import MarketDataProvider  # noqa: E402
+from quotex_signal_generator import QuotexSignalGenerator  # noqa: E402
+from synthetic import make_ohlc  # noqa: E402
+
+REPEATS = 50
+LATEST = ['Close', 'RSI_14', 'EMA_21', 'BB_upper', 'BB_lower', 'volatility']
+
+
+def frame_path(generator, data, asset):
+    df = data.copy()
+    if '(OTC)' in asset:
+        df = generator.apply_otc_modifications(df)
+    df = generator.calculate_advanced_indicators(df)
+    latest = df.iloc[-1]
+    return df, {name: float(latest[name]) for name in LATEST}
+
+
+def candles_path(generator, data, asset):
+    candles = generator.to_candles(asset, data)
+    indicators = IndicatorGraph(candles)
+    return candles, {name: indicators.latest(name) for name in LATEST}
+
+
+def measure(path, generator, data, asset):
+    """(peak bytes, retained bytes, seconds per call, latest values)"""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept, latest = path(generator, data, asset)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        path(generator, data, asset)
+    elapsed = (time.perf_counter() - start) / REPEATS
+
+    return peak - baseline, retained - baseline, elapsed, latest
+
+
+def main(bars):
+    generator = QuotexSignalGenerator(provider=MarketDataProvider())
+    data = make_ohlc(bars)
+
+    print(f"{bars:,} bars per signal (cached frame: {data.memory_usage(deep=True).sum() / 1024:.0f} KiB)\n")
+    print(f"{'asset':<16}{'path':<10}{'peak KiB':>10}{'kept KiB':>10}{'ms/signal':>11}")
+
+    for asset in ['EUR/USD', 'EUR/USD (OTC)']:
+        frame_peak, frame_kept, frame_time, frame_latest = measure(frame_path, generator, data, asset)
+        candle_peak, candle_kept, candle_time, candle_latest = measure(candles_path, generator, data, asset)
+
+        for name, peak, kept, seconds in [('frame', frame_peak, frame_kept, frame_time),
+                                          ('candles', candle_peak, candle_kept, candle_time)]:
+            print(f"{asset:<16}{name:<10}{peak / 1024:>10.0f}{kept / 1024:>10.0f}{seconds * 1000:>11.2f}")
+        print(f"{'':<16}{'ratio':<10}{frame_peak / candle_peak:>9.1f}x{frame_kept / max(candle_kept, 1):>9.1f}x"
+              f"{frame_time / candle_time:>10.1f}x\n")
+
+        if '(OTC)' not in asset:
+            for name, value in frame_latest.items():
+                assert np.isclose(candle_latest[name], value, rtol=1e-9, equal_nan=True), name
+
+    # What the lazy graph evaluates when SMC decides (volatility only) and when the fallback runs
+    indicators = IndicatorGraph(Candles.from_frame(data))
+    indicators.latest('volatility')
+    print(f"Nodes evaluated for an SMC signal: {', '.join(indicators.evaluated)}")
+    generator.technical_direction(indicators)
+    print(f"Nodes evaluated with the fallback: {', '.join(indicators.evaluated)}\n")
+
+    print("✅ Candles path reproduces the latest indicator values of the frame path")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2880)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start of the web app
+
+Runs fresh interpreters against a throwaway database and reports:
+
+- `python -X importtime -c "import app"`: total import time and the
+  heaviest modules app imports directly
+- time until `/` and `/api/assets` answer, checking that pandas, numpy and
+  yfinance are still not loaded at that point
+- the deferred cost: building the signal generator on first use, compared
+  with a start that builds it before serving, as the app used to
+
+Usage: python benchmarks/bench_cold_start.py [runs]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import statistics
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('pandas', 'numpy', 'yfinance')
+
+CHILD = '''
+import sys, time, json
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+if {eager}:
+    import routes
+    routes.get_signal_generator()
+app.init_db()
+client = app.app.test_client()
+assert client.get('/').status_code == 200
+assert client.get('/api/assets').status_code == 200
+served = time.perf_counter()
+loaded = [name for name in {heavy!r} if name in sys.modules]
+import routes
+routes.get_signal_generator()
+generator_ready = time.perf_counter()
+print(json.dumps({{'import_ms': (imported - started) * 1000, 'first_response_ms': (served - started) * 1000,
+                  'generator_ms': (generator_ready - served) * 1000, 'loaded': loaded}}))
+'''
+
+
+def child_env(directory):
+    env = dict(os.environ)
+    env['DATABASE_URL'] = f"sqlite:///{Path(directory) / 'cold_start.db'}"
+    env.pop('BAR_STORE_DIR', None)
+    env['PYTHONPATH'] = str(ROOT)
+    return env
+
+
+def import_profile(env):
+    """(total ms, [(cumulative ms, module)] imported directly by app) from -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    total, children = 0.0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        if name.strip() == 'app' and depth == 0:
+            total = int(cumulative) / 1000
+        elif depth == 1:
+            children.append((int(cumulative) / 1000, name.strip()))
+    return total, sorted(children, reverse=True)
+
+
+def timed_start(env, eager):
+    output = subprocess.run([sys.executable, '-c', CHILD.format(eager=eager, heavy=HEAVY_MODULES)],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs):
+    with tempfile.TemporaryDirectory() as directory:
+        env = child_env(directory)
+
+        total, children = import_profile(env)
+        print(f"import app: {total:.0f} ms")
+        for cumulative, name in children[:8]:
+            print(f"  {cumulative:8.1f} ms  {name}")
+
+        # Warm the OS file cache so neither variant pays for the first disk reads
+        timed_start(env, eager=True)
+        lazy = [timed_start(env, eager=False) for _ in range(runs)]
+        eager = [timed_start(env, eager=True) for _ in range(runs)]
+
+    def median(results, key):
+        return statistics.median(result[key] for result in results)
+
+    print(f"\nMedian of {runs} fresh interpreters:")
+    print(f"{'':<28}{'import ms':>12}{'first response ms':>20}{'generator ms':>15}")
+    print(f"{'lazy (default)':<28}{median(lazy, 'import_ms'):>12.0f}{median(lazy, 'first_response_ms'):>20.0f}"
+          f"{median(lazy, 'generator_ms'):>15.0f}")
+    print(f"{'generator built eagerly':<28}{median(eager, 'import_ms'):>12.0f}"
+          f"{median(eager, 'first_response_ms'):>20.0f}{'-':>15}")
+
+    loaded = sorted({name for result in lazy for name in result['loaded']})
+    assert not loaded, f"{', '.join(loaded)} loaded before the first responses"
+    print(f"\n✅ / and /api/assets answered before {', '.join(HEAVY_MODULES)} were imported")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent signal inserts and reads on SQLite
+
+Runs each configuration in a fresh interpreter against a throwaway database.
+Writer threads insert signals one at a time, as /api/signals/generate and
+the scanner do, while reader threads run the /api/signals/current and
+/api/performance queries:
+
+- per-request commits: rollback journal, synchronous=FULL, every insert in
+  its own session and transaction (how the app used to write)
+- WAL + batched writer: the app's defaults, inserts through DatabaseWriter
+
+Reports insert throughput, write and read latency percentiles and failed
+operations (e.g. "database is locked").
+
+Usage: python benchmarks/bench_db_writes.py [writer threads] [reader threads] [seconds]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = '''
+import sys, time, json, logging, threading
+from app import app, db, init_db
+from models import TradingSignal, PerformanceMetrics
+from db_writer import get_db_writer
+
+init_db()
+logging.getLogger().setLevel(logging.CRITICAL)
+batched = {batched}
+stop = threading.Event()
+lock = threading.Lock()
+writes, reads, errors = [], [], []
+
+def signal(i):
+    return TradingSignal.from_signal_data({{'asset': f'EUR/USD{{i % 40}}', 'signal_type': 'BUY',
+                                            'entry_price': 1.1, 'expiry_time': 5, 'confidence': 80.0}})
+
+def insert(i):
+    row = signal(i)
+    if batched:
+        get_db_writer().write(lambda: db.session.add(row))
+    else:
+        with app.app_context():
+            try:
+                db.session.add(row)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+def read():
+    with app.app_context():
+        TradingSignal.query.filter_by(is_active=True).order_by(TradingSignal.created_at.desc()).limit(50).all()
+        PerformanceMetrics.get_current_metrics().to_dict()
+
+def loop(action, samples, worker):
+    i = worker
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            action(i)
+            with lock:
+                samples.append(time.perf_counter() - start)
+        except Exception as e:
+            with lock:
+                errors.append(type(e).__name__)
+        i += 1000
+
+threads = [threading.Thread(target=loop, args=(insert, writes, w)) for w in range({writers})]
+threads += [threading.Thread(target=loop, args=(lambda i: read(), reads, r)) for r in range({readers})]
+for thread in threads:
+    thread.start()
+time.sleep({seconds})
+stop.set()
+for thread in threads:
+    thread.join()
+
+with app.app_context():
+    stored = TradingSignal.query.count()
+print(json.dumps({{'writes': writes, 'reads': reads, 'errors': errors, 'stored': stored}}))
+'''
+
+CONFIGURATIONS = (
+    ('per-request commits', False, {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL'}),
+    ('WAL + batched writer', True, {}),
+)
+
+
+def percentile(samples, q):
+    if not samples:
+        return float('nan')
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(directory, name, batched, overrides, writers, readers, seconds):
+    env = dict(os.environ)
+    env.update(overrides)
+    env['DATABASE_URL'] = f"sqlite:///{Path(directory) / (name.replace(' ', '_') + '.db')}"
+    env['PYTHONPATH'] = str(ROOT)
+    env.pop('BAR_STORE_DIR', None)
+    env.pop('SHARED_CACHE_DIR', None)
+    script = CHILD.format(batched=batched, writers=writers, readers=readers, seconds=seconds)
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(writers, readers, seconds):
+    print(f"{writers} writer threads, {readers} reader threads, {seconds} s each")
+    print(f"{'':<24}{'inserts/s':>11}{'write p50':>11}{'write p99':>11}{'read p50':>10}{'read p99':>10}{'errors':>8}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, batched, overrides in CONFIGURATIONS:
+            result = results[name] = run(directory, name, batched, overrides, writers, readers, seconds)
+            assert result['stored'] == len(result['writes']), (result['stored'], len(result['writes']))
+            print(f"{name:<24}{len(result['writes']) / seconds:>11.0f}"
+                  f"{percentile(result['writes'], 0.5) * 1000:>9.1f}ms{percentile(result['writes'], 0.99) * 1000:>9.1f}ms"
+                  f"{percentile(result['reads'], 0.5) * 1000:>8.1f}ms{percentile(result['reads'], 0.99) * 1000:>8.1f}ms"
+                  f"{len(result['errors']):>8}")
+
+    batched = results['WAL + batched writer']
+    assert not batched['errors'], set(batched['errors'])
+    print("\n✅ Every acknowledged insert was stored; no failed writes or reads with WAL and the batched writer")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+         float(sys.argv[3]) if len(sys.argv) > 3 else 5)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental IndicatorEngine vs. recomputing the window per new bar
+
+Feeds a growing 1m history to IndicatorEngine.sync the way the live signal
+path does: every call sees the whole window, whose last bar is still forming.
+Each step first syncs a revised version of that forming bar, then the bar as
+it closed, and checks every indicator of both against the pandas reference of
+bench_indicator_graph. Reports the cost per new bar next to IndicatorGraph and
+a full pandas recompute.
+
+Usage: python benchmarks/bench_incremental_indicators.py [history_bars] [appended_bars]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_indicator_graph import ATOL, RTOL, check, pandas_indicators  # noqa: E402
+from candles import Candles  # noqa: E402
+from indicator_engine import IndicatorEngine  # noqa: E402
+from indicator_graph import INDICATOR_COLUMNS, IndicatorGraph  # noqa: E402
+from synthetic import make_ohlc  # noqa: E402
+
+
+def check_snapshot(values, reference, label):
+    for column in INDICATOR_COLUMNS:
+        check([values[column]], [reference[column]], f"{column} {label}")
+
+
+def main(history_bars, appended_bars):
+    df = make_ohlc(history_bars + appended_bars)
+    reference = pandas_indicators(df.copy())
+    candles = Candles.from_frame(df)
+    engine = IndicatorEngine()
+
+    start = time.perf_counter()
+    engine.sync('BENCH', candles.slice(0, history_bars))
+    warm_up_time = time.perf_counter() - start
+
+    sync_times, graph_times = [], []
+    for end in range(history_bars + 1, len(df) + 1):
+        window = candles.slice(0, end)
+
+        # The forming bar is revised before it closes; only its final prices may be appended
+        revised = df.iloc[:end].copy()
+        revised.iloc[-1, revised.columns.get_loc('Close')] *= 1.001
+        revised.iloc[-1, revised.columns.get_loc('High')] *= 1.001
+        values = engine.sync('BENCH', Candles.from_frame(revised))
+        check_snapshot(values, pandas_indicators(revised).iloc[-1], f"while bar {end - 1} was forming")
+
+        start = time.perf_counter()
+        values = engine.sync('BENCH', window)
+        sync_times.append(time.perf_counter() - start)
+        check_snapshot(values, reference.iloc[end - 1], f"at bar {end - 1}")
+
+        start = time.perf_counter()
+        graph = IndicatorGraph(window)
+        for column in INDICATOR_COLUMNS:
+            graph.latest(column)
+        graph_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pandas_indicators(df.copy())
+    pandas_time = time.perf_counter() - start
+
+    print(f"Warm-up of {history_bars} bars:       {warm_up_time * 1000:8.2f} ms")
+    print(f"pandas recompute of {len(df)} bars: {pandas_time * 1000:8.3f} ms per new bar")
+    print(f"IndicatorGraph latest values:  {np.median(graph_times) * 1000:8.3f} ms median per new bar")
+    print(f"IndicatorEngine.sync:          {np.median(sync_times) * 1000:8.3f} ms median per new bar "
+          f"({np.median(graph_times) / np.median(sync_times):.1f}x faster than the graph)")
+    print(f"\n✅ {appended_bars} appended bars, forming and closed, match pandas (rtol={RTOL}, atol={ATOL})")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 2_880, args[1] if len(args) > 1 else 200)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: IndicatorGraph vs. the pandas indicator columns it replaced
+
+The reference below is the original pandas implementation of
+calculate_advanced_indicators, kept here because the generator's version now
+fills its columns from an IndicatorGraph. The benchmark checks every column of
+the graph over the whole history against it, then appends bars one at a time
+and checks the latest values the signal path reads (tail=1) after each one,
+comparing the cost per new bar with a full pandas recompute.
+
+Usage: python benchmarks/bench_indicator_graph.py [history_bars] [appended_bars]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from candles import Candles  # noqa: E402
+from indicator_graph import INDICATOR_COLUMNS, MA_PERIODS, RSI_PERIODS, IndicatorGraph  # noqa: E402
+from synthetic import make_ohlc  # noqa: E402
+
+RTOL = 1e-7
+ATOL = 1e-9
+
+
+def pandas_indicators(df):
+    """The original calculate_advanced_indicators, column for column"""
+    for period in MA_PERIODS:
+        df[f'SMA_{period}'] = df['Close'].rolling(window=period).mean()
+        df[f'EMA_{period}'] = df['Close'].ewm(span=period).mean()
+
+    for period in RSI_PERIODS:
+        delta = df['Close'].diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        rs = gain / loss
+        df[f'RSI_{period}'] = 100 - (100 / (1 + rs))
+
+    ema_12 = df['Close'].ewm(span=12).mean()
+    ema_26 = df['Close'].ewm(span=26).mean()
+    df['MACD'] = ema_12 - ema_26
+    df['MACD_signal'] = df['MACD'].ewm(span=9).mean()
+    df['MACD_histogram'] = df['MACD'] - df['MACD_signal']
+
+    sma_20 = df['Close'].rolling(window=20).mean()
+    std_20 = df['Close'].rolling(window=20).std()
+    df['BB_upper'] = sma_20 + (std_20 * 2)
+    df['BB_middle'] = sma_20
+    df['BB_lower'] = sma_20 - (std_20 * 2)
+
+    lowest_low = df['Low'].rolling(window=14).min()
+    highest_high = df['High'].rolling(window=14).max()
+    df['Stoch_K'] = ((df['Close'] - lowest_low) / (highest_high - lowest_low)) * 100
+    df['Stoch_D'] = df['Stoch_K'].rolling(window=3).mean()
+    df['Williams_R'] = ((highest_high - df['Close']) / (highest_high - lowest_low)) * -100
+
+    df['volatility'] = df['Close'].pct_change().rolling(window=20).std()
+
+    df['price_momentum'] = df['Close'].diff(5)
+    df['rsi_momentum'] = df['RSI_14'].diff(5)
+    df['bullish_divergence'] = (df['price_momentum'] < 0) & (df['rsi_momentum'] > 0) & (df['RSI_14'] < 30)
+    df['bearish_divergence'] = (df['price_momentum'] > 0) & (df['rsi_momentum'] < 0) & (df['RSI_14'] > 70)
+    return df
+
+
+def check(actual, expected, label):
+    """Assert graph values match the pandas reference within tolerance, NaN for NaN"""
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    assert np.array_equal(np.isnan(actual), np.isnan(expected)), f"{label}: NaN positions differ"
+    assert np.allclose(actual, expected, rtol=RTOL, atol=ATOL, equal_nan=True), \
+        f"{label}: max difference {np.nanmax(np.abs(actual - expected))}"
+
+
+def main(history_bars, appended_bars):
+    df = make_ohlc(history_bars + appended_bars)
+    reference = pandas_indicators(df.copy())
+    candles = Candles.from_frame(df)
+
+    graph = IndicatorGraph(candles, tail=len(candles))
+    for column in INDICATOR_COLUMNS:
+        check(graph[column], reference[column], f"{column} over {len(df)} bars")
+
+    pandas_times = []
+    graph_times = []
+    for end in range(history_bars + 1, len(df) + 1):
+        start = time.perf_counter()
+        latest = pandas_indicators(df.iloc[:end].copy()).iloc[-1]
+        pandas_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        graph = IndicatorGraph(candles.slice(0, end))
+        values = {column: graph.latest(column) for column in INDICATOR_COLUMNS}
+        graph_times.append(time.perf_counter() - start)
+
+        for column in INDICATOR_COLUMNS:
+            check([values[column]], [latest[column]], f"{column} at bar {end - 1}")
+
+    pandas_ms = np.median(pandas_times) * 1000
+    graph_ms = np.median(graph_times) * 1000
+    print(f"pandas recompute of every column: {pandas_ms:8.3f} ms median per new bar")
+    print(f"IndicatorGraph latest values:     {graph_ms:8.3f} ms median per new bar "
+          f"({pandas_ms / graph_ms:.1f}x faster)")
+    print(f"\n✅ Every column over {len(df)} bars and the latest values after {appended_bars} appended bars "
+          f"match pandas (rtol={RTOL}, atol={ATOL})")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 2_880, args[1] if len(args) > 1 else 200)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parameter sweep scaling across worker processes
+
+Runs the same grid over several synthetic assets with 1..N workers, checks the
+shared-memory results against an in-process backtest, and reports the speedup
+and parallel efficiency per worker count.
+
+Usage: python benchmarks/bench_parameter_sweep.py [n_bars] [n_assets]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backtest import run_backtest  # noqa: E402
+from parameter_sweep import parameter_grid, run_sweep  # noqa: E402
+from synthetic import make_ohlc  # noqa: E402
+
+
+def main(n_bars, n_assets):
+    histories = {f'ASSET{i}': make_ohlc(n_bars, seed=i) for i in range(n_assets)}
+    grid = parameter_grid([3, 5, 8], [(20, 80), (25, 75), (30, 70)], [9, 21, 50])
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in worker_counts:
+            output = Path(directory) / f'sweep_{workers}.csv'
+            start = time.perf_counter()
+            results = run_sweep(histories, grid, output, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+
+            evaluations = len(grid) * n_assets
+            print(f"{workers:>2} workers: {elapsed:6.2f} s, {evaluations / elapsed:6.1f} parameter sets/s, "
+                  f"speedup {baseline / elapsed:4.2f}x, efficiency {baseline / elapsed / workers * 100:5.1f}%")
+
+    # Shared-memory results must equal a plain in-process backtest
+    expected = run_backtest(histories['ASSET0'], 'ASSET0', swing_length=5, rsi_low=25, rsi_high=75, ema_period=21)
+    actual = results[(results.asset == 'ASSET0') & (results.swing_length == 5) &
+                     (results.rsi_low == 25) & (results.ema_period == 21)].sort_values('expiry')
+    assert list(actual.wins) == list(expected.wins) and list(actual.trades) == list(expected.trades)
+    print(f"\n✅ {len(results)} result rows; shared-memory results match the in-process backtest")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 100_000, args[1] if len(args) > 1 else 4)
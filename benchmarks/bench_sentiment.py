@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cached SentimentProvider vs. one HTTP call per lookup
+
+Points a provider at a local Fear & Greed stub that answers slowly and
+compares per-signal sentiment latency with and without the shared cache,
+including the stale-while-revalidate path when the upstream starts failing.
+
+Usage: python benchmarks/bench_sentiment.py [lookups]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from market_sentiment import MarketSentimentAnalyzer, SentimentProvider  # noqa: E402
+from stubs import FearGreedStubServer  # noqa: E402
+
+
+def time_lookups(lookup, lookups):
+    start = time.perf_counter()
+    for _ in range(lookups):
+        result = lookup()
+    return (time.perf_counter() - start) / lookups, result
+
+
+def main(lookups):
+    with FearGreedStubServer(value=72, classification='Greed', delay=0.05) as stub:
+        # Previous behaviour: one HTTP round-trip per lookup
+        uncached = SentimentProvider(url=stub.url, background=False)
+        uncached_time, _ = time_lookups(uncached.fetch, lookups)
+        uncached_requests = stub.requests
+
+        stub.requests = 0
+        cached = SentimentProvider(url=stub.url, background=False)
+        analyzer = MarketSentimentAnalyzer(cached)
+        cached.refresh()
+        cached_time, sentiment = time_lookups(lambda: analyzer.get_market_sentiment('EUR/USD'), lookups)
+        assert sentiment['overall_sentiment'] == 'NEUTRAL' and sentiment['fear_greed']['value'] == 72
+        cached_requests = stub.requests
+
+        # Upstream goes down after the TTL expired: the stale value is still served
+        stub.status = 503
+        cached.ttl = 0
+        cached.retry_after = 0
+        stale = cached.get_fear_greed_index()
+        assert stale is not None and stale['value'] == 72
+
+    print(f"Uncached: {uncached_time * 1000:.2f} ms per lookup, {uncached_requests} HTTP requests")
+    print(f"Cached:   {cached_time * 1e6:.2f} µs per lookup, {cached_requests} HTTP request(s)")
+    print("\n✅ Stale value served while the upstream returns errors")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: market data, sentiment and events shared by forked workers
+
+Forks N processes, as `run.py serve` does, and compares private caches with
+a SharedCache in a throwaway directory:
+
+- market data: every worker asks for the same symbols in its own order,
+  each download taking --latency seconds; reports downloads and wall time
+- sentiment: every worker asks for the Fear & Greed Index from a local stub;
+  reports the requests the stub received
+- events: one worker publishes through a SharedEventLog while another
+  follows it; reports the relay latency
+
+Usage: python benchmarks/bench_shared_cache.py [workers] [symbols] [--latency 0.2]
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from event_broadcaster import EventBroadcaster  # noqa: E402
+from market_data_cache import MarketDataCache  # noqa: E402
+from market_sentiment import SentimentProvider  # noqa: E402
+from shared_cache import SharedCache, SharedEventLog  # noqa: E402
+from stubs import FearGreedStubServer  # noqa: E402
+from synthetic import make_ohlc  # noqa: E402
+
+FORK = multiprocessing.get_context('fork')
+
+
+def market_data_worker(worker, directory, symbols, latency, downloads):
+    cache = MarketDataCache(shared=SharedCache(directory) if directory else None)
+    frame = make_ohlc(2_880)
+
+    def fetch():
+        time.sleep(latency)
+        with downloads.get_lock():
+            downloads.value += 1
+        return frame
+
+    order = list(symbols)
+    random.Random(worker).shuffle(order)
+    for symbol in order:
+        data = cache.get_or_fetch(symbol, '2d', '1m', fetch)
+        assert data is not None and len(data) == len(frame)
+
+
+def sentiment_worker(worker, directory, url):
+    provider = SentimentProvider(url=url, background=False, shared=SharedCache(directory) if directory else None)
+    assert provider.get_fear_greed_index()['value'] == 72
+
+
+def run_workers(target, args_for, workers):
+    """Wall time of `workers` forked processes running target(*args_for(worker))"""
+    processes = [FORK.Process(target=target, args=args_for(worker)) for worker in range(workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    return time.perf_counter() - start
+
+
+def relay_latency(directory, events):
+    """Seconds from publish in one process to delivery in another, per event"""
+    log = SharedEventLog(Path(directory) / 'events.log')
+    received = FORK.Queue()
+    ready = FORK.Event()
+
+    def follower():
+        broadcaster = EventBroadcaster(relay=log)
+        broadcaster.add_listener(lambda event, data: received.put(time.time() - data['sent_at']))
+        broadcaster.start_relay()
+        ready.set()
+        time.sleep(60)
+
+    process = FORK.Process(target=follower, daemon=True)
+    process.start()
+    ready.wait()
+    time.sleep(0.5)
+
+    publisher = EventBroadcaster(relay=log)
+    for _ in range(events):
+        publisher.publish('signal', {'sent_at': time.time()})
+        time.sleep(0.01)
+
+    latencies = [received.get(timeout=10) for _ in range(events)]
+    process.terminate()
+    return latencies
+
+
+def main(workers, n_symbols, latency):
+    symbols = [f'SYM{i}=X' for i in range(n_symbols)]
+    print(f"{workers} workers, {n_symbols} symbols, {latency * 1000:.0f} ms per download")
+
+    for label, shared in (('private caches', False), ('shared cache', True)):
+        with tempfile.TemporaryDirectory() as directory:
+            downloads = FORK.Value('i', 0)
+            elapsed = run_workers(market_data_worker, lambda worker: (
+                worker, directory if shared else None, symbols, latency, downloads), workers)
+            print(f"market data, {label:<15} {downloads.value:5d} downloads  {elapsed:6.2f} s")
+            if shared:
+                assert downloads.value == n_symbols, downloads.value
+                shared_downloads = downloads.value
+
+    with FearGreedStubServer(value=72, classification='Greed', delay=0.1) as stub:
+        for label, shared in (('private caches', False), ('shared cache', True)):
+            before = stub.requests
+            with tempfile.TemporaryDirectory() as directory:
+                run_workers(sentiment_worker, lambda worker: (worker, directory if shared else None, stub.url), workers)
+            print(f"sentiment,   {label:<15} {stub.requests - before:5d} requests")
+        assert stub.requests - before == 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        latencies = relay_latency(directory, 50)
+    print(f"event relay: median {statistics.median(latencies) * 1000:.1f} ms, "
+          f"max {max(latencies) * 1000:.1f} ms over {len(latencies)} events")
+
+    print(f"\n✅ Shared cache: {shared_downloads} downloads for {n_symbols} symbols across {workers} workers, "
+          "one sentiment request, every event relayed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('workers', nargs='?', type=int, default=4)
+    parser.add_argument('symbols', nargs='?', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.2)
+    args = parser.parse_args()
+    main(args.workers, args.symbols, args.latency)
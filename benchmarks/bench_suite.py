@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: signal pipeline hot paths on synthetic data
+
+Times each case at several history sizes and reports the median and best
+wall time, throughput, and peak traced memory (from a separate run under
+tracemalloc, which would otherwise slow the timed runs down):
+
+- indicators:       QuotexSignalGenerator.calculate_advanced_indicators
+- market_structure: SMCAnalyzer.identify_market_structure
+- generate_signal:  generate_quotex_signal end to end, bars served by a
+                    SyntheticProvider and sentiment by a local Fear & Greed stub
+- api_generate:     POST /api/signals/generate through the Flask test client
+
+and the read endpoints against a throwaway SQLite database seeded with
+--signals rows, with the response cache cleared before every request.
+
+Results can be saved with --json and compared with a previous run with
+--compare; the script exits with status 1 when a case got slower or used
+more memory than --tolerance allows.
+
+Usage: python benchmarks/bench_suite.py [--sizes 1k,10k,100k,1M] [--cases indicators,...]
+                                        [--signals 10000] [--json out.json]
+                                        [--compare baseline.json] [--tolerance 0.25]
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep the suite away from the real database and bar store
+DATABASE_DIR = tempfile.TemporaryDirectory()
+os.environ['DATABASE_URL'] = f"sqlite:///{Path(DATABASE_DIR.name) / 'bench.db'}"
+os.environ.pop('BAR_STORE_DIR', None)
+
+from market_data_cache import MarketDataCache  # noqa: E402
+from market_sentiment import MarketSentimentAnalyzer, SentimentProvider  # noqa: E402
+from quotex_assets import QUOTEX_PAIRS  # noqa: E402
+from quotex_signal_generator import QuotexSignalGenerator  # noqa: E402
+from smc_analyzer import SMCAnalyzer  # noqa: E402
+from stubs import FearGreedStubServer, SyntheticProvider  # noqa: E402
+
+BAR_CASES = ('indicators', 'market_structure', 'generate_signal', 'api_generate')
+ENDPOINT_CASES = ('api_current', 'api_history_page', 'api_history_keyset', 'api_performance', 'api_assets')
+ASSET = 'EUR/USD'
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def repeats_for(n_bars):
+    """Enough runs for a stable median without spending minutes on 1M bars"""
+    return max(3, min(20, 200_000 // max(n_bars, 1)))
+
+
+def measure(run, setup=lambda: None, repeat=5):
+    """(median seconds, best seconds, peak traced bytes) of run(setup())"""
+    run(setup())  # warm-up: imports, caches, lazily built objects
+    # One full collection per case; collecting before every run costs more than the small cases
+    gc.collect()
+
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return float(np.median(times)), min(times), peak
+
+
+class Suite:
+    """Generator, Flask client and stubs shared by every case"""
+
+    def __init__(self, stub_url):
+        self.sentiment = MarketSentimentAnalyzer(SentimentProvider(url=stub_url, background=False))
+        self.analyzer = SMCAnalyzer()
+
+        from app import app, init_db
+        import routes
+
+        init_db()
+
+        # The app configures DEBUG logging; request and SQL chatter would drown the report
+        logging.getLogger().setLevel(logging.WARNING)
+
+        self.app = app
+        self.routes = routes
+        self.client = app.test_client()
+
+    def generator(self, provider):
+        generator = QuotexSignalGenerator(data_cache=MarketDataCache(max_bytes=2 ** 34), provider=provider)
+        generator.sentiment_analyzer = self.sentiment
+        return generator
+
+    def bar_case(self, case, n_bars):
+        """(setup, run) for one bar-sized case"""
+        provider = SyntheticProvider(n_bars)
+        generator = self.generator(provider)
+        frame = provider.frame
+
+        if case == 'indicators':
+            return frame.copy, generator.calculate_advanced_indicators
+        if case == 'market_structure':
+            return lambda: frame, self.analyzer.identify_market_structure
+        if case == 'generate_signal':
+            # A fresh cache each run, so the bars go through the fetch path every time
+            return generator.data_cache.clear, lambda _: generator.generate_quotex_signal(ASSET)
+        if case == 'api_generate':
+            self.routes.signal_gen = generator
+
+            def run(_):
+                response = self.client.post('/api/signals/generate', json={'asset': ASSET})
+                assert response.status_code in (200, 400), response.status_code
+            return generator.data_cache.clear, run
+        raise ValueError(f"Unknown case: {case}")
+
+    def seed_signals(self, count):
+        """Insert `count` signals a minute apart, the newest 10 still active"""
+        from app import db
+        from models import TradingSignal
+        from sqlalchemy import insert
+
+        rng = np.random.default_rng(7)
+        assets = [asset for category_assets in QUOTEX_PAIRS.values() for asset in category_assets]
+        now = datetime.utcnow()
+        rows = [{
+            'asset': assets[i % len(assets)],
+            'signal_type': 'BUY' if rng.random() < 0.5 else 'SELL',
+            'entry_price': float(rng.uniform(1, 2)),
+            'expiry_time': 5,
+            'confidence': 80.0,
+            'created_at': now - timedelta(minutes=count - i),
+            'is_active': i >= count - 10,
+            'result': None if i >= count - 10 else ('WIN' if rng.random() < 0.6 else 'LOSS'),
+            'profit_loss': 0.0
+        } for i in range(count)]
+
+        with self.app.app_context():
+            db.session.execute(insert(TradingSignal), rows)
+            db.session.commit()
+
+    def endpoint_case(self, case):
+        """(setup, run) for one read endpoint, uncached"""
+        from response_cache import response_cache
+
+        if case == 'api_history_keyset':
+            cursor = self.client.get('/api/signals/history?page=50').get_json()['pagination']['next_before']
+            url = f'/api/signals/history?before={cursor}'
+        else:
+            url = {
+                'api_current': '/api/signals/current',
+                'api_history_page': '/api/signals/history?page=50',
+                'api_performance': '/api/performance?group_by=asset',
+                'api_assets': '/api/assets',
+            }[case]
+
+        def run(_):
+            response = self.client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+        return response_cache.clear, run
+
+
+def format_bytes(size):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if size < 1024 or unit == 'GiB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def report(results):
+    print(f"{'case':<20}{'size':>10}{'median ms':>12}{'best ms':>12}{'throughput':>18}{'peak memory':>14}")
+    for result in results:
+        unit = 'bars/s' if result['size'] else 'req/s'
+        throughput = (result['size'] or 1) / result['median_seconds']
+        print(f"{result['case']:<20}{result['size'] or '-':>10}{result['median_seconds'] * 1000:>12.2f}"
+              f"{result['best_seconds'] * 1000:>12.2f}{throughput:>11,.0f} {unit:<6}"
+              f"{format_bytes(result['peak_bytes']):>14}")
+
+
+def compare(results, baseline_path, tolerance):
+    """Print changes against a saved run and return the regressed cases"""
+    baseline = {(row['case'], row['size']): row for row in json.loads(Path(baseline_path).read_text())['results']}
+    regressions = []
+
+    print(f"\nAgainst {baseline_path} (tolerance {tolerance:.0%}):")
+    for result in results:
+        previous = baseline.get((result['case'], result['size']))
+        if previous is None:
+            continue
+        time_ratio = result['median_seconds'] / previous['median_seconds']
+        memory_ratio = result['peak_bytes'] / max(previous['peak_bytes'], 1)
+        regressed = time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance
+        if regressed:
+            regressions.append(result)
+        print(f"  {'❌' if regressed else '  '} {result['case']:<20}{result['size'] or '-':>10}"
+              f"  time x{time_ratio:.2f}  memory x{memory_ratio:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1k,10k,100k,1M')
+    parser.add_argument('--cases', default=','.join(BAR_CASES + ENDPOINT_CASES))
+    parser.add_argument('--signals', type=int, default=10_000, help='rows seeded for the read endpoints')
+    parser.add_argument('--json', help='save the results to this file')
+    parser.add_argument('--compare', help='results file of a previous run')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+    unknown = set(cases) - set(BAR_CASES + ENDPOINT_CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = []
+    with FearGreedStubServer(value=72, classification='Greed') as stub:
+        suite = Suite(stub.url)
+
+        for case in (case for case in BAR_CASES if case in cases):
+            for n_bars in sizes:
+                setup, run = suite.bar_case(case, n_bars)
+                median, best, peak = measure(run, setup, repeats_for(n_bars))
+                results.append({'case': case, 'size': n_bars, 'median_seconds': median,
+                                'best_seconds': best, 'peak_bytes': peak})
+
+        endpoint_cases = [case for case in ENDPOINT_CASES if case in cases]
+        if endpoint_cases:
+            suite.seed_signals(args.signals)
+            for case in endpoint_cases:
+                setup, run = suite.endpoint_case(case)
+                median, best, peak = measure(run, setup, repeat=50)
+                results.append({'case': case, 'size': None, 'median_seconds': median,
+                                'best_seconds': best, 'peak_bytes': peak})
+
+    report(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            'created_at': datetime.utcnow().isoformat(),
+            'python': sys.version.split()[0],
+            'signals': args.signals,
+            'results': results
+        }, indent=2))
+        print(f"\nSaved results to {args.json}")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized swing-high/low detection vs. the original per-bar loops
+
+Checks that SMCAnalyzer.find_swing_highs / find_swing_lows return exactly the
+swing points of the original nested-loop implementation and reports the speedup.
+
+Usage: python benchmarks/bench_swing_points.py [n_bars ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from smc_analyzer import SMCAnalyzer  # noqa: E402
+from synthetic import make_ohlc  # noqa: E402
+
+
+def loop_swing_highs(df, swing_length):
+    """Original implementation, kept as the reference"""
+    swing_highs = []
+    for i in range(swing_length, len(df) - swing_length):
+        current_high = df['High'].iloc[i]
+        is_swing_high = True
+
+        for j in range(i - swing_length, i + swing_length + 1):
+            if j != i and df['High'].iloc[j] >= current_high:
+                is_swing_high = False
+                break
+
+        if is_swing_high:
+            swing_highs.append({'index': i, 'price': current_high, 'time': df.index[i]})
+
+    return swing_highs
+
+
+def loop_swing_lows(df, swing_length):
+    """Original implementation, kept as the reference"""
+    swing_lows = []
+    for i in range(swing_length, len(df) - swing_length):
+        current_low = df['Low'].iloc[i]
+        is_swing_low = True
+
+        for j in range(i - swing_length, i + swing_length + 1):
+            if j != i and df['Low'].iloc[j] <= current_low:
+                is_swing_low = False
+                break
+
+        if is_swing_low:
+            swing_lows.append({'index': i, 'price': current_low, 'time': df.index[i]})
+
+    return swing_lows
+
+
+def timed(func, *args, repeat=3):
+    """Return (best wall time, last result) over a few runs"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def check_match(reference, points):
+    """Assert the vectorized points equal the reference list of dicts"""
+    assert len(reference) == len(points), f"{len(reference)} != {len(points)} swing points"
+    assert np.array_equal([p['index'] for p in reference], points['index'])
+    assert np.array_equal([p['price'] for p in reference], points['price'])
+
+
+def main(sizes):
+    analyzer = SMCAnalyzer()
+
+    print(f"{'bars':>8} {'side':>5} {'points':>7} {'loop (ms)':>11} {'numpy (ms)':>11} {'speedup':>9}")
+    for n_bars in sizes:
+        df = make_ohlc(n_bars)
+
+        for side, reference_func, vector_func in (
+            ('high', loop_swing_highs, analyzer.find_swing_highs),
+            ('low', loop_swing_lows, analyzer.find_swing_lows),
+        ):
+            loop_time, reference = timed(reference_func, df, analyzer.swing_length, repeat=1)
+            vector_time, points = timed(vector_func, df)
+            check_match(reference, points)
+
+            print(f"{n_bars:>8} {side:>5} {len(points):>7} {loop_time * 1000:>11.2f} "
+                  f"{vector_time * 1000:>11.3f} {loop_time / vector_time:>8.0f}x")
+
+    print("\n✅ Vectorized swing points match the loop implementation")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 2_880, 10_000])
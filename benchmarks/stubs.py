@@ -0,0 +1,92 @@
+"""
+Local stand-ins for external services used by the benchmark scripts
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from market_data_providers import MarketDataProvider
+from synthetic import make_ohlc
+
+
+class FearGreedStubServer:
+    """
+    Serves a fixed alternative.me style Fear & Greed payload on localhost
+
+    Usage:
+        with FearGreedStubServer(value=72, classification='Greed') as stub:
+            provider = SentimentProvider(url=stub.url, background=False)
+    """
+
+    def __init__(self, value=50, classification='Neutral', delay=0.0, status=200):
+        self.value = value
+        self.classification = classification
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/fng/'
+
+    def payload(self):
+        return {
+            'name': 'Fear and Greed Index',
+            'data': [{
+                'value': str(self.value),
+                'value_classification': self.classification,
+                'timestamp': str(int(time.time()))
+            }]
+        }
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                if stub.delay:
+                    time.sleep(stub.delay)
+                body = json.dumps(stub.payload()).encode()
+                self.send_response(stub.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class SyntheticProvider(MarketDataProvider):
+    """
+    Market data provider serving one prebuilt random-walk frame for every symbol
+
+    The frame is built once, so fetches cost nothing and a benchmark measures
+    only what the pipeline does with the bars.
+    """
+
+    name = 'synthetic'
+
+    def __init__(self, n_bars, seed=42):
+        self.frame = make_ohlc(n_bars, seed=seed)
+        self.fetches = 0
+
+    def fetch_bars(self, symbol, interval='1m', period=None, start=None):
+        self.fetches += 1
+        return self.frame
@@ -0,0 +1,28 @@
+"""
+Synthetic OHLCV generators shared by the benchmark scripts
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_ohlc(n_bars, start_price=1.1, volatility=0.0004, seed=42, freq='1min'):
+    """Build a random-walk 1m OHLCV frame shaped like a yfinance download"""
+    rng = np.random.default_rng(seed)
+
+    returns = rng.normal(0, volatility, n_bars)
+    close = start_price * np.exp(np.cumsum(returns))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    spread = np.abs(rng.normal(0, volatility, n_bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(100, 10_000, n_bars).astype(np.float64)
+
+    index = pd.date_range('2024-01-01', periods=n_bars, freq=freq, tz='UTC')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': volume
+    }, index=index)
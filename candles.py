@@ -0,0 +1,76 @@
+import numpy as np
+
+from bar_store import to_utc_nanoseconds
+
+# Frame column -> Candles attribute
+CANDLE_FIELDS = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'}
+
+
+class Candles:
+    """
+    Compact OHLCV bars: one contiguous float64 array per field plus int64 UTC
+    nanosecond timestamps
+
+    Built from a market data frame without copying its float64 columns, so
+    treat the arrays as read-only; scale_prices returns new arrays instead of
+    modifying them. Columns can also be read frame-style (candles['High']),
+    which is all SMCAnalyzer needs.
+    """
+
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, timestamp, open, high, low, close, volume=None):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume if volume is not None else np.zeros(len(close))
+
+    @staticmethod
+    def from_frame(df, tail=None):
+        """Candles over the last `tail` rows (all by default) of an OHLCV frame"""
+        if tail is not None:
+            df = df.iloc[-tail:]
+        columns = {
+            field: np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)).ravel()
+            for column, field in CANDLE_FIELDS.items() if column in df.columns
+        }
+        return Candles(to_utc_nanoseconds(df.index), **columns)
+
+    def __len__(self):
+        return len(self.close)
+
+    def __getitem__(self, column):
+        return getattr(self, CANDLE_FIELDS[column])
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, field).nbytes for field in self.__slots__)
+
+    def tail(self, bars):
+        """View of the last `bars` candles; all of them when there are fewer, none when bars <= 0"""
+        # [-0:] would be the whole array
+        return self.slice(max(len(self) - bars, 0) if bars > 0 else len(self))
+
+    def slice(self, start, stop=None):
+        """View of candles[start:stop]"""
+        return Candles(*(getattr(self, field)[start:stop] for field in self.__slots__))
+
+    @staticmethod
+    def concatenate(parts):
+        """New candles holding `parts` one after another"""
+        return Candles(*(np.concatenate([getattr(part, field) for part in parts]) for field in Candles.__slots__))
+
+    def scale_prices(self, factors):
+        """New candles with Open/High/Low/Close multiplied by `factors`"""
+        return Candles(self.timestamp, self.open * factors, self.high * factors,
+                       self.low * factors, self.close * factors, self.volume)
+
+    def to_frame(self):
+        import pandas as pd
+
+        index = pd.DatetimeIndex(self.timestamp.view('M8[ns]')).tz_localize('UTC')
+        return pd.DataFrame({column: getattr(self, field) for column, field in CANDLE_FIELDS.items()},
+                            index=index)
+
@@ -0,0 +1,155 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+from sqlalchemy import text
+
+from pipeline_metrics import pipeline_metrics
+
+
+class WriteJob:
+    """One unit of work for the writer thread and the future its caller waits on"""
+
+    __slots__ = ('work', 'future')
+
+    def __init__(self, work):
+        self.work = work
+        self.future = Future()
+
+
+class DatabaseWriter:
+    """
+    Single thread that applies every database write of the process
+
+    Callers hand over a function that adds or updates rows through db.session
+    without committing. The thread takes every job queued while the previous
+    batch was committing (at most `max_batch`), runs them in one transaction
+    and commits once, so concurrent requests share one fsync. A
+    DB_WRITE_WINDOW_MS above 0 also waits that long for more jobs; under
+    load the queue fills during commits anyway, and waiting only adds
+    latency to lone writes.
+    On SQLite the transaction starts with BEGIN IMMEDIATE, taking the write
+    lock before any read so it can wait on busy_timeout instead of failing
+    an upgrade. If a batch fails, its jobs are retried one transaction each,
+    so only the job at fault reports the error.
+
+    Committed objects keep their loaded attributes (ids, defaults) after the
+    writer's session is closed, so callers can serialize them directly.
+    """
+
+    def __init__(self, app, window_ms=None, max_batch=None):
+        self.app = app
+        self.window_seconds = (window_ms if window_ms is not None
+                               else float(os.environ.get('DB_WRITE_WINDOW_MS', 0))) / 1000
+        self.max_batch = max_batch or int(os.environ.get('DB_WRITE_BATCH_SIZE', 500))
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.stats = {'jobs': 0, 'batches': 0, 'failed_batches': 0, 'failed_jobs': 0, 'largest_batch': 0}
+
+    def submit(self, work):
+        """Queue `work()` for the next batch and return a Future of its result"""
+        job = WriteJob(work)
+        if self._thread is not None and threading.current_thread() is self._thread:
+            # Called from another job: it is already inside the writer's transaction
+            job.future.set_result(work())
+            return job.future
+
+        self._ensure_started()
+        self._queue.put(job)
+        return job.future
+
+    def write(self, work, timeout=None):
+        """Run `work()` in the next committed batch and return its result, re-raising its error"""
+        return self.submit(work).result(timeout)
+
+    def _ensure_started(self):
+        # Started on first use so that forked server workers each get their own thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+            self._thread.start()
+
+    def _collect(self):
+        """Block for one job, then take whatever else is queued or arrives within the window"""
+        jobs = [self._queue.get()]
+        deadline = time.monotonic() + self.window_seconds
+        while len(jobs) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                jobs.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def _run(self):
+        while True:
+            jobs = self._collect()
+            with self._lock:
+                self.stats['batches'] += 1
+                self.stats['jobs'] += len(jobs)
+                self.stats['largest_batch'] = max(self.stats['largest_batch'], len(jobs))
+
+            if self._commit(jobs) or len(jobs) == 1:
+                continue
+
+            logging.warning(f"Batch of {len(jobs)} database writes failed, retrying them one by one")
+            with self._lock:
+                self.stats['failed_batches'] += 1
+            for job in jobs:
+                self._commit([job])
+
+    def _commit(self, jobs):
+        """Run the jobs in one transaction; on failure roll back and, for a single job, report the error"""
+        from app import db
+
+        with self.app.app_context():
+            session = db.session()
+            session.expire_on_commit = False
+            try:
+                with pipeline_metrics.timer('db_write_batch'):
+                    if db.engine.dialect.name == 'sqlite':
+                        session.execute(text('BEGIN IMMEDIATE'))
+                    results = [job.work() for job in jobs]
+                    session.commit()
+            except Exception as e:
+                session.rollback()
+                if len(jobs) == 1:
+                    logging.error(f"Database write failed: {e}")
+                    with self._lock:
+                        self.stats['failed_jobs'] += 1
+                    jobs[0].future.set_exception(e)
+                return False
+
+        for job, result in zip(jobs, results):
+            job.future.set_result(result)
+        return True
+
+    def status(self):
+        with self._lock:
+            return dict(self.stats, queued=self._queue.qsize(),
+                        window_ms=self.window_seconds * 1000, max_batch=self.max_batch)
+
+
+db_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_db_writer():
+    """The process-wide writer for the Flask app, created on first use"""
+    global db_writer
+
+    if db_writer is None:
+        with _writer_lock:
+            if db_writer is None:
+                from app import app
+                db_writer = DatabaseWriter(app)
+    return db_writer
@@ -0,0 +1,151 @@
+import os
+import json
+import queue
+import logging
+import threading
+
+from shared_cache import default_event_log
+
+
+class Subscriber:
+    """One open event stream with its own bounded outbox"""
+
+    __slots__ = ('queue', 'closed')
+
+    def __init__(self, queue_size):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.closed = False
+
+
+class EventBroadcaster:
+    """
+    In-memory fan-out of server events to Server-Sent Events subscribers
+
+    Each event is serialized once and handed to every subscriber's bounded
+    queue without blocking the publisher. A subscriber whose queue is full has
+    fallen too far behind: it is disconnected, and its EventSource reconnects
+    and reloads the current state.
+
+    With a `relay` SharedEventLog, events are also passed to the other worker
+    processes once `start_relay()` runs, so streams and listeners there see
+    signals stored by this one.
+    """
+
+    def __init__(self, queue_size=None, max_subscribers=None, keepalive=15, relay=None):
+        self.queue_size = queue_size or int(os.environ.get('EVENT_QUEUE_SIZE', 100))
+        self.max_subscribers = max_subscribers or int(os.environ.get('EVENT_MAX_SUBSCRIBERS', 100))
+        # Seconds between comment lines that keep idle connections open through proxies
+        self.keepalive = keepalive
+        self.relay = relay
+
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._listeners = []
+
+        self.stats = {'published': 0, 'delivered': 0, 'disconnected_slow': 0, 'rejected': 0, 'relayed': 0}
+
+    def subscribe(self):
+        """Register a new stream, or return None when the subscriber limit is reached"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self.stats['rejected'] += 1
+                return None
+            subscriber = Subscriber(self.queue_size)
+            self._subscribers.add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        subscriber.closed = True
+
+    def add_listener(self, callback):
+        """Call `callback(event, data)` in-process for every published event"""
+        self._listeners.append(callback)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def start_relay(self):
+        """Start receiving the events published by other processes; call it in each worker after the fork"""
+        if self.relay is not None:
+            self.relay.follow(self._relayed)
+
+    def publish(self, event, data):
+        """Send one event to every subscriber, in this process and through the relay"""
+        self._deliver(event, data)
+        if self.relay is not None:
+            try:
+                self.relay.append(event, data)
+            except Exception as e:
+                logging.error(f"Error relaying {event} event: {e}")
+
+    def _relayed(self, event, data):
+        with self._lock:
+            self.stats['relayed'] += 1
+        self._deliver(event, data)
+
+    def _deliver(self, event, data):
+        with self._lock:
+            self._next_id += 1
+            message = f"id: {self._next_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+            subscribers = list(self._subscribers)
+            self.stats['published'] += 1
+
+        for callback in self._listeners:
+            callback(event, data)
+
+        slow = []
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(message)
+            except queue.Full:
+                slow.append(subscriber)
+
+        with self._lock:
+            self.stats['delivered'] += len(subscribers) - len(slow)
+            self.stats['disconnected_slow'] += len(slow)
+            for subscriber in slow:
+                self._subscribers.discard(subscriber)
+                subscriber.closed = True
+
+    def stream(self, subscriber):
+        """Generator of SSE frames for a Flask streaming response"""
+        try:
+            yield "retry: 5000\n\n"
+            while not subscriber.closed:
+                try:
+                    yield subscriber.queue.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def status(self):
+        with self._lock:
+            return dict(self.stats, subscribers=len(self._subscribers),
+                        queue_size=self.queue_size, max_subscribers=self.max_subscribers)
+
+
+broadcaster = EventBroadcaster(relay=default_event_log())
+
+
+def publish_signals(signals):
+    """Announce newly stored TradingSignals"""
+    try:
+        for signal in signals:
+            broadcaster.publish('signal', signal.to_dict())
+    except Exception as e:
+        logging.error(f"Error publishing signal events: {e}")
+
+
+def publish_settlements(rows, metrics=None, delta=None):
+    """Announce settled signals and the resulting performance counters"""
+    try:
+        broadcaster.publish('settlement', {'signals': rows})
+        if metrics is not None:
+            broadcaster.publish('metrics', {'metrics': metrics, 'delta': delta})
+    except Exception as e:
+        logging.error(f"Error publishing settlement events: {e}")
@@ -0,0 +1,372 @@
+import math
+import logging
+import threading
+from collections import deque
+
+import numpy as np
+
+from indicator_graph import EMA_WARMUP_SPANS, INDICATOR_COLUMNS, MA_PERIODS, RSI_PERIODS
+
+# Bars replayed into a fresh state: enough for every EMA to lose its start-up bias, like IndicatorGraph
+WARMUP_BARS = EMA_WARMUP_SPANS * max(MA_PERIODS)
+
+
+def _divide(numerator, denominator):
+    """Float division with NumPy semantics (x/0 -> +-inf, 0/0 -> NaN) instead of raising"""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer with O(1) running mean and sample standard deviation
+
+    feed(value) returns (mean, std) with `value` appended; with commit=False
+    the window is left as it was, which is how the in-progress bar is read.
+    """
+
+    __slots__ = ('size', 'buffer', 'position', 'count', 'nan_count', 'shift', 'total', 'total_sq')
+
+    def __init__(self, size):
+        self.size = size
+        self.buffer = [math.nan] * size
+        self.position = 0
+        self.count = 0
+        self.nan_count = 0
+        self.shift = None
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def feed(self, value, commit=True):
+        count, nan_count, total, total_sq = self.count, self.nan_count, self.total, self.total_sq
+        # Sums are kept around the first observed value to limit cancellation
+        shift = self.shift if self.shift is not None or math.isnan(value) else value
+
+        if count == self.size:
+            old = self.buffer[self.position]
+            if math.isnan(old):
+                nan_count -= 1
+            else:
+                old -= shift
+                total -= old
+                total_sq -= old * old
+        else:
+            count += 1
+
+        if math.isnan(value):
+            nan_count += 1
+        else:
+            shifted = value - shift
+            total += shifted
+            total_sq += shifted * shifted
+
+        if commit:
+            self.buffer[self.position] = value
+            self.count, self.nan_count, self.shift = count, nan_count, shift
+            self.total, self.total_sq = total, total_sq
+            self.position = (self.position + 1) % self.size
+            if self.position == 0:
+                self._resync()
+                total, total_sq = self.total, self.total_sq
+
+        if count < self.size or nan_count:
+            return math.nan, math.nan
+        mean = shift + total / self.size
+        if self.size < 2:
+            return mean, math.nan
+        variance = (total_sq - total * total / self.size) / (self.size - 1)
+        return mean, math.sqrt(max(variance, 0.0))
+
+    def _resync(self):
+        """Recompute the running sums once per lap to stop floating point drift"""
+        values = [v - self.shift for v in self.buffer if not math.isnan(v)] if self.shift is not None else []
+        self.total = math.fsum(values)
+        self.total_sq = math.fsum(v * v for v in values)
+
+
+class RollingExtreme:
+    """Rolling max (or min) over a fixed window using a monotonic deque, amortized O(1)"""
+
+    __slots__ = ('size', 'is_max', 'candidates', 'nan_positions', 'seen')
+
+    def __init__(self, size, is_max=True):
+        self.size = size
+        self.is_max = is_max
+        self.candidates = deque()
+        self.nan_positions = deque()
+        self.seen = 0
+
+    def feed(self, value, commit=True):
+        """Extreme of the window with `value` appended, which is only stored when committing"""
+        if commit:
+            return self._push(value)
+
+        # Each push expires one position, so only the front entries can drop out
+        expired = self.seen - self.size
+        if self.seen + 1 < self.size or math.isnan(value):
+            return math.nan
+        if any(position > expired for position in self.nan_positions):
+            return math.nan
+        front = next((candidate for position, candidate in self.candidates if position > expired), None)
+        if front is None:
+            return value
+        return max(front, value) if self.is_max else min(front, value)
+
+    def _push(self, value):
+        position = self.seen
+        self.seen += 1
+        expired = position - self.size
+
+        while self.candidates and self.candidates[0][0] <= expired:
+            self.candidates.popleft()
+        while self.nan_positions and self.nan_positions[0] <= expired:
+            self.nan_positions.popleft()
+
+        if math.isnan(value):
+            self.nan_positions.append(position)
+        else:
+            if self.is_max:
+                while self.candidates and self.candidates[-1][1] <= value:
+                    self.candidates.pop()
+            else:
+                while self.candidates and self.candidates[-1][1] >= value:
+                    self.candidates.pop()
+            self.candidates.append((position, value))
+
+        if self.seen < self.size or self.nan_positions or not self.candidates:
+            return math.nan
+        return self.candidates[0][1]
+
+
+class EWMean:
+    """Exponentially weighted mean matching pandas ewm(span=...).mean() with adjust=True"""
+
+    __slots__ = ('decay', 'numerator', 'denominator')
+
+    def __init__(self, span):
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def feed(self, value, commit=True):
+        numerator = value + self.decay * self.numerator
+        denominator = 1.0 + self.decay * self.denominator
+        if commit:
+            self.numerator, self.denominator = numerator, denominator
+        return numerator / denominator
+
+
+class Lag:
+    """Keeps the last `periods` values; feed() returns (diff(periods), pct_change(periods))"""
+
+    __slots__ = ('periods', 'values')
+
+    def __init__(self, periods):
+        self.periods = periods
+        self.values = deque(maxlen=periods)
+
+    def feed(self, value, commit=True):
+        if len(self.values) < self.periods:
+            result = (math.nan, math.nan)
+        else:
+            old = self.values[0]
+            result = (value - old, _divide(value, old) - 1.0)
+        if commit:
+            self.values.append(value)
+        return result
+
+
+class IndicatorSnapshot(dict):
+    """Latest indicator values, read like IndicatorGraph.latest"""
+
+    def latest(self, name):
+        return float(self[name])
+
+
+class IndicatorState:
+    """
+    Incremental version of QuotexSignalGenerator.calculate_advanced_indicators
+    for a single asset: every appended bar updates all indicators in O(1)
+
+    preview() reads the indicators with one more bar without storing it, so a
+    bar that is still forming can be read on every call and appended once it
+    has closed.
+    """
+
+    def __init__(self, ema_periods=()):
+        self.ema_periods = tuple(sorted(set(MA_PERIODS) | set(ema_periods)))
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop all running state"""
+        self.bars_seen = 0
+        self.last_timestamp = None
+        self.values = IndicatorSnapshot.fromkeys(INDICATOR_COLUMNS, math.nan)
+
+        self._sma = {period: RollingWindow(period) for period in MA_PERIODS}
+        self._ema = {period: EWMean(period) for period in self.ema_periods}
+
+        self._previous_close = math.nan
+        self._gains = {period: RollingWindow(period) for period in RSI_PERIODS}
+        self._losses = {period: RollingWindow(period) for period in RSI_PERIODS}
+
+        self._ema_12 = EWMean(12)
+        self._ema_26 = EWMean(26)
+        self._macd_signal = EWMean(9)
+
+        self._bb_window = RollingWindow(20)
+        self._highest_high = RollingExtreme(14, is_max=True)
+        self._lowest_low = RollingExtreme(14, is_max=False)
+        self._stoch_d = RollingWindow(3)
+
+        self._returns = Lag(1)
+        self._volatility = RollingWindow(20)
+        self._price_lag = Lag(5)
+        self._rsi_lag = Lag(5)
+
+    def continues(self, candles):
+        """Whether `candles` contain the last bar seen, so extend() can pick up right after it"""
+        if self.last_timestamp is None or len(candles) == 0:
+            return False
+        position = int(np.searchsorted(candles.timestamp, self.last_timestamp))
+        return position < len(candles) and candles.timestamp[position] == self.last_timestamp
+
+    def warm_up(self, candles):
+        """Rebuild the state from Candles (the last WARMUP_BARS of them) and return the latest values"""
+        self.reset()
+        return self.extend(candles.tail(WARMUP_BARS))
+
+    def extend(self, candles):
+        """Append every bar of `candles` newer than the last one seen"""
+        start = 0
+        if self.last_timestamp is not None:
+            start = int(np.searchsorted(candles.timestamp, self.last_timestamp, side='right'))
+
+        for position in range(start, len(candles)):
+            self.update(candles.high[position], candles.low[position], candles.close[position],
+                        timestamp=int(candles.timestamp[position]))
+        return self.values
+
+    def update(self, high, low, close, timestamp=None):
+        """Append one closed bar and return the refreshed indicator values"""
+        self._step(float(high), float(low), float(close), self.values, commit=True)
+        self.bars_seen += 1
+        if timestamp is not None:
+            self.last_timestamp = timestamp
+        return self.values
+
+    def preview(self, high, low, close):
+        """Indicator values with one more bar appended, leaving the state unchanged"""
+        return self._step(float(high), float(low), float(close), IndicatorSnapshot(), commit=False)
+
+    def _step(self, high, low, close, values, commit):
+        for period in MA_PERIODS:
+            values[f'SMA_{period}'] = self._sma[period].feed(close, commit)[0]
+        for period in self.ema_periods:
+            values[f'EMA_{period}'] = self._ema[period].feed(close, commit)
+
+        # RSI over simple rolling means of gains/losses; the first bar counts as 0/0
+        delta = close - self._previous_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if commit:
+            self._previous_close = close
+        for period in RSI_PERIODS:
+            average_gain = self._gains[period].feed(gain, commit)[0]
+            average_loss = self._losses[period].feed(loss, commit)[0]
+            values[f'RSI_{period}'] = 100 - _divide(100, 1 + _divide(average_gain, average_loss))
+
+        # MACD
+        macd = self._ema_12.feed(close, commit) - self._ema_26.feed(close, commit)
+        macd_signal = self._macd_signal.feed(macd, commit)
+        values['MACD'] = macd
+        values['MACD_signal'] = macd_signal
+        values['MACD_histogram'] = macd - macd_signal
+
+        # Bollinger Bands
+        sma_20, std_20 = self._bb_window.feed(close, commit)
+        values['BB_upper'] = sma_20 + (std_20 * 2)
+        values['BB_middle'] = sma_20
+        values['BB_lower'] = sma_20 - (std_20 * 2)
+
+        # Stochastic and Williams %R share the 14-bar extremes
+        highest_high = self._highest_high.feed(high, commit)
+        lowest_low = self._lowest_low.feed(low, commit)
+        price_range = highest_high - lowest_low
+        stoch_k = _divide(close - lowest_low, price_range) * 100
+        values['Stoch_K'] = stoch_k
+        values['Stoch_D'] = self._stoch_d.feed(stoch_k, commit)[0]
+        values['Williams_R'] = _divide(highest_high - close, price_range) * -100
+
+        # Volatility
+        returns = self._returns.feed(close, commit)[1]
+        values['volatility'] = self._volatility.feed(returns, commit)[1]
+
+        # Divergence detection
+        rsi_14 = values['RSI_14']
+        price_momentum = self._price_lag.feed(close, commit)[0]
+        rsi_momentum = self._rsi_lag.feed(rsi_14, commit)[0]
+        values['price_momentum'] = price_momentum
+        values['rsi_momentum'] = rsi_momentum
+        values['bullish_divergence'] = bool(price_momentum < 0 and rsi_momentum > 0 and rsi_14 < 30)
+        values['bearish_divergence'] = bool(price_momentum > 0 and rsi_momentum < 0 and rsi_14 > 70)
+
+        values['Close'] = close
+        return values
+
+
+class IndicatorEngine:
+    """
+    Per-asset incremental indicator states for the live signal path
+
+    sync() treats the last bar of the candles it is given as still forming:
+    the bars before it that the state has not seen are appended, and the last
+    one is only previewed. Each bar is therefore appended once, with the
+    prices of the first call that saw it closed. For OTC pairs that fixes the
+    price variation of every closed bar at its first draw, while the frame
+    path redraws it on every call. A window that no longer continues the
+    state (a gap, or older bars) rebuilds it from the last WARMUP_BARS bars.
+    """
+
+    def __init__(self, ema_periods=()):
+        self.ema_periods = tuple(ema_periods)
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def state_for(self, asset):
+        """Return the state for `asset`, creating an empty one on first use"""
+        with self._lock:
+            state = self._states.get(asset)
+            if state is None:
+                state = self._states[asset] = IndicatorState(self.ema_periods)
+            return state
+
+    def sync(self, asset, candles):
+        """IndicatorSnapshot for the last bar of `candles`, appending the closed bars before it"""
+        state = self.state_for(asset)
+        closed = candles.slice(0, len(candles) - 1)
+        forming = len(candles) - 1
+
+        # One asset at a time per state; other assets update in parallel
+        with state.lock:
+            try:
+                if not state.continues(closed):
+                    state.warm_up(closed)
+                else:
+                    state.extend(closed)
+                return state.preview(candles.high[forming], candles.low[forming], candles.close[forming])
+            except Exception:
+                state.reset()
+                raise
+
+    def reset(self, asset=None):
+        """Forget one asset's state, or every asset's when none is given"""
+        with self._lock:
+            if asset is None:
+                self._states.clear()
+            else:
+                self._states.pop(asset, None)
@@ -0,0 +1,333 @@
+import re
+import functools
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# EMA inputs older than this many spans carry less than 1e-17 of the weight
+EMA_WARMUP_SPANS = 20
+
+# Above these sizes the O(n) pandas kernels beat sliding windows and weight matrices
+PANDAS_ROLLING_MIN = 4096
+EWM_MATRIX_MAX = 64
+
+# Periods of QuotexSignalGenerator.calculate_advanced_indicators' columns
+MA_PERIODS = (9, 21, 50, 100, 200)
+RSI_PERIODS = (14, 21)
+
+INDICATOR_COLUMNS = (
+    [f'SMA_{period}' for period in MA_PERIODS] +
+    [f'EMA_{period}' for period in MA_PERIODS] +
+    [f'RSI_{period}' for period in RSI_PERIODS] +
+    ['MACD', 'MACD_signal', 'MACD_histogram',
+     'BB_upper', 'BB_middle', 'BB_lower',
+     'Stoch_K', 'Stoch_D', 'Williams_R', 'volatility',
+     'price_momentum', 'rsi_momentum', 'bullish_divergence', 'bearish_divergence']
+)
+
+NODES = {}
+PERIOD_NODES = []
+
+
+def node(name):
+    """Register a node computing `name` for the last `length` bars"""
+    def register(function):
+        NODES[name] = function
+        return function
+    return register
+
+
+def period_node(pattern):
+    """Register a node family such as SMA_<period>"""
+    def register(function):
+        PERIOD_NODES.append((re.compile(pattern), function))
+        return function
+    return register
+
+
+@functools.lru_cache(maxsize=None)
+def resolve(name):
+    if name in NODES:
+        return NODES[name]
+    for pattern, function in PERIOD_NODES:
+        match = pattern.fullmatch(name)
+        if match:
+            return functools.partial(function, period=int(match.group(1)))
+    raise ValueError(f"Unknown indicator: {name}")
+
+
+def _last(values, count):
+    return values[len(values) - count:] if count < len(values) else values
+
+
+def _pad(values, count):
+    """Left-pad to `count` values with NaN (False for flags), like the leading rows of a pandas result"""
+    if len(values) >= count:
+        return _last(values, count)
+    fill = np.zeros(count - len(values), dtype=bool) if values.dtype == bool else np.full(count - len(values), np.nan)
+    return np.concatenate((fill, values))
+
+
+def _align(*arrays):
+    """Trim arrays to their common most recent bars"""
+    count = min(len(values) for values in arrays)
+    return [_last(values, count) for values in arrays]
+
+
+def rolling(values, window, how):
+    """Trailing `window` aggregate, one value per complete window"""
+    if len(values) < window:
+        return np.empty(0)
+    if len(values) > PANDAS_ROLLING_MIN:
+        import pandas as pd
+        return getattr(pd.Series(values).rolling(window), how)().to_numpy()[window - 1:]
+
+    windows = sliding_window_view(values, window)
+    if how == 'std':
+        return windows.std(axis=1, ddof=1)
+    return getattr(windows, how)(axis=1)
+
+
+def ewm_tail(values, span, count):
+    """
+    Last `count` values of pandas ewm(span=span).mean() (adjust=True) over `values`
+
+    Short tails are weighted sums over the window; NaNs get zero weight but
+    still age the older values, as in pandas.
+    """
+    count = min(count, len(values))
+    if count > EWM_MATRIX_MAX:
+        import pandas as pd
+        return pd.Series(values).ewm(span=span).mean().to_numpy()[-count:]
+
+    decay = 1.0 - 2.0 / (span + 1.0)
+    outputs = np.arange(len(values) - count, len(values))
+
+    # Row j holds decay^(t_j - i) for every input i <= t_j
+    ages = outputs[:, None] - np.arange(len(values))[None, :]
+    weights = np.where(ages >= 0, decay ** np.maximum(ages, 0), 0.0)
+    valid = ~np.isnan(values)
+    weights *= valid
+
+    with np.errstate(invalid='ignore'):
+        return weights @ np.where(valid, values, 0.0) / weights.sum(axis=1)
+
+
+def lagged_change(values, lag, count, change=np.subtract):
+    """change(x[t], x[t - lag]) for the last `count` bars of `values`, NaN where t - lag is unknown"""
+    result = np.full(min(count, len(values)), np.nan)
+    if len(values) > lag and len(result):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            changes = change(values[lag:], values[:-lag])
+        filled = min(len(changes), len(result))
+        result[len(result) - filled:] = changes[len(changes) - filled:]
+    return result
+
+
+class IndicatorGraph:
+    """
+    Indicators over one Candles instance, evaluated lazily and memoized
+
+    Every indicator and shared intermediate (Close deltas, gains and losses,
+    the 14-bar high/low windows, the 20-bar deviation, ...) is a node that
+    computes its most recent `length` values from the nodes it depends on.
+    Reading an indicator evaluates only its own dependencies, each of them
+    once unless a later reader needs a longer tail.
+    """
+
+    def __init__(self, candles, tail=1):
+        self.candles = candles
+        self.tail = max(1, min(tail, len(candles)))
+        self._memo = {}  # name -> (length requested, values)
+        self.evaluations = 0
+
+    def series(self, name, length):
+        """Up to `length` most recent values of a node; fewer when the history is too short"""
+        # Anything longer than the history is the whole history, so share one evaluation
+        length = min(length, len(self.candles))
+        cached = self._memo.get(name)
+        if cached is not None and cached[0] >= length:
+            return _last(cached[1], length)
+
+        values = resolve(name)(self, length)
+        self._memo[name] = (length, values)
+        self.evaluations += 1
+        return values
+
+    def __getitem__(self, name):
+        """The last `tail` values of an indicator"""
+        return _pad(self.series(name, self.tail), self.tail)
+
+    def latest(self, name):
+        return float(self[name][-1])
+
+    @property
+    def evaluated(self):
+        return list(self._memo)
+
+
+# Price columns
+
+@node('Open')
+def _open(graph, length):
+    return _last(graph.candles.open, length)
+
+
+@node('High')
+def _high(graph, length):
+    return _last(graph.candles.high, length)
+
+
+@node('Low')
+def _low(graph, length):
+    return _last(graph.candles.low, length)
+
+
+@node('Close')
+def _close(graph, length):
+    return _last(graph.candles.close, length)
+
+
+# Shared intermediates
+
+@node('delta')
+def _delta(graph, length):
+    return lagged_change(graph.series('Close', length + 1), 1, length)
+
+
+@node('gain')
+def _gain(graph, length):
+    delta = graph.series('delta', length)
+    # The undefined first delta counts as no change, like Series.where
+    return np.where(delta > 0, delta, 0.0)
+
+
+@node('loss')
+def _loss(graph, length):
+    delta = graph.series('delta', length)
+    return np.where(delta < 0, -delta, 0.0)
+
+
+@node('returns')
+def _returns(graph, length):
+    return lagged_change(graph.series('Close', length + 1), 1, length, lambda new, old: new / old - 1)
+
+
+@node('std_20')
+def _std_20(graph, length):
+    return rolling(graph.series('Close', length + 19), 20, 'std')
+
+
+@node('low_14')
+def _low_14(graph, length):
+    return rolling(graph.series('Low', length + 13), 14, 'min')
+
+
+@node('high_14')
+def _high_14(graph, length):
+    return rolling(graph.series('High', length + 13), 14, 'max')
+
+
+# Indicators, named after calculate_advanced_indicators' columns
+
+@period_node(r'SMA_(\d+)')
+def _sma(graph, length, period):
+    return rolling(graph.series('Close', length + period - 1), period, 'mean')
+
+
+@period_node(r'EMA_(\d+)')
+def _ema(graph, length, period):
+    return ewm_tail(graph.series('Close', length - 1 + EMA_WARMUP_SPANS * period), period, length)
+
+
+@period_node(r'RSI_(\d+)')
+def _rsi(graph, length, period):
+    gain = rolling(graph.series('gain', length + period - 1), period, 'mean')
+    loss = rolling(graph.series('loss', length + period - 1), period, 'mean')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+@node('MACD')
+def _macd(graph, length):
+    fast, slow = _align(graph.series('EMA_12', length), graph.series('EMA_26', length))
+    return fast - slow
+
+
+@node('MACD_signal')
+def _macd_signal(graph, length):
+    # The signal line averages the MACD line, so it needs MACD over its own warm-up window
+    return ewm_tail(graph.series('MACD', length - 1 + EMA_WARMUP_SPANS * 9), 9, length)
+
+
+@node('MACD_histogram')
+def _macd_histogram(graph, length):
+    macd, signal = _align(graph.series('MACD', length), graph.series('MACD_signal', length))
+    return macd - signal
+
+
+@node('BB_middle')
+def _bb_middle(graph, length):
+    return graph.series('SMA_20', length)
+
+
+@node('BB_upper')
+def _bb_upper(graph, length):
+    middle, std = _align(graph.series('SMA_20', length), graph.series('std_20', length))
+    return middle + std * 2
+
+
+@node('BB_lower')
+def _bb_lower(graph, length):
+    middle, std = _align(graph.series('SMA_20', length), graph.series('std_20', length))
+    return middle - std * 2
+
+
+@node('Stoch_K')
+def _stoch_k(graph, length):
+    close, lowest, highest = _align(graph.series('Close', length), graph.series('low_14', length),
+                                    graph.series('high_14', length))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (close - lowest) / (highest - lowest) * 100
+
+
+@node('Stoch_D')
+def _stoch_d(graph, length):
+    return rolling(graph.series('Stoch_K', length + 2), 3, 'mean')
+
+
+@node('Williams_R')
+def _williams_r(graph, length):
+    close, lowest, highest = _align(graph.series('Close', length), graph.series('low_14', length),
+                                    graph.series('high_14', length))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (highest - close) / (highest - lowest) * -100
+
+
+@node('volatility')
+def _volatility(graph, length):
+    return rolling(graph.series('returns', length + 19), 20, 'std')
+
+
+@node('price_momentum')
+def _price_momentum(graph, length):
+    return lagged_change(graph.series('Close', length + 5), 5, length)
+
+
+@node('rsi_momentum')
+def _rsi_momentum(graph, length):
+    return lagged_change(graph.series('RSI_14', length + 5), 5, length)
+
+
+@node('bullish_divergence')
+def _bullish_divergence(graph, length):
+    price, rsi, rsi_14 = _align(graph.series('price_momentum', length), graph.series('rsi_momentum', length),
+                                graph.series('RSI_14', length))
+    return (price < 0) & (rsi > 0) & (rsi_14 < 30)
+
+
+@node('bearish_divergence')
+def _bearish_divergence(graph, length):
+    price, rsi, rsi_14 = _align(graph.series('price_momentum', length), graph.series('rsi_momentum', length),
+                                graph.series('RSI_14', length))
+    return (price > 0) & (rsi < 0) & (rsi_14 > 70)
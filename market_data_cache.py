@@ -0,0 +1,222 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from shared_cache import shared_cache
+
+# Bar length per yfinance interval, used to expire entries on the next bar close
+INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800,
+    '60m': 3600, '90m': 5400, '1h': 3600, '1d': 86400,
+    '5d': 5 * 86400, '1wk': 7 * 86400, '1mo': 30 * 86400, '3mo': 90 * 86400
+}
+
+
+def interval_expiry(interval, now):
+    """Timestamp of the next bar boundary for `interval` after `now`"""
+    seconds = INTERVAL_SECONDS.get(interval, 60)
+    return (int(now // seconds) + 1) * seconds
+
+
+def frame_nbytes(data):
+    """Approximate in-memory size of a cached frame"""
+    try:
+        return int(data.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return 0
+
+
+class _Flight:
+    """A download in progress that concurrent callers wait on"""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MarketDataCache:
+    """
+    In-process cache of raw market data frames keyed by (symbol, period, interval)
+
+    Entries expire on the next bar close of their interval, the least recently
+    used ones are evicted once the cache holds more than `max_bytes`, and
+    concurrent misses for the same key share a single download. With a
+    `shared` SharedCache, frames are also written through to the other worker
+    processes, local misses are served from there, and a download in one
+    process makes the others wait for its result instead of fetching again.
+    """
+
+    def __init__(self, max_bytes=None, clock=time.time, shared=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('MARKET_DATA_CACHE_MB', 128)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.shared = shared
+
+        self._entries = OrderedDict()  # key -> (expires_at, nbytes, data)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.shared_hits = 0
+
+    def get(self, symbol, period, interval):
+        """Return the cached frame if it is still fresh, otherwise None"""
+        key = (symbol, period, interval)
+        with self._lock:
+            data = self._lookup(key)
+            if data is not None:
+                self.hits += 1
+                return data
+
+        data = self._shared_lookup(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            return data
+
+    def get_or_fetch(self, symbol, period, interval, fetch):
+        """Return the cached frame or call `fetch()` once for all concurrent callers"""
+        key = (symbol, period, interval)
+
+        with self._lock:
+            data = self._lookup(key)
+            if data is not None:
+                self.hits += 1
+                return data
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = _Flight()
+                self._in_flight[key] = flight
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._shared_lookup(key)
+            if flight.result is None:
+                flight.result = self._fetch_shared(key, fetch)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.event.set()
+
+    def put(self, symbol, period, interval, data):
+        """Store a raw frame until the next bar close of `interval`"""
+        key = (symbol, period, interval)
+        expires_at = interval_expiry(interval, self.clock())
+        if self.shared is not None:
+            self.shared.put(key, data, expires_at)
+        self._store(key, data, expires_at)
+
+    def _fetch_shared(self, key, fetch):
+        """Call `fetch()` unless another process stored the frame while this one waited its turn"""
+        if self.shared is None:
+            data = fetch()
+            if data is not None and len(data) > 0:
+                self.put(*key, data)
+            return data
+
+        with self.shared.lock(key):
+            data = self._shared_lookup(key)
+            if data is None:
+                data = fetch()
+                if data is not None and len(data) > 0:
+                    self.put(*key, data)
+        return data
+
+    def _shared_lookup(self, key):
+        """Fresh frame from the other processes, kept locally until its expiry; None without one"""
+        if self.shared is None:
+            return None
+        entry = self.shared.get(key)
+        if entry is None:
+            return None
+
+        data, expires_at = entry
+        self._store(key, data, expires_at)
+        with self._lock:
+            self.shared_hits += 1
+        return data
+
+    def _store(self, key, data, expires_at):
+        nbytes = frame_nbytes(data)
+        with self._lock:
+            self._discard(key)
+            if nbytes > self.max_bytes:
+                logging.warning(f"Market data for {key[0]} ({nbytes} bytes) exceeds the cache size, not cached")
+                return
+
+            self._entries[key] = (expires_at, nbytes, data)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'shared_hits': self.shared_hits,
+                'hit_rate': round((self.hits + self.coalesced) / lookups * 100, 2) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def _lookup(self, key):
+        """Fresh entry for `key` or None; caller must hold the lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, data = entry
+        if self.clock() >= expires_at:
+            self._discard(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return data
+
+    def _discard(self, key):
+        """Remove `key` if present; caller must hold the lock"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+# Process-wide cache shared by every QuotexSignalGenerator (and, under `run.py serve`, every worker)
+market_data_cache = MarketDataCache(shared=shared_cache)
@@ -0,0 +1,207 @@
+import os
+import time
+import logging
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BarStore, period_to_timedelta, safe_symbol_name, to_utc_nanoseconds
+from market_data_cache import INTERVAL_SECONDS
+
+REPLAY_SUFFIXES = ('.csv', '.parquet', '.pq')
+
+
+def load_bars(path):
+    """Load an OHLC history from a CSV or Parquet file indexed by timestamp"""
+    path = Path(path)
+    if path.suffix.lower() in ('.parquet', '.pq'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+
+    df = df.rename(columns={column: column.strip().title() for column in df.columns})
+    missing = {'Open', 'High', 'Low', 'Close'} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+
+    return df.sort_index()
+
+
+class MarketDataProvider:
+    """
+    Source of raw OHLCV bars keyed by Yahoo Finance symbol
+
+    Frames are indexed by bar start time and carry Open/High/Low/Close/Volume
+    columns, like a single-ticker yfinance download. `realtime` providers
+    follow the wall clock; others keep their own clock, exposed by `now()`
+    and advancing `speed` times faster than real time.
+    """
+
+    name = 'base'
+    realtime = True
+    speed = 1.0
+
+    def now(self):
+        """Current time on the provider's clock, in epoch seconds"""
+        return time.time()
+
+    def fetch_bars(self, symbol, interval='1m', period=None, start=None):
+        """Bars for `symbol` over `period` back from now, or from `start` (UTC) on"""
+        raise NotImplementedError
+
+    def fetch_latest_bar(self, symbol, interval='1m'):
+        """One-row frame with the newest bar, or None"""
+        data = self.fetch_bars(symbol, interval, period='1d')
+        if data is None or len(data) == 0:
+            return None
+        return data.iloc[-1:]
+
+    def fetch_batch(self, symbols, interval='1m', period=None, start=None):
+        """{symbol: frame} for every symbol that returned bars"""
+        frames = {}
+        for symbol in symbols:
+            data = self.fetch_bars(symbol, interval, period=period, start=start)
+            if data is not None and len(data) > 0:
+                frames[symbol] = data
+        return frames
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live bars from Yahoo Finance"""
+
+    name = 'yfinance'
+
+    def __init__(self):
+        import yfinance
+        self._yf = yfinance
+
+    @staticmethod
+    def _range(period, start):
+        if start is not None:
+            return {'start': pd.Timestamp(start).to_pydatetime()}
+        return {'period': period}
+
+    def fetch_bars(self, symbol, interval='1m', period=None, start=None):
+        return self._yf.download(symbol, interval=interval, progress=False,
+                                 multi_level_index=False, **self._range(period, start))
+
+    def fetch_batch(self, symbols, interval='1m', period=None, start=None):
+        """One multi-ticker download split into per-symbol frames"""
+        symbols = list(symbols)
+        if len(symbols) == 1:
+            return super().fetch_batch(symbols, interval, period=period, start=start)
+
+        data = self._yf.download(symbols, interval=interval, group_by='ticker', progress=False,
+                                 threads=True, **self._range(period, start))
+        if data is None or len(data) == 0:
+            return {}
+
+        frames = {}
+        available = set(data.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in available:
+                continue
+            # Tickers trade different hours, so drop the rows padded in by the shared index
+            frame = data[symbol].dropna(how='all')
+            if len(frame) > 0:
+                frames[symbol] = frame
+
+        return frames
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Deterministic bars replayed from local files on a simulated clock
+
+    `source` is a directory of CSV/Parquet files named after the symbol
+    (EURUSD=X.csv or EURUSD_X.csv) or a BarStore root. The simulated clock
+    starts `warmup` after the earliest bar, or at `start`, and runs `speed`
+    times faster than the wall clock. Only bars that have closed by the
+    simulated time are returned, so every run over the same files sees the
+    same bars at the same simulated moments.
+    """
+
+    name = 'replay'
+    realtime = False
+
+    def __init__(self, source, speed=1.0, interval='1m', start=None, warmup=timedelta(days=2),
+                 clock=time.time):
+        self.source = Path(source)
+        self.speed = float(speed)
+        self.interval = interval
+        self.bar_nanoseconds = INTERVAL_SECONDS.get(interval, 60) * 10**9
+        self.wall_clock = clock
+
+        self._frames = {}
+        self._timestamps = {}
+        for symbol, frame in self._load(self.source).items():
+            if len(frame) > 0:
+                self._frames[symbol] = frame
+                self._timestamps[symbol] = to_utc_nanoseconds(frame.index)
+        if not self._frames:
+            raise ValueError(f"No replay data found in {self.source}")
+
+        if start is None:
+            first_bar = min(timestamps[0] for timestamps in self._timestamps.values())
+            start = pd.Timestamp(int(first_bar), unit='ns', tz='UTC') + warmup
+        self.start = to_utc_nanoseconds([pd.Timestamp(start)])[0] / 1e9
+        self._started_at = clock()
+
+    def _load(self, source):
+        files = [path for path in sorted(source.iterdir()) if path.suffix.lower() in REPLAY_SUFFIXES]
+        if files:
+            return {path.stem: load_bars(path) for path in files}
+
+        store = BarStore(source)
+        return {
+            directory.name: store.read(directory.name, self.interval)
+            for directory in sorted(source.iterdir())
+            if (directory / self.interval).is_dir() and store.count(directory.name, self.interval)
+        }
+
+    @property
+    def symbols(self):
+        return list(self._frames)
+
+    def now(self):
+        return self.start + (self.wall_clock() - self._started_at) * self.speed
+
+    def fetch_bars(self, symbol, interval='1m', period=None, start=None):
+        key = symbol if symbol in self._frames else safe_symbol_name(symbol)
+        if key not in self._frames or interval != self.interval:
+            return pd.DataFrame()
+
+        timestamps = self._timestamps[key]
+        now = int(self.now() * 1e9)
+        end = int(np.searchsorted(timestamps, now - self.bar_nanoseconds, side='right'))
+
+        first = 0
+        if start is not None:
+            first = int(np.searchsorted(timestamps, to_utc_nanoseconds([pd.Timestamp(start)])[0], side='left'))
+        elif period_to_timedelta(period) is not None:
+            span = int(period_to_timedelta(period).total_seconds() * 1e9)
+            first = int(np.searchsorted(timestamps, now - span, side='left'))
+
+        return self._frames[key].iloc[first:end]
+
+
+def default_market_data_provider():
+    """Provider selected by MARKET_DATA_PROVIDER (yfinance or replay)"""
+    name = os.environ.get('MARKET_DATA_PROVIDER', 'yfinance').lower()
+
+    if name == 'replay':
+        try:
+            return ReplayProvider(
+                os.environ.get('REPLAY_DATA_DIR', 'data/replay'),
+                speed=float(os.environ.get('REPLAY_SPEED', 1)),
+                interval=os.environ.get('REPLAY_INTERVAL', '1m'),
+                start=os.environ.get('REPLAY_START') or None
+            )
+        except Exception as e:
+            logging.error(f"Error starting replay provider, falling back to yfinance: {e}")
+    elif name != 'yfinance':
+        logging.error(f"Unknown market data provider {name}, using yfinance")
+
+    return YFinanceProvider()
@@ -1,22 +1,67 @@
+import os
 import requests
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import logging
 import time
+import asyncio
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-class MarketSentimentAnalyzer:
-    """Real-time market sentiment and fundamental analysis"""
-    
-    def __init__(self):
-        self.sentiment_sources = {
-            'fear_greed': 'https://api.alternative.me/fng/',
-        }
-        
-    def get_fear_greed_index(self):
-        """Get Fear & Greed Index for market sentiment"""
+from pipeline_metrics import pipeline_metrics
+from shared_cache import shared_cache
+
+FEAR_GREED_URL = 'https://api.alternative.me/fng/'
+# Entry holding (value, fetched_at) in the cross-process cache
+SHARED_KEY = 'fear_greed'
+
+
+class SentimentProvider:
+    """
+    Process-wide Fear & Greed Index cache
+
+    The index only changes once a day, so values are served from memory for
+    `ttl` seconds and refreshed by a background thread. Stale values keep being
+    served while a refresh is pending or after it fails. Until the first fetch
+    has succeeded lookups get None (neutral sentiment) rather than waiting on
+    the API; only without the background thread does a miss fetch inline, and
+    a failed fetch is not retried for `retry_after` seconds. With a `shared` SharedCache
+    the value is also shared with the other worker processes, so only one of
+    them calls the API per TTL.
+    """
+
+    def __init__(self, url=None, ttl=None, refresh_interval=None, retry_after=60,
+                 timeout=10, background=True, clock=time.time, shared=None):
+        self.url = url or os.environ.get('FEAR_GREED_URL', FEAR_GREED_URL)
+        self.ttl = ttl if ttl is not None else float(os.environ.get('SENTIMENT_TTL', 3600))
+        self.refresh_interval = refresh_interval if refresh_interval is not None else self.ttl / 2
+        self.retry_after = retry_after
+        self.timeout = timeout
+        self.background = background
+        self.clock = clock
+        self.shared = shared
+
+        # Pooled keep-alive connection with a couple of quick retries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                              max_retries=Retry(total=2, backoff_factor=0.5,
+                                                status_forcelist=(500, 502, 503, 504)))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._value = None
+        self._fetched_at = None
+        self._last_attempt = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def fetch(self):
+        """Download the current index, returning None on any failure"""
         try:
-            response = requests.get(self.sentiment_sources['fear_greed'], timeout=10)
+            with pipeline_metrics.timer('fear_greed_http'):
+                response = self.session.get(self.url, timeout=self.timeout)
             if response.status_code == 200:
                 data = response.json()
                 if 'data' in data and len(data['data']) > 0:
@@ -25,13 +70,136 @@ class MarketSentimentAnalyzer:
                         'classification': data['data'][0]['value_classification'],
                         'timestamp': data['data'][0]['timestamp']
                     }
+            logging.warning(f"Unexpected Fear & Greed response: HTTP {response.status_code}")
         except Exception as e:
             logging.error(f"Error fetching Fear & Greed Index: {e}")
-        
+
         return None
+
+    def refresh(self):
+        """Fetch the index now; keeps the previous value if the fetch fails"""
+        with self._fetch_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        """Fetch and store the index; caller must hold the fetch lock"""
+        self._last_attempt = self.clock()
+        value, fetched_at = self._fetch_shared()
+        if value is not None:
+            with self._lock:
+                self._value = value
+                self._fetched_at = fetched_at
+        return value is not None
+
+    def _fetch_shared(self):
+        """(value, fetched_at), taken from another process when it fetched within the TTL"""
+        if self.shared is None:
+            return self.fetch(), self.clock()
+
+        with self.shared.lock(SHARED_KEY):
+            entry = self.shared.get(SHARED_KEY)
+            if entry is not None:
+                return entry[0]
+
+            value = self.fetch()
+            fetched_at = self.clock()
+            if value is not None:
+                self.shared.put(SHARED_KEY, (value, fetched_at), fetched_at + self.ttl)
+            return value, fetched_at
+
+    def is_fresh(self):
+        """Whether the cached value is younger than the TTL"""
+        with self._lock:
+            return self._fetched_at is not None and self.clock() - self._fetched_at < self.ttl
+
+    def get_fear_greed_index(self):
+        """Return the cached index, or None while the background refresher has not filled it yet"""
+        if self.background:
+            self.start()
+
+        with self._lock:
+            value = self._value
+            fresh = self._fetched_at is not None and self.clock() - self._fetched_at < self.ttl
+
+        if fresh:
+            return value
+
+        if self._last_attempt is None or self.clock() - self._last_attempt >= self.retry_after:
+            if value is not None or self.background:
+                # Stale while revalidate, or a cold cache: answer now, refresh off the request path
+                threading.Thread(target=self._refresh_quietly, daemon=True).start()
+            elif self._fetch_lock.acquire(blocking=False):
+                # No refresher to wait for: one caller fetches, the others get None instead of waiting
+                try:
+                    self._refresh_locked()
+                finally:
+                    self._fetch_lock.release()
+                with self._lock:
+                    value = self._value
+
+        return value
+
+    def start(self):
+        """Start the background refresher if it is not already running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='sentiment-refresh', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background refresher"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+
+    def _refresh_quietly(self):
+        """Refresh unless another refresh is already running"""
+        if not self._fetch_lock.acquire(blocking=False):
+            return
+        try:
+            self._refresh_locked()
+        except Exception as e:
+            logging.error(f"Error refreshing Fear & Greed Index: {e}")
+        finally:
+            self._fetch_lock.release()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.is_fresh():
+                self._refresh_quietly()
+            # Retry sooner while the cache has never been filled
+            wait = self.refresh_interval if self._value is not None else self.retry_after
+            self._stop.wait(wait)
+
+
+# Process-wide provider shared by every MarketSentimentAnalyzer (and, under `run.py serve`, every worker)
+sentiment_provider = SentimentProvider(shared=shared_cache)
+
+
+class MarketSentimentAnalyzer:
+    """Real-time market sentiment and fundamental analysis"""
+    
+    def __init__(self, provider=None):
+        self.provider = provider if provider is not None else sentiment_provider
+        self.sentiment_sources = {
+            'fear_greed': self.provider.url,
+        }
+        
+    def get_fear_greed_index(self):
+        """Get Fear & Greed Index for market sentiment"""
+        return self.provider.get_fear_greed_index()
     
     def get_market_sentiment(self, asset):
         """Get comprehensive market sentiment for an asset"""
+        with pipeline_metrics.timer('sentiment', asset):
+            return self._market_sentiment(asset)
+    
+    def _market_sentiment(self, asset):
         try:
             sentiment = {
                 'overall_sentiment': 'NEUTRAL',
@@ -75,3 +243,11 @@ class MarketSentimentAnalyzer:
         except Exception as e:
             logging.error(f"Error getting market sentiment: {e}")
             return None
+    
+    async def get_market_sentiment_async(self, asset):
+        """Get market sentiment without blocking the event loop on the HTTP call"""
+        if self.provider.is_fresh():
+            return self.get_market_sentiment(asset)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_market_sentiment, asset)
@@ -1,8 +1,17 @@
 from app import db
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, case, update
 
 class TradingSignal(db.Model):
+    __table_args__ = (
+        # /api/signals/current: WHERE is_active ORDER BY created_at
+        db.Index('ix_trading_signal_active_created', 'is_active', 'created_at'),
+        # /api/signals/history: WHERE asset ORDER BY created_at
+        db.Index('ix_trading_signal_asset_created', 'asset', 'created_at'),
+        # /api/signals/history without an asset: ORDER BY created_at, id
+        db.Index('ix_trading_signal_created_id', 'created_at', 'id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     asset = db.Column(db.String(20), nullable=False)
     signal_type = db.Column(db.String(10), nullable=False)  # 'BUY' or 'SELL'
@@ -10,10 +19,25 @@ class TradingSignal(db.Model):
     expiry_time = db.Column(db.Integer, nullable=False)  # in minutes
     confidence = db.Column(db.Float, nullable=False)  # 0-100
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Start of the 1m bar the entry price was taken from, on the market data clock (naive UTC)
+    bar_time = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
     result = db.Column(db.String(10))  # 'WIN', 'LOSS', or None
     profit_loss = db.Column(db.Float, default=0.0)
     
+    @staticmethod
+    def from_signal_data(signal_data):
+        """Create a row from QuotexSignalGenerator output"""
+        signal = TradingSignal()
+        signal.asset = signal_data['asset']
+        signal.signal_type = signal_data['signal_type']
+        signal.entry_price = signal_data['entry_price']
+        signal.expiry_time = signal_data['expiry_time']
+        signal.confidence = signal_data['confidence']
+        if signal_data.get('bar_time'):
+            signal.bar_time = datetime.fromisoformat(signal_data['bar_time'])
+        return signal
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -23,10 +47,21 @@ class TradingSignal(db.Model):
             'expiry_time': self.expiry_time,
             'confidence': self.confidence,
             'created_at': self.created_at.isoformat(),
+            'bar_time': self.bar_time.isoformat() if self.bar_time else None,
             'is_active': self.is_active,
             'result': self.result,
             'profit_loss': self.profit_loss
         }
+    
+    def history_cursor(self):
+        """Keyset cursor pointing just past this signal in newest-first order"""
+        return f"{self.created_at.isoformat()},{self.id}"
+    
+    @staticmethod
+    def parse_history_cursor(cursor):
+        """Parse a '<created_at>,<id>' cursor, raising ValueError when malformed"""
+        created_at, _, signal_id = cursor.rpartition(',')
+        return datetime.fromisoformat(created_at), int(signal_id)
 
 class PerformanceMetrics(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -41,20 +76,91 @@ class PerformanceMetrics(db.Model):
     def get_current_metrics():
         metrics = PerformanceMetrics.query.first()
         if not metrics:
+            # First use: seed the counters from the signals already settled. Only flushed, since
+            # this can run inside a DatabaseWriter batch, which commits its transaction itself
             metrics = PerformanceMetrics()
             db.session.add(metrics)
-            db.session.commit()
+            metrics.update_metrics()
+            db.session.flush()
         return metrics
     
+    def to_dict(self):
+        return {
+            'total_signals': self.total_signals,
+            'winning_signals': self.winning_signals,
+            'losing_signals': self.losing_signals,
+            'win_rate': round(self.win_rate, 2),
+            'total_profit': round(self.total_profit, 2),
+            'updated_at': self.updated_at.isoformat()
+        }
+    
+    @staticmethod
+    def aggregate(*group_by):
+        """COUNT/SUM aggregate over completed signals, optionally grouped"""
+        completed = TradingSignal.result.isnot(None)
+        query = db.session.query(
+            *group_by,
+            func.count(TradingSignal.id).label('total_signals'),
+            func.coalesce(func.sum(case((TradingSignal.result == 'WIN', 1), else_=0)), 0).label('winning_signals'),
+            func.coalesce(func.sum(case((TradingSignal.result == 'LOSS', 1), else_=0)), 0).label('losing_signals'),
+            func.coalesce(func.sum(TradingSignal.profit_loss), 0.0).label('total_profit')
+        ).filter(completed)
+        
+        if group_by:
+            query = query.group_by(*group_by).order_by(*group_by)
+        
+        rows = []
+        for row in query.all():
+            values = row._asdict()
+            total = values['total_signals']
+            values['win_rate'] = (values['winning_signals'] / total * 100) if total > 0 else 0
+            rows.append(values)
+        return rows
+    
+    @staticmethod
+    def aggregate_by_asset():
+        """Performance per asset"""
+        return PerformanceMetrics.aggregate(TradingSignal.asset)
+    
+    @staticmethod
+    def aggregate_by_day():
+        """Performance per calendar day of signal creation"""
+        rows = PerformanceMetrics.aggregate(func.date(TradingSignal.created_at).label('day'))
+        for row in rows:
+            row['day'] = str(row['day'])
+        return rows
+    
+    @staticmethod
+    def record_deltas(total=0, wins=0, losses=0, profit=0.0):
+        """Add counter deltas to the metrics row as a single atomic UPDATE"""
+        metrics = PerformanceMetrics.get_current_metrics()
+        table = PerformanceMetrics.__table__
+        new_total = table.c.total_signals + total
+        new_wins = table.c.winning_signals + wins
+        
+        # SET expressions read the pre-update values, so win_rate is derived from the deltas too
+        db.session.execute(
+            update(PerformanceMetrics)
+            .where(PerformanceMetrics.id == metrics.id)
+            .values(
+                total_signals=new_total,
+                winning_signals=new_wins,
+                losing_signals=table.c.losing_signals + losses,
+                win_rate=case((new_total > 0, new_wins * 100.0 / new_total), else_=0.0),
+                total_profit=table.c.total_profit + profit,
+                updated_at=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.expire(metrics)
+    
     def update_metrics(self):
-        # Calculate metrics from actual signal results
-        completed_signals = TradingSignal.query.filter(TradingSignal.result.isnot(None)).all()
+        """Rebuild the counter row from a single aggregate query over all completed signals; the caller commits"""
+        totals = PerformanceMetrics.aggregate()[0]
         
-        self.total_signals = len(completed_signals)
-        self.winning_signals = len([s for s in completed_signals if s.result == 'WIN'])
-        self.losing_signals = len([s for s in completed_signals if s.result == 'LOSS'])
+        self.total_signals = totals['total_signals']
+        self.winning_signals = totals['winning_signals']
+        self.losing_signals = totals['losing_signals']
         self.win_rate = (self.winning_signals / self.total_signals * 100) if self.total_signals > 0 else 0
-        self.total_profit = sum([s.profit_loss for s in completed_signals])
+        self.total_profit = float(totals['total_profit'])
         self.updated_at = datetime.utcnow()
-        
-        db.session.commit()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Parallel parameter sweeps over the vectorized backtester
+
+Evaluates a grid of SMCAnalyzer.swing_length, fallback RSI thresholds and the
+trend EMA period over many assets on a process pool. Each asset's price arrays
+are placed once in shared memory; workers attach to them by name instead of
+receiving pickled copies, and only small task descriptors and result rows
+cross process boundaries. Rows are appended to a single CSV results table as
+tasks complete.
+
+Usage:
+    python parameter_sweep.py data/*.csv --swing-lengths 3 5 8 \\
+        --rsi-thresholds 20:80 25:75 30:70 --ema-periods 9 21 50 \\
+        --workers 8 --output sweep_results.csv
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backtest import DEFAULT_EXPIRIES, evaluate_expiries, signal_directions, smc_direction
+from market_data_providers import load_bars
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+
+RESULT_COLUMNS = ['asset', 'swing_length', 'rsi_low', 'rsi_high', 'ema_period', 'expiry',
+                  'trades', 'buys', 'sells', 'wins', 'losses', 'win_rate', 'profit_loss']
+
+
+class SharedHistory:
+    """OHLC arrays of one asset copied once into a named shared memory block"""
+
+    def __init__(self, asset, df):
+        self.asset = asset
+        self.n_bars = len(df)
+        prices = np.ascontiguousarray(df[list(PRICE_COLUMNS)].to_numpy(dtype=np.float64).T)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+        np.ndarray(prices.shape, dtype=np.float64, buffer=self.shm.buf)[:] = prices
+
+    @property
+    def descriptor(self):
+        """What a task needs to find the arrays: a few bytes instead of the data"""
+        return (self.asset, self.shm.name, self.n_bars)
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Per-worker state: attached blocks, and the indicators and SMC directions of the asset last worked on
+_attached = {}
+_indicator_cache = {}
+_smc_cache = {}
+
+
+def _attach(name, n_bars):
+    """Zero-copy DataFrame view over a shared block"""
+    if name not in _attached:
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    prices = np.ndarray((len(PRICE_COLUMNS), n_bars), dtype=np.float64, buffer=_attached[name].buf)
+    return pd.DataFrame({column: prices[i] for i, column in enumerate(PRICE_COLUMNS)}, copy=False)
+
+
+def _indicators(name, df):
+    """Indicators do not depend on the swept parameters, so compute them once per asset"""
+    if name not in _indicator_cache:
+        from quotex_signal_generator import QuotexSignalGenerator
+
+        _indicator_cache.clear()
+        _smc_cache.clear()
+        _indicator_cache[name] = QuotexSignalGenerator().calculate_advanced_indicators(df.copy())
+    return _indicator_cache[name]
+
+
+def _smc_direction(name, df, swing_length):
+    """SMC directions depend only on swing_length, so compute them once per asset and swing length"""
+    key = (name, swing_length)
+    if key not in _smc_cache:
+        _smc_cache[key] = smc_direction(df, swing_length)
+    return _smc_cache[key]
+
+
+def evaluate_task(descriptor, combinations, expiries, stake, payout):
+    """Backtest one asset for a chunk of parameter combinations inside a worker"""
+    asset, name, n_bars = descriptor
+    df = _attach(name, n_bars)
+    indicators = _indicators(name, df)
+    close = df['Close'].to_numpy()
+
+    rows = []
+    for swing_length, (rsi_low, rsi_high), ema_period in combinations:
+        directions = signal_directions(df, indicators, swing_length=swing_length,
+                                       rsi_low=rsi_low, rsi_high=rsi_high, ema_period=ema_period,
+                                       smc=_smc_direction(name, df, swing_length))
+        for row in evaluate_expiries(close, directions, expiries, stake, payout):
+            row.update(asset=asset, swing_length=swing_length, rsi_low=rsi_low,
+                       rsi_high=rsi_high, ema_period=ema_period)
+            rows.append(row)
+    return rows
+
+
+def parameter_grid(swing_lengths, rsi_thresholds, ema_periods):
+    return list(itertools.product(swing_lengths, rsi_thresholds, ema_periods))
+
+
+def run_sweep(histories, grid, output=None, workers=None, chunk_size=None,
+              expiries=DEFAULT_EXPIRIES, stake=10.0, payout=0.85):
+    """
+    Sweep `grid` over `histories` ({asset: DataFrame}) and return all result rows
+
+    When `output` is given, rows are appended to that CSV as each task finishes.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Enough tasks to keep every worker busy, few enough to reuse cached indicators
+    chunk_size = chunk_size or max(1, -(-len(grid) * len(histories) // (workers * 4)))
+
+    shared = [SharedHistory(asset, df) for asset, df in histories.items()]
+    results = []
+    writer = None
+    output_file = open(output, 'w', newline='') if output else None
+
+    try:
+        if output_file:
+            writer = csv.DictWriter(output_file, fieldnames=RESULT_COLUMNS)
+            writer.writeheader()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(evaluate_task, history.descriptor, grid[start:start + chunk_size],
+                            tuple(expiries), stake, payout)
+                for history in shared
+                for start in range(0, len(grid), chunk_size)
+            ]
+
+            for future in as_completed(futures):
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    logging.error(f"Sweep task failed: {e}")
+                    continue
+
+                results.extend(rows)
+                if writer:
+                    writer.writerows(rows)
+                    output_file.flush()
+    finally:
+        if output_file:
+            output_file.close()
+        for history in shared:
+            history.release()
+
+    return pd.DataFrame(results, columns=RESULT_COLUMNS)
+
+
+def _threshold_pair(value):
+    low, _, high = value.partition(':')
+    return float(low), float(high)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sweep signal parameters over stored OHLC files')
+    parser.add_argument('files', nargs='+', help='CSV or Parquet files, one asset per file')
+    parser.add_argument('--swing-lengths', nargs='+', type=int, default=[3, 5, 8])
+    parser.add_argument('--rsi-thresholds', nargs='+', type=_threshold_pair,
+                        default=[(20, 80), (25, 75), (30, 70)], help='low:high pairs')
+    parser.add_argument('--ema-periods', nargs='+', type=int, default=[9, 21, 50])
+    parser.add_argument('--expiries', nargs='+', type=int, default=list(DEFAULT_EXPIRIES))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='sweep_results.csv')
+    args = parser.parse_args(argv)
+
+    histories = {}
+    for path in args.files:
+        try:
+            histories[Path(path).stem] = load_bars(path)
+        except Exception as e:
+            logging.error(f"Error loading {path}: {e}")
+
+    if not histories:
+        return 1
+
+    grid = parameter_grid(args.swing_lengths, args.rsi_thresholds, args.ema_periods)
+    start = time.perf_counter()
+    results = run_sweep(histories, grid, args.output, args.workers, expiries=args.expiries)
+    elapsed = time.perf_counter() - start
+
+    print(f"Evaluated {len(grid)} parameter sets on {len(histories)} assets in {elapsed:.1f} s")
+    best = results.sort_values('win_rate', ascending=False).head(10)
+    print(best.to_string(index=False))
+    print(f"\nFull results: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
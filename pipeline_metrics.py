@@ -0,0 +1,170 @@
+import os
+import bisect
+import threading
+import time
+from collections import deque
+
+from quotex_assets import QUOTEX_PAIRS
+
+# Upper bounds in seconds, from cache hits up to slow downloads
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Label value of the series aggregating a stage over every asset
+ALL_ASSETS = 'all'
+# Label value shared by every asset outside QUOTEX_PAIRS, so callers cannot add series without bound
+OTHER_ASSETS = 'other'
+KNOWN_ASSETS = frozenset(asset for assets in QUOTEX_PAIRS.values() for asset in assets)
+
+
+def asset_label(asset):
+    """Label a series is kept under: the asset itself for a Quotex pair, OTHER_ASSETS for anything else"""
+    return asset if asset in KNOWN_ASSETS else OTHER_ASSETS
+
+
+class LatencyHistogram:
+    """
+    Durations of one stage: cumulative bucket counts since start plus the most
+    recent `window` samples, from which p50/p95/p99 are read
+    """
+
+    __slots__ = ('buckets', 'count', 'total', 'recent')
+
+    def __init__(self, window):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def quantiles(self):
+        return quantiles(self.recent)
+
+
+def quantiles(samples):
+    """Nearest-rank p50/p95/p99 of `samples`, None when there are none"""
+    samples = sorted(samples)
+    if not samples:
+        return {q: None for q in QUANTILES}
+    return {q: samples[min(int(q * len(samples)), len(samples) - 1)] for q in QUANTILES}
+
+
+class StageTimer:
+    """Context manager recording the wall time of its block, including when it raises"""
+
+    __slots__ = ('metrics', 'stage', 'asset', 'started')
+
+    def __init__(self, metrics, stage, asset):
+        self.metrics = metrics
+        self.stage = stage
+        self.asset = asset
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started, self.asset)
+        return False
+
+
+class PipelineMetrics:
+    """
+    Latency histograms per pipeline stage and per asset
+
+    Every observation updates the stage's series for its asset and the
+    stage-wide series labelled asset="all". Assets outside QUOTEX_PAIRS share
+    one series labelled asset="other". Bucket counts are cumulative for
+    the life of the process, as Prometheus expects; quantiles cover only the
+    last `window` observations of a series so they follow current behaviour.
+    """
+
+    def __init__(self, window=None):
+        self.window = window or int(os.environ.get('METRICS_WINDOW', 1024))
+        self._series = {}  # (stage, asset) -> LatencyHistogram
+        self._lock = threading.Lock()
+
+    def timer(self, stage, asset=None):
+        """`with metrics.timer('download', asset):` records how long the block took"""
+        return StageTimer(self, stage, asset)
+
+    def observe(self, stage, seconds, asset=None):
+        with self._lock:
+            self._histogram(stage, ALL_ASSETS).observe(seconds)
+            if asset is not None:
+                self._histogram(stage, asset_label(asset)).observe(seconds)
+
+    def _histogram(self, stage, asset):
+        histogram = self._series.get((stage, asset))
+        if histogram is None:
+            histogram = self._series[(stage, asset)] = LatencyHistogram(self.window)
+        return histogram
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def _copy(self):
+        """Consistent copies of every series, so formatting happens outside the lock"""
+        with self._lock:
+            return [
+                (stage, asset, list(histogram.buckets), histogram.count, histogram.total, list(histogram.recent))
+                for (stage, asset), histogram in sorted(self._series.items())
+            ]
+
+    def snapshot(self, asset=None):
+        """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms}} over all assets, or for one asset"""
+        asset = asset_label(asset) if asset and asset != ALL_ASSETS else ALL_ASSETS
+        summary = {}
+        for stage, series_asset, _, count, total, recent in self._copy():
+            if series_asset != asset:
+                continue
+            summary[stage] = {
+                'count': count,
+                'mean_ms': round(total / count * 1000, 3),
+                **{f'p{int(q * 100)}_ms': round(value * 1000, 3) for q, value in quantiles(recent).items()}
+            }
+        return summary
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        series = self._copy()
+        lines = [
+            '# HELP pipeline_stage_seconds Duration of signal pipeline stages.',
+            '# TYPE pipeline_stage_seconds histogram',
+        ]
+        for stage, asset, buckets, count, total, _ in series:
+            labels = f'stage="{_escape(stage)}",asset="{_escape(asset)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += bucket_count
+                lines.append(f'pipeline_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'pipeline_stage_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'pipeline_stage_seconds_sum{{{labels}}} {total:.6f}')
+            lines.append(f'pipeline_stage_seconds_count{{{labels}}} {count}')
+
+        lines += [
+            '# HELP pipeline_stage_recent_seconds Quantiles of the most recent stage durations.',
+            '# TYPE pipeline_stage_recent_seconds summary',
+        ]
+        for stage, asset, _, count, total, recent in series:
+            labels = f'stage="{_escape(stage)}",asset="{_escape(asset)}"'
+            for q, value in quantiles(recent).items():
+                lines.append(f'pipeline_stage_recent_seconds{{{labels},quantile="{q}"}} '
+                             f'{"NaN" if value is None else f"{value:.6f}"}')
+            lines.append(f'pipeline_stage_recent_seconds_sum{{{labels}}} {total:.6f}')
+            lines.append(f'pipeline_stage_recent_seconds_count{{{labels}}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+pipeline_metrics = PipelineMetrics()
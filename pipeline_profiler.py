@@ -0,0 +1,167 @@
+import os
+import io
+import sys
+import time
+import pstats
+import atexit
+import logging
+import cProfile
+import threading
+import contextlib
+from collections import Counter
+from pathlib import Path
+
+
+class PipelineProfiler:
+    """
+    Opt-in profiling of signal generation, selected with PIPELINE_PROFILE
+
+    - cprofile: each profiled call runs under cProfile and the statistics
+      accumulate per name. cProfile only sees the calling thread, i.e. the
+      event loop, not the downloads and scoring running in the executor.
+    - sample: while any profiled call is running, a background thread
+      records the stack of every thread each PROFILE_INTERVAL_MS, including
+      executor threads, as collapsed stacks ready for flamegraph.pl or
+      speedscope.
+
+    Results are written under PROFILE_DIR on report() and at exit. With
+    PIPELINE_PROFILE unset, profile() is a no-op context manager.
+    """
+
+    def __init__(self, mode=None, directory=None, interval=None):
+        self.mode = (mode if mode is not None else os.environ.get('PIPELINE_PROFILE', '')).strip().lower() or None
+        if self.mode not in (None, 'cprofile', 'sample'):
+            logging.warning(f"Unknown PIPELINE_PROFILE {self.mode!r}, profiling disabled")
+            self.mode = None
+        self.directory = Path(directory or os.environ.get('PROFILE_DIR', 'data/profiles'))
+        self.interval = interval or float(os.environ.get('PROFILE_INTERVAL_MS', 5)) / 1000
+
+        self._lock = threading.Lock()
+        self._stats = {}  # name -> pstats.Stats
+        self._stacks = Counter()
+        self._active = 0
+        self._wake = threading.Condition(self._lock)
+        self._sampler = None
+        self._local = threading.local()
+
+        if self.mode:
+            atexit.register(self.report)
+
+    @property
+    def enabled(self):
+        return self.mode is not None
+
+    def profile(self, name):
+        """Context manager profiling its block under `name` when profiling is enabled"""
+        if self.mode == 'cprofile':
+            return self._cprofile(name)
+        if self.mode == 'sample':
+            return self._sampled()
+        return contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def _cprofile(self, name):
+        if getattr(self._local, 'profiling', False):
+            # Nested profiled call: the outer profile already covers it
+            yield
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool is active (Python 3.12+ allows only one)
+            yield
+            return
+
+        self._local.profiling = True
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._local.profiling = False
+            with self._lock:
+                if name in self._stats:
+                    self._stats[name].add(profile)
+                else:
+                    self._stats[name] = pstats.Stats(profile)
+
+    @contextlib.contextmanager
+    def _sampled(self):
+        with self._lock:
+            self._active += 1
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name='pipeline-profiler', daemon=True)
+                self._sampler.start()
+            self._wake.notify()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                while not self._active:
+                    self._wake.wait()
+
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                    frame = frame.f_back
+                stacks.append(';'.join(reversed(stack)))
+
+            with self._lock:
+                self._stacks.update(stacks)
+
+            time.sleep(self.interval)
+
+    def summary(self, limit=30):
+        """Text report of the heaviest functions (cprofile) or stacks (sample)"""
+        with self._lock:
+            if self.mode == 'cprofile':
+                output = io.StringIO()
+                for name, stats in self._stats.items():
+                    output.write(f"== {name} ==\n")
+                    stats.stream = output
+                    stats.sort_stats('cumulative').print_stats(limit)
+                return output.getvalue()
+
+            if self.mode == 'sample':
+                total = sum(self._stacks.values()) or 1
+                return '\n'.join(f"{count / total * 100:5.1f}%  {stack}"
+                                 for stack, count in self._stacks.most_common(limit))
+
+        return ''
+
+    def report(self):
+        """Write the collected profiles under the profile directory and return their paths"""
+        if not self.enabled:
+            return []
+
+        paths = []
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                if self.mode == 'cprofile':
+                    for name, stats in self._stats.items():
+                        path = self.directory / f"{name}.prof"
+                        stats.dump_stats(path)
+                        paths.append(str(path))
+                elif self._stacks:
+                    path = self.directory / 'pipeline.collapsed'
+                    path.write_text(''.join(f"{stack} {count}\n" for stack, count in self._stacks.items()))
+                    paths.append(str(path))
+        except Exception as e:
+            logging.error(f"Error writing pipeline profiles: {e}")
+        return paths
+
+
+pipeline_profiler = PipelineProfiler()
@@ -0,0 +1,31 @@
+# Quotex-specific OTC and regular pairs. Kept free of heavy imports so the asset
+# list can be served before the pandas/yfinance signal stack has loaded.
+QUOTEX_PAIRS = {
+    'forex_otc': [
+        'EUR/USD (OTC)', 'GBP/USD (OTC)', 'USD/JPY (OTC)', 'AUD/USD (OTC)',
+        'USD/CAD (OTC)', 'EUR/GBP (OTC)', 'EUR/JPY (OTC)', 'GBP/JPY (OTC)',
+        'USD/CHF (OTC)', 'NZD/USD (OTC)', 'EUR/CHF (OTC)', 'AUD/CAD (OTC)',
+        'AUD/CHF (OTC)', 'AUD/JPY (OTC)', 'CAD/JPY (OTC)', 'CHF/JPY (OTC)',
+        'EUR/AUD (OTC)', 'EUR/CAD (OTC)', 'GBP/AUD (OTC)', 'GBP/CAD (OTC)',
+        'GBP/CHF (OTC)', 'NZD/CAD (OTC)', 'NZD/CHF (OTC)', 'NZD/JPY (OTC)'
+    ],
+    'forex_real': [
+        'EUR/USD', 'GBP/USD', 'USD/JPY', 'AUD/USD', 'USD/CAD',
+        'EUR/GBP', 'EUR/JPY', 'GBP/JPY', 'USD/CHF', 'NZD/USD'
+    ],
+    'crypto_otc': [
+        'Bitcoin (OTC)', 'Ethereum (OTC)', 'Ripple (OTC)', 'Litecoin (OTC)',
+        'Bitcoin Cash (OTC)', 'Cardano (OTC)', 'Polkadot (OTC)', 'Chainlink (OTC)'
+    ],
+    'crypto_real': [
+        'Bitcoin', 'Ethereum', 'Ripple', 'Litecoin', 'Bitcoin Cash'
+    ],
+    'commodities_otc': [
+        'Gold (OTC)', 'Silver (OTC)', 'Oil (OTC)', 'Natural Gas (OTC)',
+        'Platinum (OTC)', 'Palladium (OTC)', 'Copper (OTC)'
+    ],
+    'indices_otc': [
+        'US 500 (OTC)', 'US 30 (OTC)', 'US Tech 100 (OTC)', 'UK 100 (OTC)',
+        'Germany 30 (OTC)', 'Japan 225 (OTC)', 'Australia 200 (OTC)'
+    ]
+}
@@ -1,13 +1,36 @@
-import yfinance as yf
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
-import requests
 import time
 import random
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from smc_analyzer import SMCAnalyzer
+from quotex_assets import QUOTEX_PAIRS
 from market_sentiment import MarketSentimentAnalyzer
+from market_data_cache import MarketDataCache, market_data_cache
+from market_data_providers import default_market_data_provider
+from bar_store import default_bar_store
+from candles import Candles
+from indicator_graph import IndicatorGraph, INDICATOR_COLUMNS
+from indicator_engine import IndicatorEngine
+from timeframes import resample_timeframes
+from pipeline_metrics import pipeline_metrics
+from pipeline_profiler import pipeline_profiler
+
+# Shared pool for blocking downloads and pandas work awaited by the async pipeline
+signal_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('SIGNAL_WORKERS', min(32, (os.cpu_count() or 1) + 4))),
+    thread_name_prefix='signal'
+)
+
+
+def run_sync(coroutine):
+    """Run a pipeline coroutine to completion from synchronous code such as Flask views"""
+    with pipeline_profiler.profile(coroutine.__qualname__.rsplit('.', 1)[-1]):
+        return asyncio.run(coroutine)
+
 
 class QuotexSignalGenerator:
     """
@@ -15,40 +38,30 @@ class QuotexSignalGenerator:
     Combines SMC/ICT logic, technical indicators, and market sentiment
     """
     
-    def __init__(self):
+    def __init__(self, data_cache=None, bar_store=None, provider=None):
         # Quotex-specific OTC and regular pairs
-        self.quotex_pairs = {
-            'forex_otc': [
-                'EUR/USD (OTC)', 'GBP/USD (OTC)', 'USD/JPY (OTC)', 'AUD/USD (OTC)',
-                'USD/CAD (OTC)', 'EUR/GBP (OTC)', 'EUR/JPY (OTC)', 'GBP/JPY (OTC)',
-                'USD/CHF (OTC)', 'NZD/USD (OTC)', 'EUR/CHF (OTC)', 'AUD/CAD (OTC)',
-                'AUD/CHF (OTC)', 'AUD/JPY (OTC)', 'CAD/JPY (OTC)', 'CHF/JPY (OTC)',
-                'EUR/AUD (OTC)', 'EUR/CAD (OTC)', 'GBP/AUD (OTC)', 'GBP/CAD (OTC)',
-                'GBP/CHF (OTC)', 'NZD/CAD (OTC)', 'NZD/CHF (OTC)', 'NZD/JPY (OTC)'
-            ],
-            'forex_real': [
-                'EUR/USD', 'GBP/USD', 'USD/JPY', 'AUD/USD', 'USD/CAD',
-                'EUR/GBP', 'EUR/JPY', 'GBP/JPY', 'USD/CHF', 'NZD/USD'
-            ],
-            'crypto_otc': [
-                'Bitcoin (OTC)', 'Ethereum (OTC)', 'Ripple (OTC)', 'Litecoin (OTC)',
-                'Bitcoin Cash (OTC)', 'Cardano (OTC)', 'Polkadot (OTC)', 'Chainlink (OTC)'
-            ],
-            'crypto_real': [
-                'Bitcoin', 'Ethereum', 'Ripple', 'Litecoin', 'Bitcoin Cash'
-            ],
-            'commodities_otc': [
-                'Gold (OTC)', 'Silver (OTC)', 'Oil (OTC)', 'Natural Gas (OTC)',
-                'Platinum (OTC)', 'Palladium (OTC)', 'Copper (OTC)'
-            ],
-            'indices_otc': [
-                'US 500 (OTC)', 'US 30 (OTC)', 'US Tech 100 (OTC)', 'UK 100 (OTC)',
-                'Germany 30 (OTC)', 'Japan 225 (OTC)', 'Australia 200 (OTC)'
-            ]
-        }
+        self.quotex_pairs = {category: list(assets) for category, assets in QUOTEX_PAIRS.items()}
         
-        self.smc_analyzer = SMCAnalyzer()
         self.sentiment_analyzer = MarketSentimentAnalyzer()
+        self.smc_analyzer = SMCAnalyzer(self.sentiment_analyzer)
+        self.provider = provider or default_market_data_provider()
+        if self.provider.realtime:
+            self.data_cache = data_cache if data_cache is not None else market_data_cache
+            self.bar_store = bar_store if bar_store is not None else default_bar_store()
+        else:
+            # Replayed bars expire on the provider's clock and must not end up in the live store
+            self.data_cache = data_cache if data_cache is not None else MarketDataCache(clock=self.provider.now)
+            self.bar_store = bar_store
+        self.executor = signal_executor
+        self.concurrency = int(os.environ.get('SIGNAL_CONCURRENCY', 16))
+        
+        # Fallback rule parameters, see parameter_sweep.py for tuning them
+        self.rsi_oversold = 25
+        self.rsi_overbought = 75
+        self.trend_ema_period = 21
+        
+        # Running indicator state per asset, so a new 1m bar costs O(1) instead of a pass over the window
+        self.indicator_engine = IndicatorEngine(ema_periods=(self.trend_ema_period,))
         
         # Trading sessions for optimal timing
         self.trading_sessions = {
@@ -95,13 +108,15 @@ class QuotexSignalGenerator:
     def get_market_data(self, asset, period='5d', interval='1m'):
         """Get real-time market data with OTC modifications"""
         try:
-            yahoo_symbol = self.map_quotex_to_yahoo(asset)
-            data = yf.download(yahoo_symbol, period=period, interval=interval, progress=False)
+            data = self.get_raw_market_data(asset, period, interval)
             
             if data is None or len(data) == 0:
                 logging.warning(f"No data retrieved for {asset}")
                 return None
             
+            # Callers add indicator columns, so never hand out the cached frame itself
+            data = data.copy()
+            
             # Apply OTC modifications for OTC pairs
             if '(OTC)' in asset:
                 data = self.apply_otc_modifications(data)
@@ -112,13 +127,141 @@ class QuotexSignalGenerator:
             logging.error(f"Error fetching data for {asset}: {e}")
             return None
     
+    def get_candles(self, asset, period='2d', interval='1m'):
+        """Get market data as Candles with OTC modifications, without copying the cached frame"""
+        try:
+            with pipeline_metrics.timer('market_data', asset):
+                return self.to_candles(asset, self.get_raw_market_data(asset, period, interval))
+        except Exception as e:
+            logging.error(f"Error fetching data for {asset}: {e}")
+            return None
+    
+    def to_candles(self, asset, data):
+        """Candles over a shared raw frame, with OTC variations applied to new arrays"""
+        if data is None or len(data) == 0:
+            logging.warning(f"No data retrieved for {asset}")
+            return None
+        
+        candles = Candles.from_frame(data)
+        if '(OTC)' in asset:
+            candles = candles.scale_prices(self.otc_variation(len(candles)))
+        return candles
+    
+    def get_raw_market_data(self, asset, period='2d', interval='1m'):
+        """Get cached bars without OTC modifications; the frame is shared, do not modify it"""
+        yahoo_symbol = self.map_quotex_to_yahoo(asset)
+        
+        def download():
+            with pipeline_metrics.timer('download', asset):
+                return self.download_market_data(yahoo_symbol, period, interval)
+        
+        return self.data_cache.get_or_fetch(yahoo_symbol, period, interval, download)
+    
+    def download_market_data(self, yahoo_symbol, period, interval):
+        """Fetch raw bars for a single Yahoo Finance symbol, topping up the bar store if enabled"""
+        if self.bar_store is None:
+            return self.provider.fetch_bars(yahoo_symbol, interval, period=period)
+        
+        if self.bar_store.covers(yahoo_symbol, interval, period):
+            # Only fetch the bars after the newest stored one
+            start = self.bar_store.last_timestamp(yahoo_symbol, interval)
+            data = self.provider.fetch_bars(yahoo_symbol, interval, start=start)
+        else:
+            data = self.provider.fetch_bars(yahoo_symbol, interval, period=period)
+        
+        self.bar_store.append(yahoo_symbol, interval, data)
+        return self.bar_store.read_period(yahoo_symbol, interval, period)
+    
+    def get_market_data_batch(self, assets, period='2d', interval='1m'):
+        """Get market data for many assets with one multi-ticker download"""
+        market_data = {}
+        for asset, data in self.get_raw_market_data_batch(assets, period, interval).items():
+            if data is None or len(data) == 0:
+                logging.warning(f"No data retrieved for {asset}")
+                market_data[asset] = None
+                continue
+            
+            asset_data = data.copy()
+            if '(OTC)' in asset:
+                asset_data = self.apply_otc_modifications(asset_data)
+            market_data[asset] = asset_data
+        
+        return market_data
+    
+    def get_candles_batch(self, assets, period='2d', interval='1m'):
+        """Get Candles for many assets with one multi-ticker download"""
+        with pipeline_metrics.timer('market_data_batch'):
+            return {
+                asset: self.to_candles(asset, data)
+                for asset, data in self.get_raw_market_data_batch(assets, period, interval).items()
+            }
+    
+    def get_raw_market_data_batch(self, assets, period='2d', interval='1m'):
+        """Cached raw frames per asset, downloading the missing symbols together; do not modify them"""
+        symbols = {}
+        for asset in assets:
+            symbols.setdefault(self.map_quotex_to_yahoo(asset), []).append(asset)
+        
+        raw_frames = {}
+        missing = []
+        for symbol in symbols:
+            data = self.data_cache.get(symbol, period, interval)
+            if data is not None:
+                raw_frames[symbol] = data
+            else:
+                missing.append(symbol)
+        
+        if missing:
+            try:
+                with pipeline_metrics.timer('download_batch'):
+                    downloaded = self.download_market_data_batch(missing, period, interval)
+                for symbol, data in downloaded.items():
+                    self.data_cache.put(symbol, period, interval, data)
+                    raw_frames[symbol] = data
+            except Exception as e:
+                logging.error(f"Error fetching batch data for {len(missing)} symbols: {e}")
+        
+        return {
+            asset: raw_frames.get(symbol)
+            for symbol, symbol_assets in symbols.items()
+            for asset in symbol_assets
+        }
+    
+    def download_market_data_batch(self, yahoo_symbols, period, interval):
+        """Fetch raw bars for several Yahoo Finance symbols in one batch per kind of range"""
+        if len(yahoo_symbols) == 1:
+            symbol = yahoo_symbols[0]
+            return {symbol: self.download_market_data(symbol, period, interval)}
+        
+        if self.bar_store is None:
+            return self.provider.fetch_batch(yahoo_symbols, interval, period=period)
+        
+        # Symbols with recent stored bars only need the missing tail
+        stored = [symbol for symbol in yahoo_symbols if self.bar_store.covers(symbol, interval, period)]
+        cold = [symbol for symbol in yahoo_symbols if symbol not in stored]
+        
+        frames = {}
+        if cold:
+            frames.update(self.provider.fetch_batch(cold, interval, period=period))
+        if stored:
+            start = min(self.bar_store.last_timestamp(symbol, interval) for symbol in stored)
+            frames.update(self.provider.fetch_batch(stored, interval, start=start))
+        
+        results = {}
+        for symbol in yahoo_symbols:
+            self.bar_store.append(symbol, interval, frames.get(symbol))
+            data = self.bar_store.read_period(symbol, interval, period)
+            if data is not None and len(data) > 0:
+                results[symbol] = data
+        return results
+    
     def apply_otc_modifications(self, data):
         """Apply OTC-specific price modifications"""
         if data is None or len(data) == 0:
             return data
         
         # Add slight price variations (0.05-0.15%) for OTC
-        variation = np.random.uniform(0.9995, 1.0005, len(data))
+        variation = self.otc_variation(len(data))
         
         for col in ['Open', 'High', 'Low', 'Close']:
             if col in data.columns:
@@ -126,53 +269,24 @@ class QuotexSignalGenerator:
         
         return data
     
+    def otc_variation(self, n_bars):
+        """Per-bar price factors applied to OTC pairs, leaving the latest bar unscaled"""
+        variation = np.random.uniform(0.9995, 1.0005, n_bars)
+        # The latest close becomes the signal's entry price, which settlement compares with raw closes
+        if n_bars:
+            variation[-1] = 1.0
+        return variation
+    
     def calculate_advanced_indicators(self, df):
-        """Calculate comprehensive technical indicators"""
+        """Add every indicator column to a frame, sharing intermediates through one IndicatorGraph"""
         try:
-            # Moving averages
-            for period in [9, 21, 50, 100, 200]:
-                df[f'SMA_{period}'] = df['Close'].rolling(window=period).mean()
-                df[f'EMA_{period}'] = df['Close'].ewm(span=period).mean()
-            
-            # RSI with multiple periods
-            for period in [14, 21]:
-                delta = df['Close'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-                rs = gain / loss
-                df[f'RSI_{period}'] = 100 - (100 / (1 + rs))
-            
-            # MACD
-            ema_12 = df['Close'].ewm(span=12).mean()
-            ema_26 = df['Close'].ewm(span=26).mean()
-            df['MACD'] = ema_12 - ema_26
-            df['MACD_signal'] = df['MACD'].ewm(span=9).mean()
-            df['MACD_histogram'] = df['MACD'] - df['MACD_signal']
-            
-            # Bollinger Bands
-            sma_20 = df['Close'].rolling(window=20).mean()
-            std_20 = df['Close'].rolling(window=20).std()
-            df['BB_upper'] = sma_20 + (std_20 * 2)
-            df['BB_middle'] = sma_20
-            df['BB_lower'] = sma_20 - (std_20 * 2)
+            if len(df) == 0:
+                return df
             
-            # Stochastic
-            lowest_low = df['Low'].rolling(window=14).min()
-            highest_high = df['High'].rolling(window=14).max()
-            df['Stoch_K'] = ((df['Close'] - lowest_low) / (highest_high - lowest_low)) * 100
-            df['Stoch_D'] = df['Stoch_K'].rolling(window=3).mean()
-            
-            # Williams %R
-            df['Williams_R'] = ((highest_high - df['Close']) / (highest_high - lowest_low)) * -100
-            
-            # Volatility
-            df['volatility'] = df['Close'].pct_change().rolling(window=20).std()
-            
-            # Divergence detection
-            df['price_momentum'] = df['Close'].diff(5)
-            df['rsi_momentum'] = df['RSI_14'].diff(5)
-            df['bullish_divergence'] = (df['price_momentum'] < 0) & (df['rsi_momentum'] > 0) & (df['RSI_14'] < 30)
-            df['bearish_divergence'] = (df['price_momentum'] > 0) & (df['rsi_momentum'] < 0) & (df['RSI_14'] > 70)
+            with pipeline_metrics.timer('indicators_frame'):
+                graph = IndicatorGraph(Candles.from_frame(df), tail=len(df))
+                for column in INDICATOR_COLUMNS:
+                    df[column] = graph[column]
             
             return df
             
@@ -180,23 +294,138 @@ class QuotexSignalGenerator:
             logging.error(f"Error calculating indicators: {e}")
             return df
     
+    def technical_direction(self, indicators):
+        """Fallback vote of RSI, trend EMA and Bollinger Bands on the latest bar; None on a tie"""
+        close = indicators.latest('Close')
+        rsi = indicators.latest('RSI_14')
+        
+        buy_signals = 0
+        sell_signals = 0
+        
+        # RSI
+        if rsi < self.rsi_oversold:
+            buy_signals += 1
+        elif rsi > self.rsi_overbought:
+            sell_signals += 1
+        
+        # Price vs Moving Averages
+        if close > indicators.latest(f'EMA_{self.trend_ema_period}'):
+            buy_signals += 1
+        else:
+            sell_signals += 1
+        
+        # Bollinger Bands
+        if close <= indicators.latest('BB_lower'):
+            buy_signals += 1
+        elif close >= indicators.latest('BB_upper'):
+            sell_signals += 1
+        
+        if buy_signals > sell_signals:
+            return 'BUY'
+        elif sell_signals > buy_signals:
+            return 'SELL'
+        return None
+    
+    def higher_timeframe_trends(self, candles):
+        """
+        {timeframe: BULLISH/BEARISH/NEUTRAL} from market structure, or the trend EMA when it is neutral
+
+        The 5m/15m/1h bars are resampled from the fetched 1m bars; no extra downloads.
+        """
+        trends = {}
+        for timeframe, bars in resample_timeframes(candles).items():
+            trend = self.smc_analyzer.identify_market_structure(bars)['trend']
+            if trend == 'NEUTRAL' and len(bars) > self.trend_ema_period:
+                indicators = IndicatorGraph(bars)
+                close = indicators.latest('Close')
+                ema = indicators.latest(f'EMA_{self.trend_ema_period}')
+                if close > ema:
+                    trend = 'BULLISH'
+                elif close < ema:
+                    trend = 'BEARISH'
+            trends[timeframe] = trend
+        return trends
+    
+    def timeframe_confidence(self, signal_type, trends):
+        """Confidence adjustment: +5 per higher timeframe trending with the signal, -5 per one against it"""
+        expected = 'BULLISH' if signal_type == 'BUY' else 'BEARISH'
+        opposite = 'BEARISH' if signal_type == 'BUY' else 'BULLISH'
+        trend_values = list(trends.values())
+        return 5 * (trend_values.count(expected) - trend_values.count(opposite))
+    
     def generate_quotex_signal(self, asset):
         """Generate high-accuracy Quotex trading signal"""
+        return run_sync(self.generate_quotex_signal_async(asset))
+    
+    def generate_quotex_signals(self, assets):
+        """Generate signals for many assets from a single batch download"""
+        return run_sync(self.generate_quotex_signals_async(assets))
+    
+    def score_signal(self, asset, data, sentiment=None):
+        """Run indicator and SMC scoring on already fetched market data"""
+        return run_sync(self.score_signal_async(asset, data, sentiment))
+    
+    async def generate_quotex_signal_async(self, asset):
+        """Fetch market data and sentiment concurrently, then score the asset"""
+        loop = asyncio.get_running_loop()
+        
+        with pipeline_metrics.timer('signal', asset):
+            # Get market data and market sentiment
+            data, sentiment = await asyncio.gather(
+                loop.run_in_executor(self.executor, self.get_candles, asset, '2d', '1m'),
+                self.sentiment_analyzer.get_market_sentiment_async(asset)
+            )
+            
+            return await self.score_signal_async(asset, data, sentiment)
+    
+    async def generate_quotex_signals_async(self, assets, concurrency=None):
+        """Score many assets concurrently from one batch download"""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+        
+        with pipeline_metrics.timer('signal_batch'):
+            market_data = await loop.run_in_executor(
+                self.executor, self.get_candles_batch, assets, '2d', '1m'
+            )
+            
+            async def score(asset):
+                async with semaphore:
+                    return await self.score_signal_async(asset, market_data.get(asset))
+            
+            signals = await asyncio.gather(*(score(asset) for asset in assets))
+            return [signal for signal in signals if signal]
+    
+    async def score_signal_async(self, asset, data, sentiment=None):
+        """Score one asset from Candles or an OHLCV frame, running the scoring off the event loop"""
         try:
-            # Get market data
-            data = self.get_market_data(asset, period='2d', interval='1m')
             if data is None or len(data) < 100:
                 logging.warning(f"Insufficient data for {asset}")
                 return None
             
-            # Calculate all indicators
-            df = self.calculate_advanced_indicators(data)
+            # Get market sentiment
+            if sentiment is None:
+                sentiment = await self.sentiment_analyzer.get_market_sentiment_async(asset)
             
-            # Get SMC analysis
-            smc_signal = self.smc_analyzer.get_smc_signal(df)
+            # Indicators, SMC and higher timeframes are CPU-bound, so assets are scored in parallel
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.score_candles, asset, data, sentiment)
             
-            # Get market sentiment
-            sentiment = self.sentiment_analyzer.get_market_sentiment(asset)
+        except Exception as e:
+            logging.error(f"Error generating Quotex signal for {asset}: {e}")
+            return None
+    
+    def score_candles(self, asset, data, sentiment):
+        """Indicator, SMC and higher-timeframe scoring of one asset with its sentiment already fetched"""
+        with pipeline_metrics.timer('score', asset):
+            candles = data if isinstance(data, Candles) else Candles.from_frame(data)
+            
+            # Closed bars the asset's state has not seen are appended, the forming last bar is previewed
+            with pipeline_metrics.timer('indicators', asset):
+                indicators = self.indicator_engine.sync(asset, candles)
+            
+            # Get SMC analysis
+            with pipeline_metrics.timer('smc', asset):
+                smc_signal = self.smc_analyzer.smc_signal(candles, sentiment)
             
             # Determine signal direction
             signal_type = None
@@ -207,43 +436,25 @@ class QuotexSignalGenerator:
                 confidence = smc_signal['confidence']
             else:
                 # Fallback to technical analysis
-                latest = df.iloc[-1]
-                
-                buy_signals = 0
-                sell_signals = 0
-                
-                # RSI
-                if latest['RSI_14'] < 25:
-                    buy_signals += 1
-                elif latest['RSI_14'] > 75:
-                    sell_signals += 1
-                
-                # Price vs Moving Averages
-                if latest['Close'] > latest['EMA_21']:
-                    buy_signals += 1
-                else:
-                    sell_signals += 1
-                
-                # Bollinger Bands
-                if latest['Close'] <= latest['BB_lower']:
-                    buy_signals += 1
-                elif latest['Close'] >= latest['BB_upper']:
-                    sell_signals += 1
-                
-                if buy_signals > sell_signals:
-                    signal_type = 'BUY'
-                elif sell_signals > buy_signals:
-                    signal_type = 'SELL'
+                signal_type = self.technical_direction(indicators)
             
             if not signal_type:
                 return None
             
             # Get current price and volatility
-            current_price = float(df['Close'].iloc[-1])
-            volatility = float(df['volatility'].iloc[-1]) if not pd.isna(df['volatility'].iloc[-1]) else 0.02
+            current_price = indicators.latest('Close')
+            volatility = indicators.latest('volatility')
+            if np.isnan(volatility):
+                volatility = 0.02
+            
+            # Higher-timeframe trend filter: never flips the direction, only weighs the confidence
+            with pipeline_metrics.timer('timeframes', asset):
+                trends = self.higher_timeframe_trends(candles)
+            confidence += self.timeframe_confidence(signal_type, trends)
             
             # Determine expiry time
             expiry_time = self.determine_expiry_time(asset, volatility)
+            bar_time = datetime.fromtimestamp(int(candles.timestamp[-1]) / 1e9, timezone.utc).replace(tzinfo=None)
             
             return {
                 'asset': asset,
@@ -251,12 +462,11 @@ class QuotexSignalGenerator:
                 'entry_price': round(current_price, 5),
                 'expiry_time': expiry_time,
                 'confidence': min(confidence, 95),
-                'timestamp': datetime.now().isoformat()
+                'timeframes': trends,
+                'timestamp': datetime.now().isoformat(),
+                # Settlement counts the expiry from this bar, on the provider's clock
+                'bar_time': bar_time.isoformat()
             }
-            
-        except Exception as e:
-            logging.error(f"Error generating Quotex signal for {asset}: {e}")
-            return None
     
     def determine_expiry_time(self, asset, volatility):
         """Determine optimal expiry time for Quotex"""
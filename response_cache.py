@@ -0,0 +1,130 @@
+import os
+import gzip
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+
+from flask import request, make_response
+
+
+class CachedResponse:
+    """A serialized 200 response body with its ETag and, if large enough, a gzipped copy with its own"""
+
+    __slots__ = ('version', 'body', 'gzipped', 'etag', 'gzip_etag', 'mimetype')
+
+    def __init__(self, version, body, mimetype, gzip_min_bytes):
+        self.version = version
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        self.gzipped = gzip.compress(body, compresslevel=6) if len(body) >= gzip_min_bytes else None
+        # A different representation must not share the strong ETag of the identity body
+        self.gzip_etag = f'{self.etag}-gz' if self.gzipped is not None else None
+
+
+class ResponseCache:
+    """
+    Serialized JSON responses of read endpoints, reused until the data changes
+
+    Versioned entries are dropped as soon as `invalidate()` bumps the version,
+    which happens whenever signals are stored or settled; unversioned entries
+    (static data) live until evicted. Every response carries an ETag derived
+    from its body, so a client polling unchanged data gets a bodiless 304,
+    and bodies above `gzip_min_bytes` are compressed once and served gzipped,
+    under an ETag of their own, to clients that accept it.
+    """
+
+    def __init__(self, max_entries=None, gzip_min_bytes=None):
+        self.max_entries = max_entries or int(os.environ.get('RESPONSE_CACHE_ENTRIES', 256))
+        self.gzip_min_bytes = gzip_min_bytes or int(os.environ.get('RESPONSE_GZIP_MIN_BYTES', 1024))
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = 0
+
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0}
+
+    def invalidate(self, *args):
+        """Expire every versioned entry; accepts and ignores event listener arguments"""
+        with self._lock:
+            self.version += 1
+            self.stats['invalidations'] += 1
+
+    def lookup(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry.version is not None and entry.version != version):
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def store(self, key, version, response):
+        entry = CachedResponse(version, response.get_data(), response.mimetype, self.gzip_min_bytes)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def status(self):
+        with self._lock:
+            return dict(self.stats, version=self.version, entries=len(self._entries),
+                        max_entries=self.max_entries)
+
+    def respond(self, entry):
+        """Build the response for the current request: 304, gzipped or plain"""
+        use_gzip = entry.gzipped is not None and 'gzip' in request.accept_encodings
+        etag = entry.gzip_etag if use_gzip else entry.etag
+
+        if request.if_none_match.contains(etag):
+            with self._lock:
+                self.stats['not_modified'] += 1
+            response = make_response('', 304)
+        elif use_gzip:
+            response = make_response(entry.gzipped)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.mimetype = entry.mimetype
+        else:
+            response = make_response(entry.body)
+            response.mimetype = entry.mimetype
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def cached(self, versioned=True):
+        """
+        Decorator caching a view's successful responses per URL
+
+        Set versioned=False for data that never changes while the process runs.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                key = request.full_path
+                version = self.version if versioned else None
+
+                entry = self.lookup(key, version)
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    # Tagged with the version read before the query ran, so a change
+                    # committed meanwhile makes this entry stale instead of hiding it
+                    entry = self.store(key, version, response)
+
+                return self.respond(entry)
+            return wrapper
+        return decorator
+
+
+response_cache = ResponseCache()
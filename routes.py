@@ -1,17 +1,59 @@
-from flask import render_template, jsonify, request
+from flask import render_template, jsonify, request, Response, g
 from app import app, db
 from models import TradingSignal, PerformanceMetrics
-from quotex_signal_generator import QuotexSignalGenerator
+from quotex_assets import QUOTEX_PAIRS
+from market_data_cache import market_data_cache
+import signal_scanner
+import signal_settlement
+from event_broadcaster import broadcaster, publish_signals
+from db_writer import get_db_writer
+from response_cache import response_cache
+from pipeline_metrics import pipeline_metrics
+from pipeline_profiler import pipeline_profiler
 from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
 import logging
+import threading
+import time
 
-signal_gen = QuotexSignalGenerator()
+# Built on first use: importing the signal stack loads pandas and yfinance
+signal_gen = None
+_signal_gen_lock = threading.Lock()
+
+def get_signal_generator():
+    """The process-wide QuotexSignalGenerator"""
+    global signal_gen
+    if signal_gen is None:
+        with _signal_gen_lock:
+            if signal_gen is None:
+                from quotex_signal_generator import QuotexSignalGenerator
+                signal_gen = QuotexSignalGenerator()
+    return signal_gen
+
+# Cached signal responses go stale whenever a signal is stored or settled
+broadcaster.add_listener(response_cache.invalidate)
+
+# Long-lived streams would only skew the request latency histograms
+UNTIMED_ENDPOINTS = {'stream_events', 'static'}
+
+MAX_HISTORY_PER_PAGE = 100
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.teardown_request
+def record_request_time(exc=None):
+    started = g.pop('request_started', None)
+    if started is not None and request.endpoint and request.endpoint not in UNTIMED_ENDPOINTS:
+        pipeline_metrics.observe(f'http_{request.endpoint}', time.perf_counter() - started)
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
 @app.route('/api/signals/current')
+@response_cache.cached()
 def get_current_signals():
     """Get currently active signals"""
     try:
@@ -28,18 +70,51 @@ def get_current_signals():
         }), 500
 
 @app.route('/api/signals/history')
+@response_cache.cached()
 def get_signal_history():
-    """Get signal history with pagination"""
+    """Get signal history with page or keyset (?before=<created_at,id>) pagination"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        # Bounded so a request can neither read the whole table nor ask for an empty page
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), MAX_HISTORY_PER_PAGE)
         asset_filter = request.args.get('asset', None)
+        before = request.args.get('before', None)
         
         query = TradingSignal.query
         if asset_filter:
             query = query.filter_by(asset=asset_filter)
+        query = query.order_by(TradingSignal.created_at.desc(), TradingSignal.id.desc())
         
-        signals = query.order_by(TradingSignal.created_at.desc()).paginate(
+        if before:
+            try:
+                before_created_at, before_id = TradingSignal.parse_history_cursor(before)
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'error': 'before must be formatted as <created_at>,<id>'
+                }), 400
+            
+            # Seek past the cursor instead of an OFFSET scan: (asset, created_at) serves the
+            # asset-filtered query, (created_at, id) the unfiltered one
+            query = query.filter(or_(
+                TradingSignal.created_at < before_created_at,
+                and_(TradingSignal.created_at == before_created_at, TradingSignal.id < before_id)
+            ))
+            items = query.limit(per_page + 1).all()
+            has_more = len(items) > per_page
+            items = items[:per_page]
+            
+            return jsonify({
+                'success': True,
+                'signals': [signal.to_dict() for signal in items],
+                'pagination': {
+                    'per_page': per_page,
+                    'has_more': has_more,
+                    'next_before': items[-1].history_cursor() if has_more else None
+                }
+            })
+        
+        signals = query.paginate(
             page=page, per_page=per_page, error_out=False
         )
         
@@ -50,7 +125,8 @@ def get_signal_history():
                 'page': page,
                 'pages': signals.pages,
                 'per_page': per_page,
-                'total': signals.total
+                'total': signals.total,
+                'next_before': signals.items[-1].history_cursor() if signals.has_next else None
             }
         })
     except Exception as e:
@@ -68,18 +144,15 @@ def generate_signal():
         asset = data.get('asset', 'EUR/USD')
         
         # Generate signal using the Quotex signal generator
-        signal_data = signal_gen.generate_quotex_signal(asset)
+        signal_data = get_signal_generator().generate_quotex_signal(asset)
         
         if signal_data:
             # Create new signal in database
-            signal = TradingSignal()
-            signal.asset = signal_data['asset']
-            signal.signal_type = signal_data['signal_type']
-            signal.entry_price = signal_data['entry_price']
-            signal.expiry_time = signal_data['expiry_time']
-            signal.confidence = signal_data['confidence']
-            db.session.add(signal)
-            db.session.commit()
+            signal = TradingSignal.from_signal_data(signal_data)
+            with pipeline_metrics.timer('db_commit', asset):
+                get_db_writer().write(lambda: db.session.add(signal))
+            signal_settlement.schedule_signals([signal])
+            publish_signals([signal])
             
             return jsonify({
                 'success': True,
@@ -98,24 +171,87 @@ def generate_signal():
             'error': 'Failed to generate signal'
         }), 500
 
+@app.route('/api/signals/generate_batch', methods=['POST'])
+def generate_signal_batch():
+    """Generate signals for a list of assets or a whole category in one pass"""
+    try:
+        data = request.get_json() or {}
+        assets = data.get('assets')
+        category = data.get('category')
+        
+        if not assets and category:
+            categories = QUOTEX_PAIRS
+            if category == 'all':
+                assets = [asset for category_assets in categories.values() for asset in category_assets]
+            elif category in categories:
+                assets = categories[category]
+            else:
+                return jsonify({
+                    'success': False,
+                    'error': f'Unknown asset category: {category}'
+                }), 400
+        
+        if not assets or not isinstance(assets, list):
+            return jsonify({
+                'success': False,
+                'error': 'Provide a list of assets or an asset category'
+            }), 400
+        
+        # Keep request order but analyze each asset once
+        assets = list(dict.fromkeys(assets))
+        signals_data = get_signal_generator().generate_quotex_signals(assets)
+        
+        # Insert every generated signal in the same transaction
+        signals = [TradingSignal.from_signal_data(signal_data) for signal_data in signals_data]
+        if signals:
+            with pipeline_metrics.timer('db_commit_batch'):
+                get_db_writer().write(lambda: db.session.add_all(signals))
+            signal_settlement.schedule_signals(signals)
+            publish_signals(signals)
+        
+        generated_assets = {signal.asset for signal in signals}
+        return jsonify({
+            'success': True,
+            'signals': [signal.to_dict() for signal in signals],
+            'skipped': [asset for asset in assets if asset not in generated_assets]
+        })
+        
+    except Exception as e:
+        logging.error(f"Error generating signal batch: {e}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': 'Failed to generate signals'
+        }), 500
+
 @app.route('/api/performance')
 def get_performance():
-    """Get performance metrics"""
+    """Get performance metrics, optionally broken down with ?group_by=asset|day"""
     try:
+        group_by = request.args.get('group_by')
+        if group_by not in (None, 'asset', 'day'):
+            return jsonify({
+                'success': False,
+                'error': 'group_by must be asset or day'
+            }), 400
+        
+        # Counters are maintained as signals settle, so this is a single-row read
         metrics = PerformanceMetrics.get_current_metrics()
-        metrics.update_metrics()
         
-        return jsonify({
+        response = {
             'success': True,
-            'metrics': {
-                'total_signals': metrics.total_signals,
-                'winning_signals': metrics.winning_signals,
-                'losing_signals': metrics.losing_signals,
-                'win_rate': round(metrics.win_rate, 2),
-                'total_profit': round(metrics.total_profit, 2),
-                'updated_at': metrics.updated_at.isoformat()
-            }
-        })
+            'metrics': metrics.to_dict()
+        }
+        
+        if group_by:
+            rows = (PerformanceMetrics.aggregate_by_asset() if group_by == 'asset'
+                    else PerformanceMetrics.aggregate_by_day())
+            for row in rows:
+                row['win_rate'] = round(row['win_rate'], 2)
+                row['total_profit'] = round(row['total_profit'], 2)
+            response['breakdown'] = rows
+        
+        return jsonify(response)
     except Exception as e:
         logging.error(f"Error fetching performance: {e}")
         return jsonify({
@@ -124,10 +260,11 @@ def get_performance():
         }), 500
 
 @app.route('/api/assets')
+@response_cache.cached(versioned=False)
 def get_assets():
     """Get available trading assets categorized by type"""
     try:
-        available_assets = signal_gen.get_quotex_assets_by_category()
+        available_assets = QUOTEX_PAIRS
         
         # Flatten all assets for the main dropdown
         all_assets = []
@@ -145,3 +282,112 @@ def get_assets():
             'success': False,
             'error': 'Failed to fetch available assets'
         }), 500
+
+@app.route('/api/market-data/cache')
+def get_market_data_cache_stats():
+    """Get market data cache hit/miss/eviction counters"""
+    return jsonify({
+        'success': True,
+        'cache': market_data_cache.stats(),
+        # Cross-process store of `run.py serve`; None when running as one process
+        'shared': market_data_cache.shared.status() if market_data_cache.shared is not None else None
+    })
+
+@app.route('/api/response-cache')
+def get_response_cache_stats():
+    """Get response cache hit/miss/304 counters"""
+    return jsonify({
+        'success': True,
+        'cache': response_cache.status()
+    })
+
+@app.route('/api/scanner/status')
+def get_scanner_status():
+    """Get background signal scanner counters"""
+    if signal_scanner.scanner is None:
+        return jsonify({
+            'success': True,
+            'scanner': {'running': False}
+        })
+    
+    return jsonify({
+        'success': True,
+        'scanner': signal_scanner.scanner.status()
+    })
+
+@app.route('/api/settlement/status')
+def get_settlement_status():
+    """Get signal settlement counters"""
+    engine = signal_settlement.settlement_engine
+    if engine is None:
+        return jsonify({
+            'success': True,
+            'settlement': {'running': False}
+        })
+    
+    return jsonify({
+        'success': True,
+        'settlement': dict(engine.stats, running=True, pending=engine.pending_count())
+    })
+
+@app.route('/api/db/writer')
+def get_db_writer_status():
+    """Get batched database writer counters"""
+    return jsonify({
+        'success': True,
+        'writer': get_db_writer().status()
+    })
+
+@app.route('/api/stream')
+def stream_events():
+    """Server-Sent Events stream of new signals, settlements and metric updates"""
+    subscriber = broadcaster.subscribe()
+    if subscriber is None:
+        # Clients fall back to polling when the stream is unavailable
+        return jsonify({
+            'success': False,
+            'error': 'Too many open event streams'
+        }), 503
+    
+    return Response(
+        broadcaster.stream(subscriber),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/stream/status')
+def get_stream_status():
+    """Get event stream subscriber and delivery counters"""
+    return jsonify({
+        'success': True,
+        'stream': broadcaster.status()
+    })
+
+@app.route('/metrics')
+def get_prometheus_metrics():
+    """Pipeline stage latency histograms in Prometheus text format"""
+    return Response(pipeline_metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/metrics/stages')
+def get_stage_metrics():
+    """Get p50/p95/p99 latency per pipeline stage, optionally for one ?asset="""
+    return jsonify({
+        'success': True,
+        'stages': pipeline_metrics.snapshot(request.args.get('asset'))
+    })
+
+@app.route('/api/profile')
+def get_profile():
+    """Write the collected profiles to disk and return the top entries (PIPELINE_PROFILE must be set)"""
+    if not pipeline_profiler.enabled:
+        return jsonify({
+            'success': False,
+            'error': 'Profiling is disabled, set PIPELINE_PROFILE=cprofile or sample'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'mode': pipeline_profiler.mode,
+        'files': pipeline_profiler.report(),
+        'summary': pipeline_profiler.summary(request.args.get('limit', 30, type=int))
+    })
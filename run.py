@@ -10,6 +10,8 @@ import webbrowser
 import threading
 import time
 import signal
+import argparse
+import importlib.util
 from pathlib import Path
 
 # Add current directory to Python path
@@ -21,6 +23,7 @@ def setup_environment():
     # Set default environment variables
     os.environ.setdefault('SESSION_SECRET', 'quotex-signal-bot-secret-key-2024')
     os.environ.setdefault('DATABASE_URL', 'sqlite:///quotex_signals.db')
+    os.environ.setdefault('SCANNER_ENABLED', '1')
     
     # Create data directory if it doesn't exist
     data_dir = current_dir / 'data'
@@ -29,22 +32,32 @@ def setup_environment():
     # Set database path to data directory
     db_path = data_dir / 'quotex_signals.db'
     os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    
+    # Persist downloaded bars so restarts only fetch what is missing
+    os.environ.setdefault('BAR_STORE_DIR', str(data_dir / 'bars'))
+    
+    # Where PIPELINE_PROFILE=cprofile|sample writes its profiles
+    os.environ.setdefault('PROFILE_DIR', str(data_dir / 'profiles'))
+
+# Importable module name -> package to install
+REQUIRED_PACKAGES = {
+    'flask': 'Flask',
+    'flask_sqlalchemy': 'Flask-SQLAlchemy',
+    'flask_cors': 'Flask-CORS',
+    'yfinance': 'yfinance',
+    'pandas': 'pandas',
+    'numpy': 'numpy',
+    'requests': 'requests',
+    'bs4': 'beautifulsoup4',
+}
 
 def check_dependencies():
-    """Check if all required dependencies are installed"""
-    required_packages = [
-        'flask', 'flask_sqlalchemy', 'flask_cors', 'yfinance', 
-        'pandas', 'numpy', 'requests', 'beautifulsoup4'
+    """Check if all required dependencies are installed, without importing them"""
+    missing_packages = [
+        package for module, package in REQUIRED_PACKAGES.items()
+        if importlib.util.find_spec(module) is None
     ]
     
-    missing_packages = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
-    
     if missing_packages:
         print("❌ Missing required packages:")
         for package in missing_packages:
@@ -70,8 +83,112 @@ def signal_handler(signum, frame):
     print("\n🛑 Shutting down Quotex Signal Bot...")
     sys.exit(0)
 
-def main():
+def start_background_services(app):
+    """Sentiment refresher, settlement engine and signal scanner; loads the signal stack"""
+    # Warm the shared Fear & Greed cache before the first signal request
+    from market_sentiment import sentiment_provider
+    sentiment_provider.start()
+    
+    # Settle expired signals and precompute new ones on every 1-minute bar close
+    from routes import get_signal_generator
+    from signal_settlement import start_settlement
+    from signal_scanner import start_scanner
+    signal_gen = get_signal_generator()
+    start_settlement(app, signal_gen)
+    if start_scanner(app, signal_gen):
+        print("🛰️  Background signal scanner running")
+
+# Lock file of the worker that runs the background services under `serve`, held until it exits
+services_lock = None
+
+def preload_app():
+    """Import the app and the whole signal stack, and prepare the database, before the workers fork"""
+    from app import app, db, init_db
+    # pandas, numpy, yfinance and the analyzers, shared copy-on-write by every worker
+    import quotex_signal_generator  # noqa: F401
+    import signal_scanner  # noqa: F401
+    import signal_settlement  # noqa: F401
+    
+    init_db()
+    # Connections opened in the master must not be shared by the forked workers
+    with app.app_context():
+        db.engine.dispose()
+    return app
+
+def elect_background_services(app, retry_seconds=5):
+    """Start the background services in the first worker to take the lock; the others take over if it exits"""
+    from shared_cache import try_lock
+    
+    lock_path = Path(os.environ['SHARED_CACHE_DIR']) / 'background-services.lock'
+    
+    def run():
+        global services_lock
+        while services_lock is None:
+            services_lock = try_lock(lock_path)
+            if services_lock is None:
+                time.sleep(retry_seconds)
+        try:
+            start_background_services(app)
+        except Exception as e:
+            print(f"❌ Error starting background services: {e}")
+    
+    threading.Thread(target=run, name='services-election', daemon=True).start()
+
+def serve(workers, threads, bind):
+    """Serve through pre-forked gunicorn workers that share market data, sentiment and events"""
+    print("🚀 Starting Quotex Signal Bot (production server)...")
+    
+    setup_environment()
+    # Cross-process cache and event relay used by every worker
+    os.environ.setdefault('SHARED_CACHE_DIR', str(current_dir / 'data' / 'shared'))
+    # Only one worker settles signals, so it also reloads the ones the others stored
+    os.environ.setdefault('SETTLEMENT_RESCAN', '15')
+    
+    if not check_dependencies():
+        return 1
+    
+    try:
+        from wsgi_server import PreloadedServer
+    except ImportError:
+        print("❌ The production server needs gunicorn, which runs on Linux and macOS:")
+        print("pip install gunicorn")
+        return 1
+    
+    app = preload_app()
+    print("✅ App preloaded and database initialized")
+    
+    def post_fork(server, worker):
+        # Threads do not survive the fork: each worker starts its own
+        from event_broadcaster import broadcaster
+        broadcaster.start_relay()
+        elect_background_services(app)
+    
+    PreloadedServer(app, {
+        'bind': bind,
+        'workers': workers,
+        # Each open event stream holds a thread for as long as the dashboard is open
+        'worker_class': 'gthread',
+        'threads': threads,
+        'preload_app': True,
+        'graceful_timeout': 10,
+        'post_fork': post_fork,
+    }).run()
+    return 0
+
+def main(argv=None):
     """Main application entry point"""
+    parser = argparse.ArgumentParser(prog='quotex-bot', description='Quotex Signal Bot')
+    commands = parser.add_subparsers(dest='command')
+    serve_parser = commands.add_parser('serve', help='production server with pre-forked worker processes')
+    serve_parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1)))
+    serve_parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 8)),
+                              help='threads per worker; also the most event streams one worker holds open')
+    serve_parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:5000'))
+    args = parser.parse_args(argv)
+    
+    if args.command == 'serve':
+        return serve(args.workers, args.threads, args.bind)
+    
     print("🚀 Starting Quotex Signal Bot...")
     print("=" * 50)
     print("Advanced Trading Signal Generator")
@@ -93,13 +210,21 @@ def main():
     
     try:
         # Import after dependency check
-        from app import app
+        from app import app, init_db
         
         print("✅ All dependencies loaded successfully")
         print("🔧 Setting up database...")
         
-        # Database setup is handled in app.py
+        init_db()
         print("✅ Database initialized")
+        
+        if os.environ.get('FAST_START', '0') == '1':
+            # Serve the dashboard right away; pandas, yfinance and the generator load meanwhile
+            threading.Thread(target=start_background_services, args=(app,),
+                             name='background-services', daemon=True).start()
+        else:
+            start_background_services(app)
+        
         print("🌐 Starting web server...")
         
         # Start browser in a separate thread
@@ -42,6 +42,10 @@ setup(
         "ta>=0.11.0",
         "plotly>=6.1.2",
     ],
+    extras_require={
+        # `quotex-bot serve`: pre-forking production server (Linux/macOS)
+        "serve": ["gunicorn>=21.2"],
+    },
     entry_points={
         "console_scripts": [
             "quotex-bot=run:main",
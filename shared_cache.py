@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import logging
+import threading
+import contextlib
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no pre-forking server there, so a single process owns the files
+    fcntl = None
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Exclusive lock on `path` across processes (and threads), held for the block"""
+    if fcntl is None:
+        yield
+        return
+
+    with open(path, 'a+b') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def try_lock(path):
+    """Open handle holding an exclusive lock on `path`, or None when another process holds it
+
+    The lock lasts until the handle is closed or the process exits.
+    """
+    handle = open(path, 'a+b')
+    if fcntl is None:
+        return handle
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return handle
+    except OSError:
+        handle.close()
+        return None
+
+
+class SharedCache:
+    """
+    Cache of picklable values shared by the worker processes of one server
+
+    Each entry is a pickle file holding its expiry timestamp and value,
+    written to a temporary file and renamed into place so readers never see
+    a partial entry. `lock(key)` lets one process compute an entry while the
+    others wait and then read it instead of repeating the work. Entries are
+    unpickled, so the directory must only be writable by the app.
+    """
+
+    def __init__(self, directory, clock=time.time):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'errors': 0}
+
+    def _path(self, key):
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()
+        return self.directory / f'{digest}.pkl'
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, key):
+        """(value, expires_at) while the entry is fresh, otherwise None"""
+        try:
+            with open(self._path(key), 'rb') as handle:
+                expires_at, value = pickle.load(handle)
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        except Exception as e:
+            logging.warning(f"Unreadable shared cache entry for {key!r}: {e}")
+            self._count('errors')
+            return None
+
+        if self.clock() >= expires_at:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return value, expires_at
+
+    def put(self, key, value, expires_at):
+        """Store `value` for every process until `expires_at`"""
+        path = self._path(key)
+        temporary = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            with open(temporary, 'wb') as handle:
+                pickle.dump((expires_at, value), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+            self._count('writes')
+        except Exception as e:
+            logging.error(f"Error writing shared cache entry for {key!r}: {e}")
+            self._count('errors')
+            with contextlib.suppress(OSError):
+                temporary.unlink()
+
+    def lock(self, key):
+        """Context manager serializing the processes computing `key`"""
+        return file_lock(self._path(key).with_suffix('.lock'))
+
+    def clear(self):
+        """Drop every entry"""
+        for path in self.directory.glob('*.pkl'):
+            with contextlib.suppress(OSError):
+                path.unlink()
+
+    def status(self):
+        with self._lock:
+            return dict(self.stats, directory=str(self.directory))
+
+
+class SharedEventLog:
+    """
+    JSON lines file relaying events between the worker processes of one server
+
+    Every process appends the events it publishes and follows the file from
+    a background thread, handing on the events other processes wrote. The
+    file is rotated once it grows past `max_bytes`; followers finish reading
+    the rotated file before switching to the new one.
+    """
+
+    def __init__(self, path, max_bytes=None, poll_interval=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes or int(float(os.environ.get('EVENT_LOG_MB', 8)) * 1024 * 1024)
+        self.poll_interval = poll_interval or float(os.environ.get('EVENT_RELAY_POLL_MS', 200)) / 1000
+        self._lock_path = self.path.with_name(f'{self.path.name}.lock')
+        self._thread = None
+
+    def append(self, event, data):
+        """Write one event for the other processes"""
+        line = (json.dumps({'pid': os.getpid(), 'event': event, 'data': data}) + '\n').encode()
+        with file_lock(self._lock_path):
+            try:
+                if self.path.stat().st_size + len(line) > self.max_bytes:
+                    os.replace(self.path, self.path.with_name(f'{self.path.name}.1'))
+            except FileNotFoundError:
+                pass
+            with open(self.path, 'ab') as handle:
+                handle.write(line)
+
+    def follow(self, callback):
+        """Call `callback(event, data)` from a daemon thread for events written by other processes"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._thread = threading.Thread(target=self._follow, args=(callback,), name='event-relay', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _open(self, at_end):
+        with file_lock(self._lock_path):
+            handle = open(self.path, 'a+b')
+        handle.seek(0, os.SEEK_END if at_end else os.SEEK_SET)
+        return handle
+
+    def _follow(self, callback):
+        pid = os.getpid()
+        # Only events published from now on; earlier ones are already reflected in the database
+        handle = self._open(at_end=True)
+        pending = b''
+
+        while True:
+            chunk = handle.read()
+            if not chunk:
+                try:
+                    rotated = os.stat(self.path).st_ino != os.fstat(handle.fileno()).st_ino
+                except FileNotFoundError:
+                    rotated = True
+                if rotated:
+                    # Whatever was appended before the rotation has been read above
+                    handle.close()
+                    handle = self._open(at_end=False)
+                    pending = b''
+                    continue
+                time.sleep(self.poll_interval)
+                continue
+
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                    if record.get('pid') != pid:
+                        callback(record['event'], record['data'])
+                except Exception as e:
+                    logging.error(f"Error relaying event: {e}")
+
+
+def default_shared_cache():
+    """Shared cache configured by SHARED_CACHE_DIR, or None when the app runs as one process"""
+    directory = os.environ.get('SHARED_CACHE_DIR')
+    if not directory:
+        return None
+    try:
+        return SharedCache(directory)
+    except Exception as e:
+        logging.error(f"Error opening shared cache at {directory}: {e}")
+        return None
+
+
+def default_event_log():
+    """Event relay file under SHARED_CACHE_DIR, or None when the app runs as one process"""
+    directory = os.environ.get('SHARED_CACHE_DIR')
+    if not directory:
+        return None
+    try:
+        return SharedEventLog(Path(directory) / 'events.log')
+    except Exception as e:
+        logging.error(f"Error opening event log under {directory}: {e}")
+        return None
+
+
+# Process-wide store shared with the other workers, None outside `run.py serve`
+shared_cache = default_shared_cache()
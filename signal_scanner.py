@@ -0,0 +1,243 @@
+import os
+import time
+import queue
+import logging
+import threading
+from datetime import datetime
+
+from pipeline_metrics import pipeline_metrics
+
+
+def parse_asset_list(value, categories):
+    """Resolve a comma separated list of asset names and/or category keys"""
+    if not value or value.strip().lower() == 'all':
+        return [asset for category_assets in categories.values() for asset in category_assets]
+
+    assets = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        if item in categories:
+            assets.extend(categories[item])
+        else:
+            assets.append(item)
+    return list(dict.fromkeys(assets))
+
+
+class SignalScanner:
+    """
+    Background sweep of the asset universe aligned to 1-minute bar closes
+
+    A scheduler thread wakes shortly after each bar close, prefetches every
+    asset's bars with one batch download, then feeds the assets to a pool of
+    worker threads through a bounded queue. When the workers fall behind the
+    queue fills up and the scheduler waits for room until the next sweep is
+    due; assets it still cannot enqueue are dropped for this sweep.
+    """
+
+    def __init__(self, app, generator, assets=None, workers=None, stagger=None,
+                 queue_size=None, interval=60, close_delay=None):
+        self.app = app
+        self.generator = generator
+        self.assets = assets if assets is not None else parse_asset_list(
+            os.environ.get('SCANNER_ASSETS', 'all'), generator.get_quotex_assets_by_category()
+        )
+        self.workers = workers or int(os.environ.get('SCANNER_WORKERS', 4))
+        self.stagger = stagger if stagger is not None else float(os.environ.get('SCANNER_STAGGER_MS', 250)) / 1000
+        self.interval = interval
+        # Seconds to wait after the bar close so the provider has published the bar
+        self.close_delay = close_delay if close_delay is not None else float(os.environ.get('SCANNER_CLOSE_DELAY', 2))
+        # Bar closes follow the market data clock, which a replay provider runs faster than real time
+        self.clock = generator.provider.now
+        self.speed = generator.provider.speed
+
+        self._queue = queue.Queue(maxsize=queue_size or int(os.environ.get('SCANNER_QUEUE_SIZE', 32)))
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+        self.latest_signals = {}
+        self.stats = {
+            'sweeps': 0,
+            'scanned': 0,
+            'stored': 0,
+            'skipped_active': 0,
+            'no_signal': 0,
+            'dropped': 0,
+            'errors': 0,
+            'last_sweep_at': None,
+            'last_sweep_seconds': None
+        }
+        self._stats_lock = threading.Lock()
+
+    def start(self):
+        """Start the scheduler and worker threads"""
+        if self._threads:
+            return
+
+        self._stop.clear()
+        scheduler = threading.Thread(target=self._schedule_loop, name='scanner-scheduler', daemon=True)
+        self._threads.append(scheduler)
+        for number in range(self.workers):
+            worker = threading.Thread(target=self._worker_loop, name=f'scanner-worker-{number}', daemon=True)
+            self._threads.append(worker)
+
+        for thread in self._threads:
+            thread.start()
+
+        logging.info(f"Signal scanner started: {len(self.assets)} assets, {self.workers} workers")
+
+    def stop(self, timeout=5):
+        """Stop all threads, abandoning queued assets"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def status(self):
+        """Counters, queue depth and configuration"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats.update({
+            'running': bool(self._threads) and not self._stop.is_set(),
+            'assets': len(self.assets),
+            'workers': self.workers,
+            'queue_depth': self._queue.qsize(),
+            'queue_size': self._queue.maxsize
+        })
+        return stats
+
+    def next_bar_close(self, now=None):
+        """Timestamp at which the next sweep is due"""
+        now = self.clock() if now is None else now
+        return (int(now // self.interval) + 1) * self.interval + self.close_delay
+
+    def sweep(self, deadline=None):
+        """Prefetch data and enqueue every configured asset once"""
+        started = time.time()
+        deadline = deadline or self.clock() + self.interval
+
+        # One multi-ticker download warms the shared cache for all workers
+        try:
+            self.generator.get_raw_market_data_batch(self.assets, period='2d', interval='1m')
+        except Exception as e:
+            logging.error(f"Scanner prefetch failed: {e}")
+
+        # Spread the sweep over at most half the interval
+        stagger = min(self.stagger, self.interval / self.speed * 0.5 / max(len(self.assets), 1))
+
+        for asset in self.assets:
+            if self._stop.is_set():
+                return
+
+            with self._pending_lock:
+                if asset in self._pending:
+                    continue
+                self._pending.add(asset)
+
+            try:
+                # Backpressure: block while the queue is full, but never past the next sweep
+                self._queue.put(asset, timeout=max((deadline - self.clock()) / self.speed, 0.001))
+            except queue.Full:
+                with self._pending_lock:
+                    self._pending.discard(asset)
+                self._count('dropped')
+                continue
+
+            if stagger:
+                self._stop.wait(stagger)
+
+        with self._stats_lock:
+            self.stats['sweeps'] += 1
+            self.stats['last_sweep_at'] = datetime.utcnow().isoformat()
+            self.stats['last_sweep_seconds'] = round(time.time() - started, 3)
+
+    def _schedule_loop(self):
+        while not self._stop.is_set():
+            due = self.next_bar_close()
+            if self._stop.wait(max((due - self.clock()) / self.speed, 0)):
+                return
+            try:
+                self.sweep(deadline=due + self.interval)
+            except Exception as e:
+                logging.error(f"Scanner sweep failed: {e}")
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                asset = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            try:
+                self.scan_asset(asset)
+            except Exception as e:
+                logging.error(f"Scanner failed for {asset}: {e}")
+                self._count('errors')
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(asset)
+                self._queue.task_done()
+
+    def scan_asset(self, asset):
+        """Generate and store a signal for one asset"""
+        self._count('scanned')
+        signal_data = self.generator.generate_quotex_signal(asset)
+        if not signal_data:
+            self._count('no_signal')
+            return None
+
+        self.latest_signals[asset] = signal_data
+        return self.store_signal(signal_data)
+
+    def store_signal(self, signal_data):
+        """Persist a scanned signal unless the asset already has an active one"""
+        from app import db
+        from models import TradingSignal
+        from db_writer import get_db_writer
+        from signal_settlement import schedule_signals
+        from event_broadcaster import publish_signals
+
+        def store():
+            # Checked inside the write transaction, so no other write can slip in between
+            active = TradingSignal.query.filter_by(
+                asset=signal_data['asset'], is_active=True
+            ).first()
+            if active is not None:
+                return None
+            signal = TradingSignal.from_signal_data(signal_data)
+            db.session.add(signal)
+            return signal
+
+        with pipeline_metrics.timer('db_commit', signal_data['asset']):
+            signal = get_db_writer().write(store)
+        if signal is None:
+            self._count('skipped_active')
+            return None
+
+        schedule_signals([signal])
+        publish_signals([signal])
+        self._count('stored')
+        return signal.to_dict()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+
+scanner = None
+
+
+def start_scanner(app, generator):
+    """Start the process-wide scanner when SCANNER_ENABLED is set"""
+    global scanner
+
+    if os.environ.get('SCANNER_ENABLED', '0').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    if scanner is None:
+        scanner = SignalScanner(app, generator)
+        scanner.start()
+    return scanner
@@ -0,0 +1,341 @@
+import os
+import time
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from pipeline_metrics import pipeline_metrics
+
+# Signals are priced on the close of a 1m bar, so their expiry counts from the end of that bar
+SIGNAL_BAR = timedelta(minutes=1)
+
+
+class PendingSettlement:
+    """An active signal waiting for its expiry"""
+
+    __slots__ = ('signal_id', 'asset', 'signal_type', 'entry_price', 'expires_at')
+
+    def __init__(self, signal_id, asset, signal_type, entry_price, expires_at):
+        self.signal_id = signal_id
+        self.asset = asset
+        self.signal_type = signal_type
+        self.entry_price = entry_price
+        self.expires_at = expires_at  # naive UTC datetime on the market data clock
+
+    @staticmethod
+    def from_signal(signal):
+        # Rows stored before bar_time existed fall back to their wall-clock creation time
+        priced_at = signal.bar_time + SIGNAL_BAR if signal.bar_time is not None else signal.created_at
+        return PendingSettlement(
+            signal.id, signal.asset, signal.signal_type, signal.entry_price,
+            priced_at + timedelta(minutes=signal.expiry_time)
+        )
+
+
+def price_at(data, moment):
+    """
+    Close of the last bar that started before `moment` (naive UTC)
+
+    Returns None until a later bar exists, i.e. while the bar covering
+    `moment` may still be in progress.
+    """
+    if data is None or len(data) == 0:
+        return None
+
+    # Only needed once there are bars to look at, so importing routes stays free of pandas
+    import pandas as pd
+
+    index = data.index
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+
+    moment = pd.Timestamp(moment)
+    if index[-1] < moment:
+        return None
+
+    position = index.searchsorted(moment, side='left') - 1
+    if position < 0:
+        return None
+
+    close = float(data['Close'].iloc[position])
+    return None if pd.isna(close) else close
+
+
+class SettlementEngine:
+    """
+    Settles expired signals in the background
+
+    Pending expiries are kept in a heap ordered by expiry time on the market
+    data clock, which a replay provider runs faster than real time. A single
+    thread sleeps until the earliest one is due, looks up the close at expiry from the
+    cached market data, and writes WIN/LOSS, P&L and is_active=False for every
+    due signal in bulk UPDATE batches together with the performance counters.
+    """
+
+    def __init__(self, app, generator, stake=None, payout=None, batch_size=200,
+                 retry_seconds=15, grace_seconds=None, rescan_seconds=None, clock=None):
+        self.app = app
+        self.generator = generator
+        # Expiries and the grace period follow the provider's clock, like the bars they are settled on
+        self.clock = clock if clock is not None else generator.provider.now
+        self.speed = generator.provider.speed
+        self.stake = stake if stake is not None else float(os.environ.get('SETTLEMENT_STAKE', 10))
+        self.payout = payout if payout is not None else float(os.environ.get('SETTLEMENT_PAYOUT', 0.85))
+        self.batch_size = batch_size
+        self.retry_seconds = retry_seconds
+        # Signals whose expiry price is still unknown after this long are closed without a result
+        self.grace_seconds = grace_seconds if grace_seconds is not None else float(os.environ.get('SETTLEMENT_GRACE', 600))
+        # Reload active signals this often to pick up ones stored by other worker processes; 0 disables
+        self.rescan_seconds = rescan_seconds if rescan_seconds is not None else float(os.environ.get('SETTLEMENT_RESCAN', 0))
+
+        self._heap = []  # (due timestamp, signal id, PendingSettlement)
+        self._scheduled = set()
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.stats = {'settled': 0, 'wins': 0, 'losses': 0, 'expired_without_price': 0, 'retries': 0}
+
+    def start(self):
+        """Load active signals from the database and start the settlement thread"""
+        if self._thread is not None:
+            return
+        self.load_pending()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='settlement', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def load_pending(self):
+        """Schedule every active signal already in the database"""
+        from models import TradingSignal
+
+        with self.app.app_context():
+            signals = TradingSignal.query.filter_by(is_active=True).all()
+            self.schedule_many(PendingSettlement.from_signal(signal) for signal in signals)
+        return len(self._scheduled)
+
+    def schedule(self, signal):
+        """Schedule a freshly stored TradingSignal"""
+        self.schedule_many([PendingSettlement.from_signal(signal)])
+
+    def schedule_many(self, pending_items):
+        with self._condition:
+            for pending in pending_items:
+                if pending.signal_id in self._scheduled:
+                    continue
+                self._scheduled.add(pending.signal_id)
+                due = pending.expires_at.replace(tzinfo=timezone.utc).timestamp()
+                heapq.heappush(self._heap, (due, pending.signal_id, pending))
+            self._condition.notify()
+
+    def pending_count(self):
+        with self._condition:
+            return len(self._heap)
+
+    def _run(self):
+        next_rescan = time.time() + self.rescan_seconds if self.rescan_seconds else None
+        while not self._stop.is_set():
+            if next_rescan is not None and time.time() >= next_rescan:
+                try:
+                    self.load_pending()
+                except Exception as e:
+                    logging.error(f"Error reloading active signals: {e}")
+                next_rescan = time.time() + self.rescan_seconds
+
+            due_items = self.pop_due()
+            if not due_items:
+                with self._condition:
+                    timeout = (self._heap[0][0] - self.clock()) / self.speed if self._heap else None
+                    if next_rescan is not None:
+                        # Rescans pick up other processes' rows, so they stay on the wall clock
+                        rescan_in = next_rescan - time.time()
+                        timeout = min(timeout, rescan_in) if timeout is not None else rescan_in
+                    self._condition.wait(max(timeout, 0) if timeout is not None else None)
+                continue
+
+            try:
+                self.settle(due_items)
+            except Exception as e:
+                logging.error(f"Error settling {len(due_items)} signals: {e}")
+                self._reschedule(due_items)
+
+    def pop_due(self, now=None):
+        """Remove and return every pending settlement due by `now` (epoch seconds, provider clock)"""
+        due_items = []
+        with self._condition:
+            now = self.clock() if now is None else now
+            while self._heap and self._heap[0][0] <= now:
+                due_items.append(heapq.heappop(self._heap)[2])
+        return due_items
+
+    def settle(self, due_items, now=None):
+        """Resolve due signals and write the results in bulk batches"""
+        now = now or datetime.fromtimestamp(self.clock(), timezone.utc).replace(tzinfo=None)
+        updates = []
+        retry = []
+
+        by_asset = {}
+        for pending in due_items:
+            by_asset.setdefault(pending.asset, []).append(pending)
+
+        for asset, items in by_asset.items():
+            try:
+                data = self.generator.get_raw_market_data(asset, period='2d', interval='1m')
+            except Exception as e:
+                logging.error(f"Error fetching settlement prices for {asset}: {e}")
+                data = None
+
+            for pending in items:
+                close = price_at(data, pending.expires_at)
+                if close is not None:
+                    updates.append(self.outcome(pending, close))
+                elif (now - pending.expires_at).total_seconds() > self.grace_seconds:
+                    updates.append({'id': pending.signal_id, 'is_active': False,
+                                    'result': None, 'profit_loss': 0.0})
+                    self.stats['expired_without_price'] += 1
+                else:
+                    retry.append(pending)
+
+        # A failed batch is retried on its own; the batches already committed stay settled
+        failed_ids = set()
+        for start in range(0, len(updates), self.batch_size):
+            batch = updates[start:start + self.batch_size]
+            try:
+                self.write_batch(batch)
+            except Exception as e:
+                logging.error(f"Error writing {len(batch)} settlements: {e}")
+                failed_ids.update(row['id'] for row in batch)
+
+        with self._condition:
+            for pending in due_items:
+                self._scheduled.discard(pending.signal_id)
+        retry.extend(pending for pending in due_items if pending.signal_id in failed_ids)
+        if retry:
+            self.stats['retries'] += len(retry)
+            self._reschedule(retry)
+
+        return updates
+
+    def outcome(self, pending, close):
+        """WIN/LOSS and P&L for a fixed-stake binary option; an unchanged price loses"""
+        if pending.signal_type == 'BUY':
+            won = close > pending.entry_price
+        else:
+            won = close < pending.entry_price
+
+        return {
+            'id': pending.signal_id,
+            'is_active': False,
+            'result': 'WIN' if won else 'LOSS',
+            'profit_loss': round(self.stake * self.payout if won else -self.stake, 2)
+        }
+
+    def write_batch(self, rows):
+        """
+        Flip a batch of signals in one transaction and update the counters once
+
+        Only signals still active are updated and counted, so settling the
+        same signal twice (a retried batch, another worker) changes nothing.
+        Returns the rows that were applied.
+        """
+        from app import db
+        from models import TradingSignal, PerformanceMetrics
+        from sqlalchemy import select, update
+        from db_writer import get_db_writer
+        from event_broadcaster import publish_settlements
+
+        def write():
+            # Inside the writer's transaction, which holds the write lock from its start on SQLite
+            active_ids = set(db.session.scalars(
+                select(TradingSignal.id)
+                .where(TradingSignal.id.in_([row['id'] for row in rows]), TradingSignal.is_active.is_(True))
+                .with_for_update()
+            ))
+            applied = [row for row in rows if row['id'] in active_ids]
+            if not applied:
+                return applied
+
+            # Seed the counter row before these results become visible to its aggregate
+            PerformanceMetrics.get_current_metrics()
+            db.session.execute(
+                update(TradingSignal)
+                .where(TradingSignal.is_active.is_(True))
+                .execution_options(synchronize_session=None),
+                applied
+            )
+            settled = [row for row in applied if row['result'] is not None]
+            if settled:
+                wins = sum(1 for row in settled if row['result'] == 'WIN')
+                PerformanceMetrics.record_deltas(
+                    total=len(settled),
+                    wins=wins,
+                    losses=len(settled) - wins,
+                    profit=sum(row['profit_loss'] for row in settled)
+                )
+            return applied
+
+        with pipeline_metrics.timer('settlement_commit'):
+            rows = get_db_writer().write(write)
+        if not rows:
+            return rows
+
+        settled = [row for row in rows if row['result'] is not None]
+        wins = sum(1 for row in settled if row['result'] == 'WIN')
+        delta = {
+            'total_signals': len(settled),
+            'winning_signals': wins,
+            'losing_signals': len(settled) - wins,
+            'total_profit': round(sum(row['profit_loss'] for row in settled), 2)
+        }
+
+        with self.app.app_context():
+            # One metrics read per batch, however many dashboards are listening
+            metrics = None
+            if settled:
+                try:
+                    metrics = PerformanceMetrics.get_current_metrics().to_dict()
+                except Exception as e:
+                    logging.error(f"Error reading metrics for settlement events: {e}")
+
+        publish_settlements(rows, metrics, delta)
+
+        self.stats['settled'] += len(settled)
+        self.stats['wins'] += wins
+        self.stats['losses'] += len(settled) - wins
+        return rows
+
+    def _reschedule(self, items):
+        retry_at = self.clock() + self.retry_seconds
+        with self._condition:
+            for pending in items:
+                self._scheduled.add(pending.signal_id)
+                heapq.heappush(self._heap, (retry_at, pending.signal_id, pending))
+            self._condition.notify()
+
+
+settlement_engine = None
+
+
+def start_settlement(app, generator):
+    """Start the process-wide settlement engine"""
+    global settlement_engine
+
+    if settlement_engine is None:
+        settlement_engine = SettlementEngine(app, generator)
+        settlement_engine.start()
+    return settlement_engine
+
+
+def schedule_signals(signals):
+    """Hand newly stored signals to the settlement engine when it is running"""
+    if settlement_engine is not None:
+        settlement_engine.schedule_many(PendingSettlement.from_signal(signal) for signal in signals)
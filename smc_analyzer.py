@@ -1,10 +1,159 @@
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
 import asyncio
+from numpy.lib.stride_tricks import sliding_window_view
 
 from market_sentiment import MarketSentimentAnalyzer  # import the new sentiment analyzer
+from pipeline_metrics import pipeline_metrics
+
+# Compact swing point representation: bar position in the frame and its price
+SWING_POINT_DTYPE = np.dtype([('index', np.int64), ('price', np.float64)])
+
+# Fair value gap: bar that completes the three-candle gap, +1 bullish / -1 bearish,
+# the price range left untraded, and whether later bars traded all the way through it
+FAIR_VALUE_GAP_DTYPE = np.dtype([('index', np.int64), ('direction', np.int8), ('top', np.float64),
+                                 ('bottom', np.float64), ('filled', np.bool_)])
+
+# Score get_smc_signal adds for each pattern pointing the same way on the latest bar
+CONFLUENCE_WEIGHTS = {'choch_direction': 2, 'liquidity_sweep': 2, 'order_block': 2, 'fair_value_gap': 1}
+
+DIRECTION_NAMES = {1: 'BULLISH', -1: 'BEARISH', 0: None}
+
+
+def forward_fill(values):
+    """Carry the last non-NaN value forward along a 1-D array"""
+    valid = ~np.isnan(values)
+    positions = np.where(valid, np.arange(len(values)), 0)
+    np.maximum.accumulate(positions, out=positions)
+    # Bars before the first valid value keep values[0], which is NaN
+    return values[positions]
+
+
+def confirmed_swings(points, n_bars, swing_length):
+    """
+    Latest and previous swing prices known at each bar
+
+    A swing at bar i is only confirmed once swing_length bars after it have
+    closed, which is when the live analyzer first sees it.
+    """
+    latest = np.full(n_bars, np.nan)
+    previous = np.full(n_bars, np.nan)
+
+    confirmed_at = points['index'] + swing_length
+    keep = confirmed_at < n_bars
+    prices = points['price']
+
+    latest[confirmed_at[keep]] = prices[keep]
+    previous[confirmed_at[keep]] = np.concatenate(([np.nan], prices[:-1]))[keep]
+
+    return forward_fill(latest), forward_fill(previous)
+
+
+def latest_positions(mask):
+    """Index of the last True at or before each bar, -1 before the first one"""
+    positions = np.where(mask, np.arange(len(mask)), -1)
+    return np.maximum.accumulate(positions)
+
+
+def recent_events(events, bars):
+    """Direction of the latest nonzero event if it happened within the last `bars` bars, else 0"""
+    positions = latest_positions(events != 0)
+    age = np.arange(len(events)) - positions
+    return np.where((positions >= 0) & (age < bars), events[positions], 0).astype(np.int8)
+
+
+def structure_breaks(close, swing_high, swing_low):
+    """+1 where the close crosses above the latest swing high, -1 where it crosses below the latest swing low"""
+    previous_close = np.concatenate(([np.nan], close[:-1]))
+    with np.errstate(invalid='ignore'):
+        up = (close > swing_high) & (previous_close <= swing_high)
+        down = (close < swing_low) & (previous_close >= swing_low)
+    return up.astype(np.int8) - down.astype(np.int8)
+
+
+def change_of_character(breaks):
+    """Direction at every structure break that goes against the break before it, 0 elsewhere"""
+    positions = np.flatnonzero(breaks)
+    directions = breaks[positions]
+    flips = np.flatnonzero(directions[1:] != directions[:-1]) + 1
+
+    choch = np.zeros(len(breaks), dtype=np.int8)
+    choch[positions[flips]] = directions[flips]
+    return choch
+
+
+def liquidity_sweeps(high, low, close, swing_high, swing_low):
+    """+1 where a bar wicks below the latest swing low and closes back above it, -1 for the mirror above highs"""
+    with np.errstate(invalid='ignore'):
+        bullish = (low < swing_low) & (close > swing_low)
+        bearish = (high > swing_high) & (close < swing_high)
+    return bullish.astype(np.int8) - bearish.astype(np.int8)
+
+
+def fair_value_gap_zones(high, low):
+    """
+    Three-candle gaps completed at each bar: (bullish, bearish), each a
+    (formed mask, top, bottom) triple of per-bar arrays
+
+    A bullish gap forms when a bar's low is above the high two bars back,
+    a bearish one when its high is below the low two bars back.
+    """
+    high_before = np.concatenate(([np.nan, np.nan], high[:-2]))
+    low_before = np.concatenate(([np.nan, np.nan], low[:-2]))
+    with np.errstate(invalid='ignore'):
+        bullish = (low > high_before, low, high_before)
+        bearish = (high < low_before, low_before, high)
+    return bullish, bearish
+
+
+def order_block_zones(open_, high, low, close, breaks):
+    """
+    Order blocks formed at each structure break: (bullish, bearish), each a
+    (formed mask, top, bottom) triple of per-bar arrays
+
+    The bullish block of a break up is the range of the last down candle
+    before it, the bearish block of a break down that of the last up candle.
+    """
+    with np.errstate(invalid='ignore'):
+        last_down = np.concatenate(([-1], latest_positions(close < open_)[:-1]))
+        last_up = np.concatenate(([-1], latest_positions(close > open_)[:-1]))
+
+    zones = []
+    for direction, candle in ((1, last_down), (-1, last_up)):
+        formed = (breaks == direction) & (candle >= 0)
+        zones.append((formed, high[candle], low[candle]))
+    return tuple(zones)
+
+
+def zone_retests(zone, high, low, close, direction, max_age):
+    """
+    Bars trading back into the latest zone of one direction while it holds
+
+    A zone holds until a close beyond its far side (below a bullish zone,
+    above a bearish one); a retest is a later bar, at most `max_age` bars
+    after the zone formed, whose range overlaps it.
+    """
+    formed, top, bottom = zone
+    latest = latest_positions(formed)
+    exists = latest >= 0
+    zone_top = top[latest]
+    zone_bottom = bottom[latest]
+
+    with np.errstate(invalid='ignore'):
+        if direction > 0:
+            breached = exists & (close < zone_bottom)
+        else:
+            breached = exists & (close > zone_top)
+        touched = (low <= zone_top) & (high >= zone_bottom)
+
+    # Breaches since the zone formed, counted as a difference of running totals
+    breaches = np.cumsum(breached)
+    breaches_before = np.where(latest > 0, breaches[latest - 1], 0)
+    holds = breaches == breaches_before
+
+    age = np.arange(len(close)) - latest
+    return exists & holds & touched & (age > 0) & (age <= max_age)
 
 
 class SMCAnalyzer:
@@ -13,15 +162,20 @@ class SMCAnalyzer:
     Now integrated with Market Sentiment for combined signals.
     """
 
-    def __init__(self):
+    def __init__(self, sentiment_analyzer=None):
         self.swing_length = 5
-        self.sentiment_analyzer = MarketSentimentAnalyzer()
+        # Bars a CHoCH or liquidity sweep keeps counting for, and the oldest order block or gap retested
+        self.choch_lookback = 10
+        self.sweep_lookback = 3
+        self.zone_lookback = 30
+        self.sentiment_analyzer = sentiment_analyzer if sentiment_analyzer is not None else MarketSentimentAnalyzer()
 
     def identify_market_structure(self, df):
         """Identify Break of Structure (BOS) and Change of Character (CHoCH)"""
         try:
-            swing_highs = self.find_swing_highs(df)
-            swing_lows = self.find_swing_lows(df)
+            with pipeline_metrics.timer('swing_points'):
+                swing_highs = self.find_swing_highs(df)
+                swing_lows = self.find_swing_lows(df)
 
             structure = {
                 'trend': 'NEUTRAL',
@@ -29,6 +183,12 @@ class SMCAnalyzer:
                 'choch_detected': False
             }
 
+            with pipeline_metrics.timer('smc_patterns'):
+                patterns = self.detect_patterns(df, swing_highs, swing_lows)
+            for name, directions in patterns.items():
+                structure[name] = DIRECTION_NAMES[int(directions[-1])] if len(directions) else None
+            structure['choch_detected'] = structure['choch_direction'] is not None
+
             if len(swing_highs) >= 2 and len(swing_lows) >= 2:
                 recent_highs = swing_highs[-2:]
                 recent_lows = swing_lows[-2:]
@@ -51,50 +211,141 @@ class SMCAnalyzer:
             logging.error(f"Error in market structure analysis: {e}")
             return {'trend': 'NEUTRAL', 'bos_detected': False, 'choch_detected': False}
 
+    def detect_patterns(self, df, swing_highs=None, swing_lows=None):
+        """
+        Per-bar SMC patterns as known at each bar's close: +1 bullish, -1 bearish, 0 none
+
+        - choch_direction: a change of character within the last choch_lookback bars
+        - liquidity_sweep: a sweep of the latest swing low/high within the last sweep_lookback bars
+        - order_block / fair_value_gap: the bar retests the latest order block or gap
+          of that direction, formed at most zone_lookback bars earlier and still holding
+
+        Whole-array operations over every bar, so the live analyzer (which reads the
+        last bar) and the backtester (which reads all of them) share one definition.
+        """
+        open_ = np.asarray(df['Open'], dtype=np.float64).ravel()
+        high = np.asarray(df['High'], dtype=np.float64).ravel()
+        low = np.asarray(df['Low'], dtype=np.float64).ravel()
+        close = np.asarray(df['Close'], dtype=np.float64).ravel()
+        n_bars = len(close)
+
+        if swing_highs is None:
+            swing_highs = self.find_swing_highs(df)
+        if swing_lows is None:
+            swing_lows = self.find_swing_lows(df)
+        swing_high, _ = confirmed_swings(swing_highs, n_bars, self.swing_length)
+        swing_low, _ = confirmed_swings(swing_lows, n_bars, self.swing_length)
+
+        breaks = structure_breaks(close, swing_high, swing_low)
+        sweeps = liquidity_sweeps(high, low, close, swing_high, swing_low)
+
+        retests = {}
+        zones = {
+            'order_block': order_block_zones(open_, high, low, close, breaks),
+            'fair_value_gap': fair_value_gap_zones(high, low),
+        }
+        for name, (bullish, bearish) in zones.items():
+            bullish_retest = zone_retests(bullish, high, low, close, 1, self.zone_lookback)
+            bearish_retest = zone_retests(bearish, high, low, close, -1, self.zone_lookback)
+            retests[name] = bullish_retest.astype(np.int8) - bearish_retest.astype(np.int8)
+
+        return {
+            'choch_direction': recent_events(change_of_character(breaks), self.choch_lookback),
+            'liquidity_sweep': recent_events(sweeps, self.sweep_lookback),
+            **retests
+        }
+
+    def find_fair_value_gaps(self, df):
+        """Find fair value gaps in the data
+
+        Returns a structured array with one row per three-candle gap: the bar
+        completing it, its direction, top and bottom, and whether any later
+        bar traded through the whole gap.
+        """
+        high = np.asarray(df['High'], dtype=np.float64).ravel()
+        low = np.asarray(df['Low'], dtype=np.float64).ravel()
+        bullish, bearish = fair_value_gap_zones(high, low)
+
+        # Lowest low / highest high strictly after each bar, NaNs ignored
+        later_low = np.append(np.fmin.accumulate(low[::-1])[::-1][1:], np.nan)
+        later_high = np.append(np.fmax.accumulate(high[::-1])[::-1][1:], np.nan)
+
+        gaps = []
+        for direction, (formed, top, bottom) in ((1, bullish), (-1, bearish)):
+            index = np.flatnonzero(formed)
+            rows = np.empty(len(index), dtype=FAIR_VALUE_GAP_DTYPE)
+            rows['index'] = index
+            rows['direction'] = direction
+            rows['top'] = top[index]
+            rows['bottom'] = bottom[index]
+            with np.errstate(invalid='ignore'):
+                rows['filled'] = (later_low[index] <= bottom[index] if direction > 0
+                                  else later_high[index] >= top[index])
+            gaps.append(rows)
+
+        gaps = np.concatenate(gaps)
+        return gaps[np.argsort(gaps['index'], kind='stable')]
+
     def find_swing_highs(self, df):
-        """Find swing highs in the data"""
-        swing_highs = []
-        for i in range(self.swing_length, len(df) - self.swing_length):
-            current_high = df['High'].iloc[i]
-            is_swing_high = True
-
-            for j in range(i - self.swing_length, i + self.swing_length + 1):
-                if j != i and df['High'].iloc[j] >= current_high:
-                    is_swing_high = False
-                    break
-
-            if is_swing_high:
-                swing_highs.append({
-                    'index': i,
-                    'price': current_high,
-                    'time': df.index[i]
-                })
-
-        return swing_highs
+        """Find swing highs in the data
+
+        Returns a structured array with 'index' and 'price' fields, one row per
+        bar whose High is strictly above every other High within swing_length
+        bars on either side.
+        """
+        return self._find_swing_points(df['High'], np.greater)
 
     def find_swing_lows(self, df):
-        """Find swing lows in the data"""
-        swing_lows = []
-        for i in range(self.swing_length, len(df) - self.swing_length):
-            current_low = df['Low'].iloc[i]
-            is_swing_low = True
-
-            for j in range(i - self.swing_length, i + self.swing_length + 1):
-                if j != i and df['Low'].iloc[j] <= current_low:
-                    is_swing_low = False
-                    break
-
-            if is_swing_low:
-                swing_lows.append({
-                    'index': i,
-                    'price': current_low,
-                    'time': df.index[i]
-                })
-
-        return swing_lows
-
-    async def get_smc_signal(self, df, asset='DEFAULT'):
-        """Generate combined SMC + Market Sentiment trading signal asynchronously"""
+        """Find swing lows in the data
+
+        Returns a structured array with 'index' and 'price' fields, one row per
+        bar whose Low is strictly below every other Low within swing_length
+        bars on either side.
+        """
+        return self._find_swing_points(df['Low'], np.less)
+
+    def _find_swing_points(self, series, compare):
+        """Vectorized swing detection over sliding windows of 2 * swing_length + 1 bars"""
+        values = np.asarray(series, dtype=np.float64).ravel()
+        length = self.swing_length
+        window = 2 * length + 1
+
+        if len(values) < window:
+            return np.empty(0, dtype=SWING_POINT_DTYPE)
+
+        # NaN neighbours never disqualify a bar, NaN centres are never swing points
+        fill = -np.inf if compare is np.greater else np.inf
+        windows = sliding_window_view(np.where(np.isnan(values), fill, values), window)
+        centre = values[length:len(values) - length]
+
+        if compare is np.greater:
+            neighbours = np.maximum(windows[:, :length].max(axis=1), windows[:, length + 1:].max(axis=1))
+        else:
+            neighbours = np.minimum(windows[:, :length].min(axis=1), windows[:, length + 1:].min(axis=1))
+
+        offsets = np.flatnonzero(compare(centre, neighbours))
+
+        points = np.empty(len(offsets), dtype=SWING_POINT_DTYPE)
+        points['index'] = offsets + length
+        points['price'] = centre[offsets]
+        return points
+
+    async def get_smc_signal(self, df, asset='DEFAULT', sentiment=None):
+        """Generate combined SMC + Market Sentiment trading signal asynchronously
+
+        Pass `sentiment` when the caller already fetched it to avoid a second lookup.
+        """
+        try:
+            if sentiment is None:
+                sentiment = await self.sentiment_analyzer.get_market_sentiment_async(asset)
+        except Exception as e:
+            logging.error(f"Error generating combined SMC signal: {e}")
+            return None
+
+        return self.smc_signal(df, sentiment)
+
+    def smc_signal(self, df, sentiment=None):
+        """Combined SMC + Market Sentiment signal from already fetched sentiment, computed synchronously"""
         try:
             market_structure = self.identify_market_structure(df)
 
@@ -116,8 +367,12 @@ class SMCAnalyzer:
                 else:
                     sell_score += 4
 
-            # Get market sentiment asynchronously
-            sentiment = await self.sentiment_analyzer.get_market_sentiment(asset)
+            # Confluence: CHoCH, liquidity sweep and order block / fair value gap retests on the latest bar
+            for name, weight in CONFLUENCE_WEIGHTS.items():
+                if market_structure.get(name) == 'BULLISH':
+                    buy_score += weight
+                elif market_structure.get(name) == 'BEARISH':
+                    sell_score += weight
 
             # Adjust scores with sentiment influence
             if sentiment:
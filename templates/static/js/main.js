@@ -6,7 +6,9 @@
         // Configuration
         config: {
             refreshInterval: 30000, // 30 seconds
-            apiBaseUrl: '/api'
+            apiBaseUrl: '/api',
+            maxCurrentSignals: 10,
+            maxHistorySignals: 100
         },
 
         // State
@@ -15,7 +17,10 @@
             currentSignals: [],
             signalHistory: [],
             assets: [],
-            selectedAsset: null
+            selectedAsset: null,
+            historyFilter: '',
+            eventSource: null,
+            refreshTimer: null
         },
 
         // Initialize the application
@@ -25,7 +30,7 @@
             this.loadPerformanceMetrics();
             this.loadCurrentSignals();
             this.loadSignalHistory();
-            this.startAutoRefresh();
+            this.startLiveUpdates();
         },
 
         // Bind event listeners
@@ -214,6 +219,7 @@
         // Load signal history
         loadSignalHistory: function(assetFilter = '') {
             const self = this;
+            self.state.historyFilter = assetFilter;
             let url = `${this.config.apiBaseUrl}/signals/history`;
             
             if (assetFilter) {
@@ -224,7 +230,7 @@
                 .then(response => response.json())
                 .then(data => {
                     if (data.success) {
-                        self.state.signalHistory = data.signals;
+                        self.state.signalHistory = data.signals.slice(0, self.config.maxHistorySignals);
                         self.displaySignalHistory();
                     } else {
                         self.showNoSignalHistory();
@@ -354,15 +360,109 @@
             });
         },
 
-        // Start auto-refresh
+        // Subscribe to pushed updates, polling only while the stream is unavailable
+        startLiveUpdates: function() {
+            const self = this;
+
+            if (!window.EventSource) {
+                self.startAutoRefresh();
+                return;
+            }
+
+            const source = new EventSource(`${this.config.apiBaseUrl}/stream`);
+            self.state.eventSource = source;
+
+            source.addEventListener('open', function() {
+                // Catch up on anything missed while disconnected, then rely on pushes
+                if (self.state.refreshTimer) {
+                    self.stopAutoRefresh();
+                    self.loadCurrentSignals();
+                    self.loadPerformanceMetrics();
+                }
+            });
+
+            source.addEventListener('error', function() {
+                // EventSource reconnects by itself unless the server refused the stream
+                self.startAutoRefresh();
+                if (source.readyState === EventSource.CLOSED) {
+                    self.state.eventSource = null;
+                }
+            });
+
+            source.addEventListener('signal', function(event) {
+                self.handleSignalEvent(JSON.parse(event.data));
+            });
+
+            source.addEventListener('settlement', function(event) {
+                self.handleSettlementEvent(JSON.parse(event.data));
+            });
+
+            source.addEventListener('metrics', function(event) {
+                self.updatePerformanceDisplay(JSON.parse(event.data).metrics);
+            });
+        },
+
+        // A new signal was stored
+        handleSignalEvent: function(signal) {
+            const current = this.state.currentSignals.filter(item => item.id !== signal.id);
+            current.unshift(signal);
+            this.state.currentSignals = current.slice(0, this.config.maxCurrentSignals);
+            this.displayCurrentSignals();
+            document.getElementById('active-signals').textContent = this.state.currentSignals.length;
+
+            if (!this.state.historyFilter || this.state.historyFilter === signal.asset) {
+                // Keep the newest rows only; re-rendering the table drops the DOM rows of the rest
+                const history = this.state.signalHistory.filter(item => item.id !== signal.id);
+                history.unshift(signal);
+                this.state.signalHistory = history.slice(0, this.config.maxHistorySignals);
+                this.displaySignalHistory();
+            }
+        },
+
+        // Signals reached expiry and were settled
+        handleSettlementEvent: function(data) {
+            const settled = {};
+            data.signals.forEach(row => {
+                settled[row.id] = row;
+            });
+
+            this.state.currentSignals = this.state.currentSignals.filter(signal => !settled[signal.id]);
+            this.displayCurrentSignals();
+            document.getElementById('active-signals').textContent = this.state.currentSignals.length;
+
+            let historyChanged = false;
+            this.state.signalHistory.forEach(signal => {
+                const row = settled[signal.id];
+                if (row) {
+                    signal.result = row.result;
+                    signal.profit_loss = row.profit_loss;
+                    signal.is_active = false;
+                    historyChanged = true;
+                }
+            });
+            if (historyChanged) {
+                this.displaySignalHistory();
+            }
+        },
+
+        // Start polling fallback
         startAutoRefresh: function() {
             const self = this;
-            setInterval(() => {
+            if (self.state.refreshTimer) {
+                return;
+            }
+            self.state.refreshTimer = setInterval(() => {
                 self.loadCurrentSignals();
                 self.loadPerformanceMetrics();
             }, this.config.refreshInterval);
         },
 
+        // Stop polling fallback
+        stopAutoRefresh: function() {
+            clearInterval(this.state.refreshTimer);
+            this.state.refreshTimer = null;
+        },
+
         // Helper functions
         getTimeAgo: function(date) {
             const now = new Date();
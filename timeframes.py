@@ -0,0 +1,46 @@
+import numpy as np
+
+from candles import Candles
+
+# Higher timeframes derived from the 1m bars, in seconds
+TIMEFRAMES = {'5m': 5 * 60, '15m': 15 * 60, '1h': 60 * 60}
+
+NANOSECONDS = 1_000_000_000
+
+
+def resample_candles(candles, seconds):
+    """
+    OHLCV bars of `seconds` length built from finer candles
+
+    Bars start on multiples of `seconds` since the epoch (for timeframes that
+    divide a day, the same boundaries as DataFrame.resample) and only exist
+    where the source has candles. High/Low ignore NaNs and missing volume
+    counts as zero, as in pandas.
+    """
+    if len(candles) == 0:
+        return candles
+
+    step = seconds * NANOSECONDS
+    buckets = candles.timestamp // step
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], len(candles)) - 1
+
+    return Candles(
+        buckets[starts] * step,
+        candles.open[starts],
+        np.fmax.reduceat(candles.high, starts),
+        np.fmin.reduceat(candles.low, starts),
+        candles.close[ends],
+        np.add.reduceat(np.nan_to_num(candles.volume), starts)
+    )
+
+
+def resample_timeframes(candles, timeframes=None):
+    """
+    {timeframe: Candles} for every higher timeframe of the 1m `candles`
+
+    The window is resampled whole on each call. At the live window size that
+    is cheaper than extending bars kept from earlier calls, and it needs no
+    state shared between assets.
+    """
+    return {name: resample_candles(candles, seconds) for name, seconds in (timeframes or TIMEFRAMES).items()}
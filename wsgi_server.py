@@ -0,0 +1,25 @@
+from gunicorn.app.base import BaseApplication
+
+
+class PreloadedServer(BaseApplication):
+    """
+    gunicorn serving a Flask app that was imported before the workers fork
+
+    The master imports the app and the signal stack once, so the workers it
+    forks share those memory pages copy-on-write instead of each importing
+    pandas, numpy and yfinance again. `options` are gunicorn settings,
+    including server hooks such as post_fork.
+    """
+
+    def __init__(self, application, options=None):
+        self.application = application
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.application